@@ -0,0 +1,110 @@
+"""
+Post admin at 1M posts: untuned vs blog.admin.PostAdmin.
+
+The untuned admin shows the same columns, filters and date hierarchy
+without the paginator, select_related, raw id and range hierarchy; it
+is mounted on a second AdminSite, so both are served side by side by
+the same process and database.
+"""
+import random
+import sys
+import types
+from datetime import timedelta
+
+from common import measure, report, setup
+
+setup()
+
+from django.contrib import admin  # noqa: E402
+from django.contrib.auth import get_user_model  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.test import Client  # noqa: E402
+from django.urls import path  # noqa: E402
+from django.utils import timezone  # noqa: E402
+
+from blog.models import Category, Location, Post  # noqa: E402
+
+User = get_user_model()
+POSTS = 1_000_000
+USERS = 10_000
+LOCATIONS = 2_000
+
+
+class UntunedPostAdmin(admin.ModelAdmin):
+    list_display = (
+        'title', 'author', 'category', 'location', 'pub_date',
+        'is_published', 'is_visible', 'views',
+    )
+    list_filter = ('category', 'location')
+    search_fields = ('title',)
+    date_hierarchy = 'pub_date'
+
+
+untuned_site = admin.AdminSite(name='untuned_admin')
+untuned_site.register((Category, Location))
+untuned_site.register(Post, UntunedPostAdmin)
+
+urls = types.ModuleType('bench_admin_urls')
+urls.urlpatterns = [
+    path('admin/', admin.site.urls),
+    path('untuned-admin/', untuned_site.urls),
+]
+sys.modules[urls.__name__] = urls
+
+
+def populate():
+    rnd = random.Random(45)
+    User.objects.bulk_create(
+        (User(username=f'user{i}', password='') for i in range(USERS)),
+        batch_size=5000)
+    Location.objects.bulk_create(
+        (Location(name=f'Место {i}') for i in range(LOCATIONS)),
+        batch_size=5000)
+    category = Category.objects.create(
+        title='Категория', slug='category', is_published=True)
+    now = timezone.now()
+    rows = (
+        (True, now, f'Пост {i}', 'Текст', now - timedelta(
+            minutes=rnd.randrange(5 * 365 * 24 * 60)),
+         rnd.randint(1, USERS), rnd.randint(1, LOCATIONS), category.pk,
+         '', 0, 0.0, True)
+        for i in range(POSTS)
+    )
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            'INSERT INTO blog_post (is_published, created_at, title, text, '
+            'pub_date, author_id, location_id, category_id, image, views, '
+            'trending_score, is_visible) '
+            'VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)',
+            rows)
+        cursor.execute('ANALYZE')
+
+
+def main():
+    from django.conf import settings
+    settings.ROOT_URLCONF = urls.__name__
+    populate()
+    client = Client()
+    client.force_login(User.objects.create_superuser('admin', '', 'admin'))
+    post = Post.objects.order_by('pk').last()
+
+    def get(url):
+        def call():
+            response = client.get(url)
+            assert response.status_code == 200, response.status_code
+            return response
+        return call
+
+    for title, url in (
+        ('changelist', 'blog/post/'),
+        ('changelist, page 500', 'blog/post/?p=500'),
+        ('changelist, one location', 'blog/post/?location__id__exact=7'),
+        ('change form', f'blog/post/{post.pk}/change/'),
+    ):
+        for site in ('untuned-admin', 'admin'):
+            report(f'{site:<13} {title}',
+                   measure(get(f'/{site}/{url}'), repeat=5, warmup=1))
+
+
+if __name__ == '__main__':
+    main()
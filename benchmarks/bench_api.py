@@ -0,0 +1,76 @@
+"""
+JSON API vs the HTML views it mirrors: latency and response size.
+
+The HTML pages render PAGINATOR post cards; the API pages are asked for
+the same number of posts. The last rows compare orjson with the json
+fallback on the same page.
+"""
+from datetime import timedelta
+
+from common import measure, report, setup
+
+setup()
+
+from django.test import Client  # noqa: E402
+from django.utils import timezone  # noqa: E402
+
+from blog import api  # noqa: E402
+from blog.constans import PAGINATOR  # noqa: E402
+from blog.models import Category, Comment, Location, Post, User  # noqa: E402
+
+POSTS = 10_000
+COMMENTS = 50
+
+
+def populate():
+    author = User.objects.create(username='author')
+    category = Category.objects.create(
+        title='Категория', slug='category', is_published=True)
+    location = Location.objects.create(name='Место', is_published=True)
+    now = timezone.now()
+    Post.objects.bulk_create(
+        (Post(title=f'Пост {i}', text='Текст поста ' * 20,
+              pub_date=now - timedelta(minutes=i), is_visible=True,
+              author=author, category=category, location=location)
+         for i in range(POSTS)),
+        batch_size=1000)
+    post = Post.objects.order_by('-pub_date').first()
+    Comment.objects.bulk_create(
+        Comment(text='Комментарий', post=post, author=author)
+        for _ in range(COMMENTS))
+    return post
+
+
+def main():
+    post = populate()
+    client = Client()
+    limit = f'limit={PAGINATOR}'
+    pairs = (
+        ('feed', '/', f'/api/posts/?{limit}'),
+        ('category', '/category/category/',
+         f'/api/category/category/posts/?{limit}'),
+        ('profile', '/profile/author/',
+         f'/api/profile/author/posts/?{limit}'),
+        ('detail', f'/posts/{post.pk}/', f'/api/posts/{post.pk}/'),
+    )
+    for title, html, json in pairs:
+        for kind, url in (('html', html), ('api', json)):
+            size = len(client.get(url).content)
+            report(f'{title:<9} {kind}',
+                   measure(lambda: client.get(url), repeat=200, warmup=10),
+                   f'{size} bytes')
+    url = f'/api/posts/?{limit}&fields=id,title,pub_date'
+    report('feed      api, 3 fields',
+           measure(lambda: client.get(url), repeat=200, warmup=10),
+           f'{len(client.get(url).content)} bytes')
+
+    url = '/api/posts/?limit=100'
+    report('feed      api 100, orjson',
+           measure(lambda: client.get(url), repeat=200, warmup=10))
+    api.orjson = None
+    report('feed      api 100, json',
+           measure(lambda: client.get(url), repeat=200, warmup=10))
+
+
+if __name__ == '__main__':
+    main()
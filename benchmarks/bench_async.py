@@ -0,0 +1,128 @@
+"""
+Read-only views under concurrency: WSGI vs ASGI, sync vs async views.
+
+Each mode runs in its own interpreter because BLOG_ASYNC_VIEWS is read
+when the URLconf is imported. WSGI is driven by a pool of threads (as a
+threaded server would), ASGI by asyncio tasks calling the application
+directly; both keep CONCURRENCY requests in flight.
+"""
+import asyncio
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+CONCURRENCY = 32
+REQUESTS = 640
+MODES = {
+    'wsgi, sync views': ('wsgi', ''),
+    'asgi, sync views': ('asgi', ''),
+    'asgi, async views': ('asgi', '1'),
+}
+
+
+def populate():
+    from django.utils import timezone
+
+    from blog.models import Category, Comment, Location, Post, User
+
+    author = User.objects.create(username='author')
+    category = Category.objects.create(
+        title='Категория', slug='category', is_published=True)
+    location = Location.objects.create(name='Место', is_published=True)
+    now = timezone.now()
+    posts = [
+        Post.objects.create(
+            title=f'Пост {i}', text='Текст поста ' * 20, pub_date=now,
+            author=author, category=category, location=location)
+        for i in range(200)
+    ]
+    Comment.objects.bulk_create(
+        Comment(text='Комментарий', post=post, author=author)
+        for post in posts[:20] for _ in range(10))
+    return [
+        '/', '/?page=2', '/category/category/', '/profile/author/',
+        *(f'/posts/{post.id}/' for post in posts[:20]),
+    ]
+
+
+def run_wsgi(paths):
+    from django.core.wsgi import get_wsgi_application
+    from django.test.client import RequestFactory
+
+    application = get_wsgi_application()
+    factory = RequestFactory()
+
+    def call(path):
+        path, _, query = path.partition('?')
+        environ = factory._base_environ(PATH_INFO=path, QUERY_STRING=query)
+        statuses = []
+        body = application(
+            environ, lambda status, headers: statuses.append(status))
+        b''.join(body)
+        body.close()
+        assert statuses[0].startswith('200'), statuses
+
+    with ThreadPoolExecutor(CONCURRENCY) as pool:
+        list(pool.map(call, paths))
+
+
+def run_asgi(paths):
+    from django.core.asgi import get_asgi_application
+    from django.test.client import AsyncRequestFactory
+
+    application = get_asgi_application()
+    factory = AsyncRequestFactory()
+
+    async def call(path, semaphore):
+        path, _, query = path.partition('?')
+        scope = factory._base_scope(path=path, query_string=query.encode())
+        messages = []
+
+        async def receive():
+            return {'type': 'http.request', 'body': b''}
+
+        async def send(message):
+            messages.append(message)
+
+        async with semaphore:
+            await application(scope, receive, send)
+        assert messages[0]['status'] == 200, messages[0]
+
+    async def main():
+        semaphore = asyncio.Semaphore(CONCURRENCY)
+        await asyncio.gather(*(call(path, semaphore) for path in paths))
+
+    asyncio.run(main())
+
+
+def child(server):
+    from common import setup
+
+    setup()
+    paths = populate()
+    workload = [paths[i % len(paths)] for i in range(REQUESTS)]
+    run = run_wsgi if server == 'wsgi' else run_asgi
+    run(workload[:CONCURRENCY])
+    start = time.perf_counter()
+    run(workload)
+    elapsed = time.perf_counter() - start
+    print(f'{REQUESTS / elapsed:.1f}')
+
+
+def main():
+    for title, (server, async_views) in MODES.items():
+        env = dict(os.environ, BLOGICUM_ASYNC_VIEWS=async_views)
+        output = subprocess.run(
+            [sys.executable, __file__, server], env=env, check=True,
+            capture_output=True, text=True).stdout
+        print(f'{title:<24} {float(output.split()[-1]):8.1f} req/s  '
+              f'({REQUESTS} requests, {CONCURRENCY} in flight)')
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        child(sys.argv[1])
+    else:
+        main()
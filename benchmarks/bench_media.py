@@ -0,0 +1,67 @@
+"""
+Media serving throughput: django.views.static.serve vs blogicum.media.
+
+Serves a 32 MB file through each path and reports MB/s of response body
+produced by Django (front-server handoff modes produce no body at all).
+"""
+import os
+import tempfile
+from pathlib import Path
+
+from common import measure, report, setup
+
+setup()
+
+from django.conf import settings  # noqa: E402
+from django.test import RequestFactory  # noqa: E402
+from django.views.static import serve  # noqa: E402
+
+from blogicum.media import serve_media  # noqa: E402
+
+SIZE = 32 * 1024 * 1024
+
+
+def consume(response):
+    if response.streaming:
+        size = sum(len(chunk) for chunk in response.streaming_content)
+        if getattr(response, 'file_to_stream', None):
+            response.file_to_stream.close()
+        return size
+    return len(response.content)
+
+
+def main():
+    with tempfile.TemporaryDirectory() as media_root:
+        settings.MEDIA_ROOT = Path(media_root)
+        name = 'post_media/large.jpg'
+        os.makedirs(settings.MEDIA_ROOT / 'post_media')
+        (settings.MEDIA_ROOT / name).write_bytes(os.urandom(SIZE))
+        factory = RequestFactory()
+
+        cases = (
+            ('django.views.static.serve', None, {},
+             lambda request: serve(request, name, media_root)),
+            ('python, full file', 'python', {},
+             lambda request: serve_media(request, name)),
+            ('python, 1 MB range', 'python',
+             {'HTTP_RANGE': f'bytes={SIZE // 2}-{SIZE // 2 + 2 ** 20 - 1}'},
+             lambda request: serve_media(request, name)),
+            ('x-accel-redirect', 'x-accel-redirect', {},
+             lambda request: serve_media(request, name)),
+            ('x-sendfile', 'x-sendfile', {},
+             lambda request: serve_media(request, name)),
+        )
+        for title, mode, headers, view in cases:
+            settings.MEDIA_SERVE_MODE = mode
+            request = factory.get(f'/{name}', **headers)
+            sizes = []
+            timings = measure(
+                lambda: sizes.append(consume(view(request))), repeat=10)
+            mbytes = sizes[-1] / 2 ** 20
+            throughput = mbytes / min(timings)
+            report(title, timings,
+                   f'{mbytes:7.1f} MB body  {throughput:9.1f} MB/s')
+
+
+if __name__ == '__main__':
+    main()
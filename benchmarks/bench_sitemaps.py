@@ -0,0 +1,79 @@
+"""
+Sitemap build at 1M posts: full rebuild vs incremental runs.
+
+An incremental run still fingerprints every chunk, but only rewrites
+the chunks whose posts changed.
+"""
+import random
+import tempfile
+from datetime import timedelta
+
+from common import measure, report, setup
+
+setup()
+
+from django.contrib.auth import get_user_model  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.utils import timezone  # noqa: E402
+
+from blog.models import Category, Post  # noqa: E402
+from blog.sitemaps import build  # noqa: E402
+
+User = get_user_model()
+POSTS = 1_000_000
+USERS = 10_000
+BASE_URL = 'https://blogicum.test'
+
+
+def populate():
+    rnd = random.Random(49)
+    User.objects.bulk_create(
+        (User(username=f'user{i}', password='') for i in range(USERS)),
+        batch_size=5000)
+    category = Category.objects.create(
+        title='Категория', slug='category', is_published=True)
+    now = timezone.now()
+    rows = (
+        (True, now, now, f'Пост {i}', 'Текст', now - timedelta(
+            minutes=rnd.randrange(5 * 365 * 24 * 60)),
+         rnd.randint(1, USERS), category.pk, '', 0, 0.0, True)
+        for i in range(POSTS)
+    )
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            'INSERT INTO blog_post (is_published, created_at, updated_at, '
+            'title, text, pub_date, author_id, category_id, image, views, '
+            'trending_score, is_visible) '
+            'VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)',
+            rows)
+        cursor.execute('ANALYZE')
+
+
+def main():
+    populate()
+    root = tempfile.mkdtemp()
+    written = []
+
+    def full():
+        written[:] = build(root, BASE_URL, full=True)
+
+    def unchanged():
+        written[:] = build(root, BASE_URL)
+
+    def one_edit():
+        post = Post.objects.get(pk=random.randint(1, POSTS))
+        post.title += '!'
+        post.save()
+        written[:] = build(root, BASE_URL)
+
+    for title, func in (
+        ('full rebuild', full),
+        ('incremental, nothing changed', unchanged),
+        ('incremental, one post edited', one_edit),
+    ):
+        report(title, measure(func, repeat=3, warmup=1),
+               f'{len(written)} chunks written')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+"""
+Render time of the feed and detail pages: Django templates vs Jinja2.
+
+Renders a 10-card feed page and a detail page with 200 comments with
+prepared view contexts, so only template rendering is timed.
+"""
+from common import measure, report, setup
+
+setup()
+
+from django.contrib.auth import get_user_model  # noqa: E402
+from django.conf import settings  # noqa: E402
+from django.template import engines  # noqa: E402
+from django.template.backends.jinja2 import Jinja2  # noqa: E402
+from django.test import RequestFactory  # noqa: E402
+from django.urls import resolve  # noqa: E402
+
+from blog.models import Category, Comment, Location, Post  # noqa: E402
+from blog.views import PostDetailView, PostListView  # noqa: E402
+
+JINJA2_OPTIONS = {
+    'environment': 'blogicum.jinja2.environment',
+    'context_processors': [
+        'django.template.context_processors.debug',
+        'django.contrib.auth.context_processors.auth',
+        'django.contrib.messages.context_processors.messages',
+    ],
+}
+
+
+def populate():
+    User = get_user_model()
+    author = User.objects.create_user('author', password='password')
+    category = Category.objects.create(
+        title='Категория', description='Описание', slug='category')
+    location = Location.objects.create(name='Место')
+    posts = [
+        Post.objects.create(
+            title=f'Пост {i}', text='Текст публикации ' * 40,
+            author=author, category=category, location=location)
+        for i in range(12)
+    ]
+    Comment.objects.bulk_create(
+        Comment(post=posts[0], author=author, text=f'Комментарий {i}')
+        for i in range(200)
+    )
+    return author, posts[0]
+
+
+def prepare(view_class, request, **kwargs):
+    request.resolver_match = resolve(request.path)
+    view = view_class()
+    view.setup(request, **kwargs)
+    if hasattr(view, 'get_object'):
+        view.object = view.get_object()
+    else:
+        view.object_list = view.get_queryset()
+    context = view.get_context_data()
+    return view.get_template_names()[0], context
+
+
+def main():
+    author, post = populate()
+    factory = RequestFactory()
+    pages = {}
+    for name, view_class, path, kwargs in (
+        ('feed (10 cards)', PostListView, '/', {}),
+        ('detail (200 comments)', PostDetailView,
+         f'/posts/{post.id}/', {'pk': post.id}),
+    ):
+        request = factory.get(path)
+        request.user = author
+        pages[name] = (request, *prepare(view_class, request, **kwargs))
+
+    django_engine = engines['django']
+    jinja2_engine = Jinja2({
+        'NAME': 'jinja2',
+        'DIRS': [settings.TEMPLATES_DIR / 'jinja2'],
+        'APP_DIRS': False,
+        'OPTIONS': JINJA2_OPTIONS,
+    })
+
+    for page, (request, template_name, context) in pages.items():
+        for engine_name, engine in (
+                ('django', django_engine), ('jinja2', jinja2_engine)):
+            template = engine.get_template(template_name)
+            size = len(template.render(context, request))
+            timings = measure(
+                lambda: template.render(context, request), repeat=100)
+            report(f'{page} [{engine_name}]', timings, f'{size} chars')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+"""
+Personal timeline: materialized fan-out vs `author__in=` over posts.
+
+100k users follow a few of 2000 authors each; the measured reader
+follows 200 authors. Both paths load the same fully rendered page data
+(get_posts_query with comment counts), first page and 50 pages deep.
+"""
+import random
+import time
+from datetime import timedelta
+
+from common import measure, report, setup
+
+setup()
+
+from django.contrib.auth import get_user_model  # noqa: E402
+from django.utils import timezone  # noqa: E402
+
+from blog import timeline  # noqa: E402
+from blog.models import Category, Follow, Post  # noqa: E402
+from blog.views import get_posts_query, published_comments  # noqa: E402
+
+User = get_user_model()
+USERS = 100_000
+AUTHORS = 2_000
+FOLLOWS_PER_USER = 3
+READER_FOLLOWS = 200
+POSTS_PER_AUTHOR = 5
+DEEP_PAGE = 50
+
+
+def populate():
+    rnd = random.Random(40)
+    User.objects.bulk_create(
+        (User(username=f'user{i}', password='') for i in range(USERS)),
+        batch_size=5000)
+    user_ids = list(User.objects.order_by('pk').values_list('pk', flat=True))
+    authors = user_ids[:AUTHORS]
+    reader = user_ids[-1]
+    follows = {
+        (user_id, author)
+        for user_id in user_ids[AUTHORS:-1]
+        for author in rnd.sample(authors, FOLLOWS_PER_USER)
+    }
+    follows.update((reader, author) for author in authors[:READER_FOLLOWS])
+    Follow.objects.bulk_create(
+        (Follow(user_id=user_id, author_id=author)
+         for user_id, author in follows),
+        batch_size=5000)
+    category = Category.objects.create(
+        title='Категория', slug='category', is_published=True)
+    now = timezone.now()
+    Post.objects.bulk_create(
+        (Post(title='Пост', text='Текст', author_id=author,
+              category=category, is_visible=True,
+              pub_date=now - timedelta(minutes=rnd.randrange(100_000)))
+         for author in authors for _ in range(POSTS_PER_AUTHOR)),
+        batch_size=5000)
+    start = time.perf_counter()
+    entries = sum(timeline.fan_out(post) for post in Post.objects.all())
+    elapsed = time.perf_counter() - start
+    print(f'fan-out of {Post.objects.count()} posts: {entries} entries '
+          f'in {elapsed:.1f} s '
+          f'({elapsed / Post.objects.count() * 1000:.2f} ms per post)')
+    return User.objects.get(pk=reader)
+
+
+def posts():
+    return get_posts_query().annotate(comment_count=published_comments())
+
+
+def naive_page(reader, page):
+    return list(posts().filter(
+        author__in=Follow.objects.filter(user=reader).values('author'),
+        is_published=True,
+        category__is_published=True,
+        pub_date__lt=timezone.now(),
+    ).order_by('-pub_date', '-pk')[page * 10:(page + 1) * 10])
+
+
+def timeline_cursor(reader, page):
+    cursor = None
+    for _ in range(page):
+        cursor = timeline.timeline_page(reader, posts(), cursor).next_cursor
+    return cursor
+
+
+def main():
+    reader = populate()
+    deep_cursor = timeline_cursor(reader, DEEP_PAGE)
+    assert (timeline.timeline_page(reader, posts(), deep_cursor).posts
+            == naive_page(reader, DEEP_PAGE))
+    cases = (
+        ('naive author__in, first page',
+         lambda: naive_page(reader, 0)),
+        ('timeline, first page',
+         lambda: timeline.timeline_page(reader, posts())),
+        (f'naive author__in, page {DEEP_PAGE}',
+         lambda: naive_page(reader, DEEP_PAGE)),
+        (f'timeline, page {DEEP_PAGE} by cursor',
+         lambda: timeline.timeline_page(reader, posts(), deep_cursor)),
+    )
+    for title, func in cases:
+        report(title, measure(func, repeat=30))
+
+
+if __name__ == '__main__':
+    main()
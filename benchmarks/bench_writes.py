@@ -0,0 +1,87 @@
+"""
+Comment write throughput with 50 concurrent commenters.
+
+Each commenter is a thread with a logged-in test client posting to
+CommentCreateView, as a threaded server would. The database is a file
+(not the in-memory test database) so SQLite's write lock behaves as in
+production. Compares direct saves with the single-writer queue.
+"""
+import logging
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from common import setup
+
+tmp = tempfile.TemporaryDirectory()
+
+from django.conf import settings  # noqa: E402
+
+settings.DATABASES['default']['TEST'] = {
+    'NAME': str(Path(tmp.name) / 'bench.sqlite3')}
+setup(BLOG_RATE_LIMITS={'comment': (10 ** 9, 60), 'post': (10 ** 9, 60)})
+
+from django.test import Client  # noqa: E402
+
+from blog.models import Category, Comment, Post, User  # noqa: E402
+
+COMMENTERS = 50
+COMMENTS_EACH = 20
+
+# Failed saves are counted from status codes; skip their tracebacks.
+logging.getLogger('django.request').setLevel(logging.CRITICAL)
+
+
+def populate():
+    author = User.objects.create(username='author')
+    category = Category.objects.create(
+        title='Категория', slug='category', is_published=True)
+    post = Post.objects.create(
+        title='Пост', text='Текст', author=author, category=category)
+    clients = []
+    for i in range(COMMENTERS):
+        client = Client(raise_request_exception=False)
+        client.force_login(User.objects.create(username=f'commenter{i}'))
+        clients.append(client)
+    return post, clients
+
+
+def run(post, clients):
+    url = f'/posts/{post.id}/comment/'
+    statuses = []
+    barrier = threading.Barrier(len(clients))
+
+    def commenter(client):
+        barrier.wait()
+        for _ in range(COMMENTS_EACH):
+            statuses.append(
+                client.post(url, data={'text': 'Комментарий'}).status_code)
+
+    threads = [
+        threading.Thread(target=commenter, args=(client,))
+        for client in clients
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - start, statuses
+
+
+def main():
+    post, clients = populate()
+    for title, single_writer in (('direct saves', False),
+                                 ('single writer', True)):
+        settings.BLOG_SINGLE_WRITER = single_writer
+        Comment.objects.all().delete()
+        elapsed, statuses = run(post, clients)
+        ok = statuses.count(302)
+        print(f'{title:<16} {ok / elapsed:8.1f} comments/s  '
+              f'{ok} saved, {len(statuses) - ok} failed  '
+              f'({COMMENTERS} commenters x {COMMENTS_EACH})')
+
+
+if __name__ == '__main__':
+    main()
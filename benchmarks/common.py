@@ -0,0 +1,52 @@
+"""
+Shared setup for the benchmark scripts.
+
+Each script is run directly (``python benchmarks/bench_<name>.py``) and
+works against a throwaway test database, never against db.sqlite3.
+"""
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / 'blogicum'))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'blogicum.settings')
+
+
+def setup(**overrides):
+    """Configure Django and create an empty test database."""
+    import django
+    from django.conf import settings
+
+    django.setup()
+    settings.DEBUG = False
+    settings.ALLOWED_HOSTS = ['testserver', 'localhost']
+    for name, value in overrides.items():
+        setattr(settings, name, value)
+
+    from django.db import connections
+    for alias in connections:
+        connections[alias].creation.create_test_db(
+            verbosity=0, autoclobber=True, keepdb=False)
+
+
+def measure(func, repeat=50, warmup=3):
+    """Return per-call timings in seconds."""
+    for _ in range(warmup):
+        func()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def report(name, timings, extra=''):
+    mean = statistics.mean(timings) * 1000
+    p50 = statistics.median(timings) * 1000
+    best = min(timings) * 1000
+    print(f'{name:<40} mean {mean:8.3f} ms  p50 {p50:8.3f} ms  '
+          f'min {best:8.3f} ms  {extra}')
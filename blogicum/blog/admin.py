@@ -1,7 +1,166 @@
-from django.contrib import admin
+from django.contrib import admin, messages
+from django.core.paginator import Paginator
+from django.db import connections, transaction
+from django.utils.functional import cached_property
 
-from .models import Category, Location, Post
+from . import trending
+from .constans import TRENDING_COMMENT_WEIGHT
+from .models import Category, Comment, Location, Post
 
-admin.site.register(Category)
-admin.site.register(Location)
-admin.site.register(Post)
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator that estimates the size of an unfiltered table.
+
+    An exact COUNT(*) scans the whole table; the changelist only needs
+    it to draw page links, so an estimate from the catalog is enough.
+    The estimate may be too high (SQLite's MAX(rowid) counts deleted
+    rows), so a page that turns out short or empty clamps the count to
+    where the rows really end.
+    """
+    count_is_estimate = False
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if not queryset.query.where and not queryset.query.distinct:
+            estimate = estimated_count(queryset.model, queryset.db)
+            if estimate is not None:
+                self.count_is_estimate = True
+                return estimate
+        return super().count
+
+    def page(self, number):
+        page = super().page(number)
+        if not self.count_is_estimate:
+            return page
+        rows = len(page.object_list)
+        if rows == 0 and page.number > 1:
+            # Past the real end: count exactly and show the last page.
+            self._clamp(self.object_list.count())
+            return super().page(self.num_pages)
+        if rows < self.per_page:
+            self._clamp((page.number - 1) * self.per_page + rows)
+        return page
+
+    def _clamp(self, count):
+        self.__dict__['count'] = count
+        self.__dict__.pop('num_pages', None)
+        self.count_is_estimate = False
+
+
+def estimated_count(model, using):
+    """Approximate row count of model's table, or None if unknown."""
+    connection = connections[using]
+    table = connection.ops.quote_name(model._meta.db_table)
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute(
+                'SELECT reltuples::bigint FROM pg_class '
+                'WHERE oid = %s::regclass',
+                [model._meta.db_table])
+        elif connection.vendor == 'sqlite':
+            # The rowid b-tree gives its maximum without a scan.
+            cursor.execute(f'SELECT MAX(rowid) FROM {table}')
+        else:
+            return None
+        row = cursor.fetchone()
+    if row is None or row[0] is None or row[0] < 0:
+        return None
+    return int(row[0])
+
+
+@admin.register(Category)
+class CategoryAdmin(admin.ModelAdmin):
+    list_display = ('title', 'slug', 'is_published')
+    search_fields = ('title',)
+    prepopulated_fields = {'slug': ('title',)}
+
+
+@admin.register(Location)
+class LocationAdmin(admin.ModelAdmin):
+    list_display = ('name', 'is_published')
+    search_fields = ('name',)
+
+
+@admin.register(Post)
+class PostAdmin(admin.ModelAdmin):
+    list_display = (
+        'title', 'author', 'category', 'location', 'pub_date',
+        'is_published', 'is_visible', 'views',
+    )
+    list_select_related = ('author', 'category', 'location')
+    # No location filter: it would list every location on each page.
+    list_filter = ('category',)
+    search_fields = ('title',)
+    date_hierarchy = 'pub_date'
+    raw_id_fields = ('author',)
+    autocomplete_fields = ('category', 'location')
+    show_full_result_count = False
+    paginator = EstimatedCountPaginator
+
+
+@admin.register(Comment)
+class CommentAdmin(admin.ModelAdmin):
+    """
+    Comment moderation. The bulk actions run one UPDATE or DELETE over
+    the selection, so selecting every comment doesn't load them, and one
+    UPDATE of the trending scores of their posts: published comments
+    count towards the score, so their events are removed on unpublish
+    and delete, and added back on publish.
+    """
+    list_display = ('text', 'author', 'post', 'created_at', 'is_published')
+    list_select_related = ('author', 'post')
+    list_filter = ('is_published', 'created_at')
+    search_fields = ('text', 'author__username')
+    raw_id_fields = ('post', 'author')
+    ordering = ('-pk',)
+    show_full_result_count = False
+    paginator = EstimatedCountPaginator
+    actions = ('publish', 'unpublish', 'delete_comments')
+
+    def get_actions(self, request):
+        actions = super().get_actions(request)
+        # delete_selected collects and lists every object it deletes.
+        actions.pop('delete_selected', None)
+        return actions
+
+    def _rescore(self, comments, score):
+        Post.objects.filter(pk__in=comments.values('post')).update(
+            trending_score=score(comments, TRENDING_COMMENT_WEIGHT))
+
+    def _report(self, request, count, message):
+        self.message_user(
+            request, f'{message}: {count}.', messages.SUCCESS)
+
+    @admin.action(
+        description='Опубликовать выбранные комментарии',
+        permissions=('change',))
+    def publish(self, request, queryset):
+        with transaction.atomic():
+            self._rescore(
+                queryset.filter(is_published=False), trending.with_events)
+            count = queryset.update(is_published=True)
+        self._report(request, count, 'Опубликовано комментариев')
+
+    @admin.action(
+        description='Снять с публикации выбранные комментарии',
+        permissions=('change',))
+    def unpublish(self, request, queryset):
+        with transaction.atomic():
+            self._rescore(
+                queryset.filter(is_published=True), trending.without_events)
+            count = queryset.update(is_published=False)
+        self._report(request, count, 'Снято с публикации комментариев')
+
+    @admin.action(
+        description='Удалить выбранные комментарии',
+        permissions=('delete',))
+    def delete_comments(self, request, queryset):
+        with transaction.atomic():
+            self._rescore(
+                queryset.filter(is_published=True), trending.without_events)
+            # Nothing refers to comments and no delete signals are
+            # connected, so the collector issues a single DELETE.
+            count, _ = queryset.delete()
+        self._report(request, count, 'Удалено комментариев')
@@ -0,0 +1,225 @@
+"""
+Read-only JSON API for the feeds and post pages.
+
+Rows are read with values_list() and turned into dicts directly, never
+into model instances. Lists are paged with the (pub_date, id) cursor of
+blog.timeline, `fields=` picks a subset of the fields (only those are
+selected), and responses are serialized with orjson when it is
+installed, with the json module otherwise.
+"""
+import json
+
+from django.db.models import (Case, Count, F, OuterRef, Q, Subquery, Value,
+                              When)
+from django.db.models.functions import Coalesce
+from django.http import Http404, HttpResponse
+from django.shortcuts import get_object_or_404
+from django.views.generic import View
+
+from blog.cache import categories, missing_profiles
+from blog.constans import API_MAX_PAGE_SIZE, PAGINATOR
+from blog.mixins import ReplicaReadMixin
+from blog.models import Comment, Post, User
+from blog.timeline import decode_cursor, encode_cursor
+from blogicum.routers import first_or_primary
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Public name -> path in values_list(); paths not on the model are
+# annotations from POST_ANNOTATIONS.
+POST_FIELDS = {
+    'id': 'pk',
+    'title': 'title',
+    'text': 'text',
+    'pub_date': 'pub_date',
+    'author': 'author__username',
+    'category': 'category__slug',
+    'location': 'location_name',
+    'image': 'image',
+    'views': 'views',
+    'comment_count': 'comment_count',
+}
+
+
+def comment_count():
+    # A correlated subquery runs for the rows of the page only, where a
+    # JOIN with GROUP BY counts comments of every post before the LIMIT.
+    return Coalesce(Subquery(
+        Comment.objects.filter(post=OuterRef('pk'), is_published=True)
+        .order_by().values('post').annotate(count=Count('pk'))
+        .values('count')), Value(0))
+
+
+POST_ANNOTATIONS = {
+    'location_name': lambda: Case(When(
+        location__is_published=True, then=F('location__name'))),
+    'comment_count': comment_count,
+}
+COMMENT_FIELDS = {
+    'id': 'pk',
+    'author': 'author__username',
+    'text': 'text',
+    'created_at': 'created_at',
+}
+
+
+class ApiError(Exception):
+    pass
+
+
+def _default(value):
+    # Same output as orjson with OPT_UTC_Z.
+    return value.isoformat().replace('+00:00', 'Z')
+
+
+def dumps(data):
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_UTC_Z)
+    return json.dumps(
+        data, default=_default, ensure_ascii=False, separators=(',', ':')
+    ).encode()
+
+
+def json_response(data, status=200):
+    return HttpResponse(
+        dumps(data), content_type='application/json', status=status)
+
+
+def requested_fields(request, allowed, extra=()):
+    """Names from ?fields=a,b in allowed or extra; all of them if absent."""
+    value = request.GET.get('fields')
+    if not value:
+        return [*allowed, *extra]
+    names = list(dict.fromkeys(
+        name.strip() for name in value.split(',') if name.strip()))
+    unknown = [name for name in names
+               if name not in allowed and name not in extra]
+    if unknown:
+        raise ApiError(f'Неизвестные поля: {", ".join(unknown)}.')
+    return names
+
+
+def page_size(request):
+    try:
+        size = int(request.GET.get('limit', PAGINATOR))
+    except ValueError:
+        raise ApiError('Параметр limit должен быть числом.')
+    if not 1 <= size <= API_MAX_PAGE_SIZE:
+        raise ApiError(f'Параметр limit должен быть от 1 до '
+                       f'{API_MAX_PAGE_SIZE}.')
+    return size
+
+
+def post_rows(queryset, names, *extra):
+    """values_list() of the POST_FIELDS in names, then of extra."""
+    paths = [POST_FIELDS[name] for name in names]
+    annotations = {
+        path: POST_ANNOTATIONS[path]()
+        for path in paths if path in POST_ANNOTATIONS
+    }
+    return queryset.annotate(**annotations).values_list(*paths, *extra)
+
+
+def as_dicts(rows, names):
+    dicts = [dict(zip(names, row)) for row in rows]
+    if 'image' in names:
+        storage = Post.image.field.storage
+        for item in dicts:
+            if item['image']:
+                item['image'] = storage.url(item['image'])
+            else:
+                item['image'] = None
+    return dicts
+
+
+class ApiView(ReplicaReadMixin, View):
+    http_method_names = ('get', 'head', 'options')
+
+    def dispatch(self, request, *args, **kwargs):
+        try:
+            return super().dispatch(request, *args, **kwargs)
+        except ApiError as error:
+            return json_response({'error': str(error)}, status=400)
+        except Http404 as error:
+            return json_response({'error': str(error)}, status=404)
+
+
+class PostListApiView(ApiView):
+    """Visible posts, newest first, one cursor page at a time."""
+    def get_queryset(self):
+        return Post.objects.filter(is_visible=True)
+
+    def get(self, request, **kwargs):
+        names = requested_fields(request, POST_FIELDS)
+        size = page_size(request)
+        queryset = self.get_queryset()
+        cursor = request.GET.get('cursor')
+        if cursor:
+            cursor = decode_cursor(cursor)
+            if cursor is None:
+                raise ApiError('Неверный курсор.')
+            pub_date, post_id = cursor
+            queryset = queryset.filter(
+                Q(pub_date__lt=pub_date)
+                | Q(pub_date=pub_date, pk__lt=post_id))
+        # The cursor keys go last, after the requested fields.
+        rows = list(post_rows(queryset, names, 'pub_date', 'pk').order_by(
+            '-pub_date', '-pk')[:size + 1])
+        next_cursor = None
+        if len(rows) > size:
+            rows = rows[:size]
+            next_cursor = encode_cursor(rows[-1][-2], rows[-1][-1])
+        return json_response({
+            'results': as_dicts((row[:-2] for row in rows), names),
+            'next_cursor': next_cursor,
+        })
+
+
+class CategoryPostsApiView(PostListApiView):
+
+    def get_queryset(self):
+        category = categories.lookup('slug', self.kwargs['category_slug'])
+        if category is None or not category.is_published:
+            raise Http404('Категория не найдена.')
+        return super().get_queryset().filter(category=category)
+
+
+class AuthorPostsApiView(PostListApiView):
+    """An author's visible posts; all of them for the author."""
+    def get_queryset(self):
+        username = self.kwargs['username']
+        if username in missing_profiles:
+            raise Http404('Пользователь не найден.')
+        author = first_or_primary(User.objects.filter(
+            username=username).values_list('pk', flat=True))
+        if author is None:
+            missing_profiles.add(username)
+            raise Http404('Пользователь не найден.')
+        posts = Post.objects.filter(author=author)
+        if self.request.user.pk != author:
+            posts = posts.filter(is_visible=True)
+        return posts
+
+
+class PostDetailApiView(ApiView):
+    """A post with its published comments, which `fields` can leave out."""
+    def get(self, request, pk):
+        names = requested_fields(request, POST_FIELDS, extra=('comments',))
+        visible = Q(is_visible=True)
+        if request.user.is_authenticated:
+            visible |= Q(author=request.user)
+        post_names = [name for name in names if name in POST_FIELDS]
+        row = get_object_or_404(
+            post_rows(Post.objects.filter(visible, pk=pk), post_names))
+        post = as_dicts([row], post_names)[0]
+        if 'comments' in names:
+            comments = Comment.objects.filter(
+                post_id=pk, is_published=True
+            ).order_by('created_at', 'pk').values_list(
+                *COMMENT_FIELDS.values())
+            post['comments'] = [
+                dict(zip(COMMENT_FIELDS, row)) for row in comments]
+        return json_response(post)
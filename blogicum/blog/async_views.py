@@ -0,0 +1,172 @@
+"""
+Async variants of the read-only blog views.
+
+ORM work runs in a bounded thread pool (BLOG_ASYNC_DB_WORKERS threads,
+each with its own database connection), so independent queries of one
+request overlap instead of running back to back. The templates and
+context are the same as in blog.views.
+"""
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.paginator import Paginator
+from django.db import close_old_connections
+from django.http import Http404, HttpResponseNotAllowed
+from django.shortcuts import render
+
+from blog.cache import categories, missing_profiles
+from blog.constans import PAGINATOR
+from blog.counters import view_counter
+from blog.forms import CommentForm
+from blog.models import Comment, Post, User
+from blog.renderers import (post_card_rows, render_paginator,
+                            render_post_cards)
+from blog.timeline import follow_context
+from blog.views import get_posts_query, published_comments
+from blogicum.routers import (first_or_primary, replica_allowed,
+                              replica_reads)
+
+executor = ThreadPoolExecutor(
+    max_workers=settings.BLOG_ASYNC_DB_WORKERS,
+    thread_name_prefix='blog-db')
+
+
+def in_pool(func):
+    """
+    Run func in the pool. Like a request, each call drops a connection
+    that is broken or past CONN_MAX_AGE before and after it runs.
+    """
+    @functools.wraps(func)
+    def call(*args, **kwargs):
+        close_old_connections()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            close_old_connections()
+    return sync_to_async(call, thread_sensitive=False, executor=executor)
+
+
+def published_posts():
+    return get_posts_query().filter(is_visible=True)
+
+
+def paginate(queryset, page_number):
+    queryset = queryset.order_by('-pub_date').annotate(
+        comment_count=published_comments())
+    paginator = Paginator(queryset, PAGINATOR)
+    page_obj = paginator.get_page(page_number)
+    page_obj.object_list = list(page_obj.object_list)
+    context = {
+        'paginator': paginator,
+        'page_obj': page_obj,
+        'is_paginated': page_obj.has_other_pages(),
+        'object_list': page_obj.object_list,
+        'post_list': page_obj.object_list,
+    }
+    if settings.BLOG_FAST_RENDER:
+        context['post_cards'] = render_post_cards(post_card_rows(queryset[
+            page_obj.start_index() - 1:page_obj.end_index()]))
+        context['paginator_html'] = render_paginator(page_obj)
+    return context
+
+
+class AsyncView:
+    """
+    Minimal async class-based view for GET/HEAD requests; subclasses
+    define the coroutine get_context_data().
+    """
+    template_name = None
+
+    def __init__(self, request, **kwargs):
+        self.request = request
+        self.kwargs = kwargs
+
+    @classmethod
+    def as_view(cls):
+        async def view(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return HttpResponseNotAllowed(['GET', 'HEAD'])
+            self = cls(request, **kwargs)
+            allowed = await in_pool(replica_allowed)(request)
+            with replica_reads(allowed):
+                context = await self.get_context_data()
+                return await in_pool(render)(
+                    request, self.template_name, context)
+        view.view_class = cls
+        return view
+
+    @property
+    def page_number(self):
+        return self.request.GET.get('page')
+
+
+class PostListView(AsyncView):
+    template_name = 'blog/index.html'
+
+    async def get_context_data(self):
+        return await in_pool(paginate)(published_posts(), self.page_number)
+
+
+class CategoryListView(AsyncView):
+    template_name = 'blog/category.html'
+
+    async def get_context_data(self):
+        slug = self.kwargs['category_slug']
+        category, context = await asyncio.gather(
+            in_pool(categories.lookup)('slug', slug),
+            in_pool(paginate)(
+                published_posts().filter(category__slug=slug),
+                self.page_number),
+        )
+        if category is None or not category.is_published:
+            raise Http404('Категория не найдена.')
+        context['category'] = category
+        return context
+
+
+class ProfileListView(AsyncView):
+    template_name = 'blog/profile.html'
+
+    async def get_context_data(self):
+        username = self.kwargs['username']
+        if await in_pool(missing_profiles.__contains__)(username):
+            raise Http404('Пользователь не найден.')
+        profile, context = await asyncio.gather(
+            in_pool(first_or_primary)(
+                User.objects.filter(username=username)),
+            in_pool(paginate)(
+                get_posts_query().filter(author__username=username),
+                self.page_number),
+        )
+        if profile is None:
+            await in_pool(missing_profiles.add)(username)
+            raise Http404('Пользователь не найден.')
+        context['profile'] = profile
+        context.update(
+            await in_pool(follow_context)(self.request.user, profile))
+        return context
+
+
+class PostDetailView(AsyncView):
+    template_name = 'blog/detail.html'
+
+    async def get_context_data(self):
+        pk = self.kwargs['pk']
+        post, comments = await asyncio.gather(
+            in_pool(Post.objects.filter(pk=pk).first)(),
+            in_pool(list)(
+                Comment.objects.filter(
+                    post_id=pk, is_published=True).select_related('author')),
+        )
+        if post is None:
+            raise Http404('Публикация не найдена.')
+        view_counter.hit(post.pk)
+        return {
+            'post': post,
+            'object': post,
+            'form': CommentForm(),
+            'comments': comments,
+        }
@@ -0,0 +1,59 @@
+"""
+Prefix search behind the category and location pickers of PostForm.
+
+Names are matched through search_key, a casefolded copy kept in sync by
+a pre_save signal and covered by a partial index over published rows.
+"""
+from django.db import connections
+
+from blog.constans import AUTOCOMPLETE_LIMIT
+from blog.models import Category, Location
+
+SOURCES = {
+    'category': (Category, 'title'),
+    'location': (Location, 'name'),
+}
+LABELS = dict(SOURCES.values())
+
+
+def search_key(text):
+    return text.casefold()
+
+
+def prefix_upper_bound(prefix):
+    """
+    The smallest string above every string that starts with prefix, or
+    None if there is none. Surrogates cannot be stored, so the one after
+    U+D7FF is U+E000, and a trailing U+10FFFF cannot be raised at all.
+    """
+    while prefix:
+        code = ord(prefix[-1]) + 1
+        if 0xD800 <= code <= 0xDFFF:
+            code = 0xE000
+        if code <= 0x10FFFF:
+            return prefix[:-1] + chr(code)
+        prefix = prefix[:-1]
+    return None
+
+
+def prefix_filter(queryset, field, prefix):
+    if connections[queryset.db].vendor == 'sqlite':
+        # SQLite never uses an index for Django's LIKE ... ESCAPE, but
+        # does for a range, and compares text codepoint by codepoint.
+        queryset = queryset.filter(**{f'{field}__gte': prefix})
+        upper = prefix_upper_bound(prefix)
+        if upper is None:
+            return queryset
+        return queryset.filter(**{f'{field}__lt': upper})
+    return queryset.filter(**{f'{field}__startswith': prefix})
+
+
+def suggest(kind, query, limit=AUTOCOMPLETE_LIMIT):
+    """Published categories or locations whose name starts with query."""
+    model, label = SOURCES[kind]
+    queryset = model.objects.filter(is_published=True)
+    prefix = search_key(query.strip())
+    if prefix:
+        queryset = prefix_filter(queryset, 'search_key', prefix)
+    rows = queryset.order_by('search_key').values_list('pk', label)
+    return [{'id': pk, 'text': text} for pk, text in rows[:limit]]
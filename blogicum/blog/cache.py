@@ -0,0 +1,123 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.core.cache import cache
+
+from blog.constans import NEGATIVE_CACHE_SIZE, NEGATIVE_CACHE_TTL
+from blog.models import Category, Location
+from blogicum.routers import PRIMARY
+
+
+class VersionedCache:
+    """
+    Base for process-local caches invalidated through a shared version key.
+
+    A bump from any worker changes the key in the shared cache, and every
+    process drops its local copy the next time it reads.
+    """
+    def __init__(self, name):
+        self.version_key = f'blog:{name}:version'
+        self._version = None
+        self._lock = threading.Lock()
+
+    def version(self):
+        version = cache.get(self.version_key)
+        if version is None:
+            cache.add(self.version_key, time.time_ns(), timeout=None)
+            version = cache.get(self.version_key)
+        return version
+
+    def bump(self):
+        try:
+            cache.incr(self.version_key)
+        except ValueError:
+            cache.set(self.version_key, time.time_ns(), timeout=None)
+
+
+class ReferenceCache(VersionedCache):
+    """
+    Process-local copy of a small, rarely changing table.
+
+    The rows and the indexes built from them are kept together with the
+    version they were loaded at, so an index built from rows that a
+    concurrent refresh has replaced never lands in the new snapshot.
+    Rows are always loaded from the primary.
+    """
+    def __init__(self, model, name):
+        super().__init__(f'reference:{name}')
+        self.model = model
+        self._snapshot = (None, {}, {})
+
+    def _current(self):
+        version = self.version()
+        snapshot = self._snapshot
+        if snapshot[0] != version:
+            with self._lock:
+                snapshot = self._snapshot
+                if snapshot[0] != version:
+                    rows = {
+                        obj.pk: obj
+                        for obj in self.model.objects.using(PRIMARY)
+                    }
+                    snapshot = self._snapshot = (version, rows, {})
+        return snapshot
+
+    def rows(self):
+        return self._current()[1]
+
+    def get(self, pk):
+        return self.rows().get(pk)
+
+    def lookup(self, field, value):
+        _, rows, indexes = self._current()
+        index = indexes.get(field)
+        if index is None:
+            index = {getattr(obj, field): obj for obj in rows.values()}
+            indexes[field] = index
+        return index.get(value)
+
+
+class NegativeCache(VersionedCache):
+    """
+    Bounded LRU of lookup keys known to miss, each kept for `ttl` seconds.
+    """
+    def __init__(self, name, maxsize=NEGATIVE_CACHE_SIZE,
+                 ttl=NEGATIVE_CACHE_TTL):
+        super().__init__(f'negative:{name}')
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._misses = OrderedDict()
+
+    def _current(self):
+        version = self.version()
+        if version != self._version:
+            self._misses = OrderedDict()
+            self._version = version
+        return self._misses
+
+    def __contains__(self, key):
+        with self._lock:
+            misses = self._current()
+            expires = misses.get(key)
+            if expires is None:
+                return False
+            if expires < time.monotonic():
+                del misses[key]
+                return False
+            misses.move_to_end(key)
+            return True
+
+    def add(self, key):
+        with self._lock:
+            misses = self._current()
+            misses[key] = time.monotonic() + self.ttl
+            misses.move_to_end(key)
+            while len(misses) > self.maxsize:
+                misses.popitem(last=False)
+
+
+categories = ReferenceCache(Category, 'category')
+locations = ReferenceCache(Location, 'location')
+missing_profiles = NegativeCache('profile')
+feeds = VersionedCache('feeds')
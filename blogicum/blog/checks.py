@@ -0,0 +1,40 @@
+"""
+System checks for settings that need a cache shared between processes.
+"""
+from django.conf import settings
+from django.core.checks import Error, Warning, register
+
+CACHED_SESSION_ENGINES = (
+    'django.contrib.sessions.backends.cache',
+    'django.contrib.sessions.backends.cached_db',
+)
+
+
+@register()
+def check_cached_sessions(app_configs, **kwargs):
+    if (settings.SESSION_ENGINE in CACHED_SESSION_ENGINES
+            and not settings.BLOG_SHARED_CACHE):
+        return [Error(
+            'Cached sessions need a cache shared between processes.',
+            hint='A logout in one worker leaves the session cached in the '
+                 'others. Set BLOGICUM_CACHE_BACKEND to a shared backend '
+                 'or BLOGICUM_SESSION_MODE to db.',
+            id='blog.E001',
+        )]
+    return []
+
+
+@register(deploy=True)
+def check_shared_cache(app_configs, **kwargs):
+    if settings.BLOG_SHARED_CACHE:
+        return []
+    uses = ['cache version keys']
+    if settings.BLOG_READ_REPLICAS:
+        uses.append('replica stickiness')
+    return [Warning(
+        'The cache is kept per process, so {} and rate limits are not '
+        'shared between workers.'.format(', '.join(uses)),
+        hint='Set BLOGICUM_CACHE_BACKEND to a shared backend (Memcached, '
+             'Redis) when running more than one process.',
+        id='blog.W001',
+    )]
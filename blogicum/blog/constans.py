@@ -1 +1,23 @@
+from datetime import datetime, timezone
+
 PAGINATOR = 10
+NEGATIVE_CACHE_SIZE = 10000
+NEGATIVE_CACHE_TTL = 300
+MAX_IMAGE_SIZE = 10 * 1024 * 1024
+MAX_IMAGE_PIXELS = 40_000_000
+MAX_REENCODE_PIXELS = 12_000_000
+UPLOAD_CHUNK_SIZE = 64 * 1024
+TRENDING_EPOCH = datetime(2023, 1, 1, tzinfo=timezone.utc)
+TRENDING_HALF_LIFE = 6 * 60 * 60
+TRENDING_PUBLISH_WEIGHT = 1.0
+TRENDING_COMMENT_WEIGHT = 3.0
+TRENDING_VIEW_WEIGHT = 0.1
+FANOUT_BATCH_SIZE = 1000
+PULL_AUTHORS_TTL = 300
+TIMELINE_BACKFILL = 50
+AUTOCOMPLETE_LIMIT = 20
+FEED_ITEMS = 20
+FEED_CACHE_TIMEOUT = 24 * 60 * 60
+FEED_PENDING_TIMEOUT = 60
+SITEMAP_CHUNK_SIZE = 10000
+API_MAX_PAGE_SIZE = 100
@@ -0,0 +1,118 @@
+"""
+Buffered post view counters.
+
+Views are counted in process memory and written, together with their
+trending score, by one UPDATE per flush instead of one per request.
+Requests only count: a flusher thread writes the buffer every
+BLOG_VIEWS_FLUSH_INTERVAL seconds, or as soon as BLOG_VIEWS_FLUSH_SIZE
+posts are pending, and what is left is written at interpreter exit, so
+a crashed worker loses at most one buffer of views.
+"""
+import atexit
+import logging
+import math
+import threading
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.db.models import Case, F, FloatField, IntegerField, Value, When
+from django.utils import timezone
+
+from blog import trending
+from blog.constans import TRENDING_VIEW_WEIGHT
+from blog.models import Post
+
+logger = logging.getLogger(__name__)
+
+
+class ViewCounter:
+
+    def __init__(self, autoflush=True):
+        self.autoflush = autoflush
+        self._pending = Counter()
+        self._lock = threading.Lock()
+        self._full = threading.Event()
+        self._thread = None
+
+    def hit(self, post_id):
+        with self._lock:
+            self._pending[post_id] += 1
+            full = len(self._pending) >= settings.BLOG_VIEWS_FLUSH_SIZE
+        if full:
+            self._full.set()
+        if self.autoflush:
+            self._ensure_thread()
+
+    def pending(self, post_id):
+        return self._pending.get(post_id, 0)
+
+    def clear(self):
+        """Drop the buffer; return the number of views dropped."""
+        with self._lock:
+            pending, self._pending = self._pending, Counter()
+        return sum(pending.values())
+
+    def _ensure_thread(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name='blog-view-counter', daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            self._full.wait(settings.BLOG_VIEWS_FLUSH_INTERVAL)
+            self._full.clear()
+            try:
+                self.flush()
+            finally:
+                close_old_connections()
+
+    def flush(self):
+        """Write the buffer with a single UPDATE; return the posts touched."""
+        with self._lock:
+            pending, self._pending = self._pending, Counter()
+        if not pending:
+            return 0
+        by_count = defaultdict(list)
+        for post_id, count in pending.items():
+            by_count[count].append(post_id)
+        increment = Case(
+            *(When(pk__in=ids, then=Value(count))
+              for count, ids in by_count.items()),
+            default=Value(0),
+            output_field=IntegerField(),
+        )
+        now = timezone.now()
+        event = Case(
+            *(When(pk__in=ids, then=Value(trending.event_score(
+                TRENDING_VIEW_WEIGHT * count, now)))
+              for count, ids in by_count.items()),
+            default=Value(-math.inf),
+            output_field=FloatField(),
+        )
+        try:
+            return Post.objects.filter(pk__in=pending).update(
+                views=F('views') + increment,
+                trending_score=trending.added_score(event))
+        except Exception:
+            # Keep the views for the next flush.
+            logger.exception('Could not flush %d view counters', len(pending))
+            with self._lock:
+                self._pending.update(pending)
+            return 0
+
+
+view_counter = ViewCounter()
+
+
+@atexit.register
+def flush_at_exit():
+    """Write what is left; without a database the views are dropped."""
+    view_counter.flush()
+    lost = view_counter.clear()
+    if lost:
+        logger.warning('Lost %d buffered post views', lost)
@@ -0,0 +1,168 @@
+"""
+RSS and Atom feeds of the index, a category and an author.
+
+Items come from one values() query. The rendered feed, whose links are
+absolute, is cached per scheme, host and path under the `feeds`
+version, which writes to posts, categories and usernames bump, and is
+served with ETag and Last-Modified so that polling readers mostly get
+304 Not Modified. It is rendered from the primary, so a poll right after
+a write never caches a lagging replica's feed under the new version.
+
+publish_scheduled runs in its own process and its posts_published bump
+does not reach a per-process cache, so a feed also expires when the
+next scheduled post is due.
+"""
+import hashlib
+import math
+
+from django.contrib.syndication.views import Feed
+from django.core.cache import cache
+from django.http import Http404, HttpResponse
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.feedgenerator import Atom1Feed
+from django.utils.http import http_date, quote_etag
+
+from blog.cache import categories, feeds
+from blog.constans import FEED_CACHE_TIMEOUT, FEED_ITEMS, FEED_PENDING_TIMEOUT
+from blog.models import Post, User
+from blog.publishing import due_posts, next_publication_time
+
+FEED_FIELDS = (
+    'id', 'title', 'text', 'pub_date', 'author__username', 'category__title',
+)
+
+
+def feed_rows(**filters):
+    return Post.objects.filter(is_visible=True, **filters).order_by(
+        '-pub_date').values(*FEED_FIELDS)[:FEED_ITEMS]
+
+
+def feed_timeout(now=None):
+    """
+    Seconds until the next scheduled post is due, at most a day; while a
+    due post waits for publish_scheduled, FEED_PENDING_TIMEOUT.
+    """
+    now = now or timezone.now()
+    if due_posts(now).exists():
+        return FEED_PENDING_TIMEOUT
+    next_time = next_publication_time(now)
+    if next_time is None:
+        return FEED_CACHE_TIMEOUT
+    return min(FEED_CACHE_TIMEOUT,
+               math.ceil((next_time - now).total_seconds()))
+
+
+class PostsFeed(Feed):
+    title = 'Блогикум'
+    description = 'Новые публикации'
+
+    def __call__(self, request, *args, **kwargs):
+        url = request.build_absolute_uri(request.path)
+        key = 'blog:feed:{}:{}'.format(
+            feeds.version(), hashlib.md5(url.encode()).hexdigest())
+        entry = cache.get(key)
+        if entry is None:
+            entry = self.render(request, *args, **kwargs)
+            cache.set(key, entry, feed_timeout())
+        content_type, content, etag, last_modified = entry
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = HttpResponse(content, content_type=content_type)
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(last_modified)
+        return response
+
+    def render(self, request, *args, **kwargs):
+        obj = self.get_object(request, *args, **kwargs)
+        feed = self.get_feed(obj, request)
+        content = feed.writeString('utf-8').encode()
+        etag = quote_etag(hashlib.md5(content).hexdigest())
+        last_modified = int(feed.latest_post_date().timestamp())
+        return feed.content_type, content, etag, last_modified
+
+    def link(self):
+        return reverse('blog:index')
+
+    def items(self):
+        return feed_rows()
+
+    def item_title(self, item):
+        return item['title']
+
+    def item_description(self, item):
+        return item['text']
+
+    def item_link(self, item):
+        return reverse('blog:post_detail', args=[item['id']])
+
+    def item_pubdate(self, item):
+        return item['pub_date']
+
+    def item_author_name(self, item):
+        return item['author__username']
+
+    def item_categories(self, item):
+        return (item['category__title'],)
+
+
+class CategoryFeed(PostsFeed):
+
+    def get_object(self, request, category_slug):
+        category = categories.lookup('slug', category_slug)
+        if category is None or not category.is_published:
+            raise Http404('Категория не найдена.')
+        return category
+
+    def title(self, category):
+        return f'Блогикум: {category.title}'
+
+    def description(self, category):
+        return category.description
+
+    def link(self, category):
+        return reverse('blog:category_posts', args=[category.slug])
+
+    def items(self, category):
+        return feed_rows(category=category)
+
+
+class AuthorFeed(PostsFeed):
+
+    def get_object(self, request, username):
+        return get_object_or_404(
+            User.objects.only('pk', 'username'), username=username)
+
+    def title(self, author):
+        return f'Блогикум: @{author.username}'
+
+    def description(self, author):
+        return f'Публикации пользователя @{author.username}'
+
+    def link(self, author):
+        return reverse('blog:profile', args=[author.username])
+
+    def items(self, author):
+        return feed_rows(author=author)
+
+
+class AtomPostsFeed(PostsFeed):
+    feed_type = Atom1Feed
+    subtitle = PostsFeed.description
+
+
+class AtomCategoryFeed(CategoryFeed):
+    feed_type = Atom1Feed
+
+    def subtitle(self, category):
+        return category.description
+
+
+class AtomAuthorFeed(AuthorFeed):
+    feed_type = Atom1Feed
+
+    def subtitle(self, author):
+        return self.description(author)
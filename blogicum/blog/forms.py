@@ -1,13 +1,27 @@
 from django import forms
+from django.core.files.uploadedfile import UploadedFile
 
+from .cache import categories, locations
+from .images import clean_image
 from .models import Comment, Post, User
+from .widgets import AutocompleteSelect
 
 
 class PostForm(forms.ModelForm):
 
+    def clean_image(self):
+        image = self.cleaned_data.get('image')
+        if isinstance(image, UploadedFile):
+            return clean_image(image)
+        return image
+
     class Meta:
         model = Post
         fields = ('title', 'text', 'location', 'category', 'image', )
+        widgets = {
+            'location': AutocompleteSelect('location', locations),
+            'category': AutocompleteSelect('category', categories),
+        }
 
 
 class ProfileForm(forms.ModelForm):
@@ -0,0 +1,233 @@
+"""
+Bounded-memory validation and cleanup of uploaded post images.
+
+Limits are checked from the upload size and the image header before any
+pixel data is decoded. Metadata is stripped by copying JPEG segments and
+PNG and WebP chunks between temporary files; a JPEG keeps its EXIF
+orientation as the only tag, which browsers apply when showing it. Other
+formats, and PNG or WebP images that have to be rotated, are decoded and
+saved again, which is only done up to MAX_REENCODE_PIXELS.
+"""
+import shutil
+
+from django import forms
+from django.core.exceptions import ValidationError
+from django.core.files.uploadedfile import TemporaryUploadedFile
+from PIL import Image, ImageOps
+
+from blog.constans import (MAX_IMAGE_PIXELS, MAX_IMAGE_SIZE,
+                           MAX_REENCODE_PIXELS, UPLOAD_CHUNK_SIZE)
+
+EXIF_ORIENTATION = 0x0112
+JPEG_STANDALONE_MARKERS = {0x01, *range(0xD0, 0xD8)}
+JPEG_METADATA_MARKERS = {0xE1, 0xED}  # APP1 (EXIF, XMP), APP13 (IPTC)
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+PNG_METADATA_CHUNKS = {b'eXIf', b'tEXt', b'zTXt', b'iTXt', b'tIME'}
+WEBP_METADATA_CHUNKS = {b'EXIF', b'XMP '}
+WEBP_VP8X_METADATA_FLAGS = 0x08 | 0x04  # EXIF, XMP
+METADATA_INFO_KEYS = ('exif', 'xmp', 'XML:com.adobe.xmp', 'comment')
+
+
+def copy_bytes(src, dst, length):
+    while length > 0:
+        chunk = src.read(min(UPLOAD_CHUNK_SIZE, length))
+        if not chunk:
+            raise ValueError('Unexpected end of file')
+        dst.write(chunk)
+        length -= len(chunk)
+
+
+def orientation_segment(orientation):
+    """APP1 segment with an EXIF block holding only the orientation."""
+    exif = Image.Exif()
+    exif[EXIF_ORIENTATION] = orientation
+    data = exif.tobytes()
+    return b'\xff\xe1' + (len(data) + 2).to_bytes(2, 'big') + data
+
+
+def read_byte(src):
+    byte = src.read(1)
+    if not byte:
+        raise ValueError('Unexpected end of file')
+    return byte[0]
+
+
+def read_jpeg_marker(src):
+    """
+    Return the code of the next marker, skipping stray bytes before it
+    and fill bytes within it, as Pillow does.
+    """
+    while True:
+        while read_byte(src) != 0xFF:
+            pass
+        code = read_byte(src)
+        while code == 0xFF:
+            code = read_byte(src)
+        if code:
+            return code
+
+
+def strip_jpeg_metadata(src, dst, orientation=1):
+    if src.read(2) != b'\xff\xd8':
+        raise ValueError('Not a JPEG file')
+    dst.write(b'\xff\xd8')
+    if orientation != 1:
+        dst.write(orientation_segment(orientation))
+    while True:
+        code = read_jpeg_marker(src)
+        if code in JPEG_STANDALONE_MARKERS:
+            dst.write(bytes((0xFF, code)))
+            continue
+        if code == 0xD9:
+            dst.write(b'\xff\xd9')
+            return
+        length_bytes = src.read(2)
+        length = int.from_bytes(length_bytes, 'big') - 2
+        if len(length_bytes) < 2 or length < 0:
+            raise ValueError('Corrupt JPEG segment length')
+        if code in JPEG_METADATA_MARKERS:
+            src.seek(length, 1)
+            continue
+        dst.write(bytes((0xFF, code)) + length_bytes)
+        copy_bytes(src, dst, length)
+        if code == 0xDA:
+            shutil.copyfileobj(src, dst, UPLOAD_CHUNK_SIZE)
+            return
+
+
+def strip_png_metadata(src, dst):
+    if src.read(8) != PNG_SIGNATURE:
+        raise ValueError('Not a PNG file')
+    dst.write(PNG_SIGNATURE)
+    while True:
+        header = src.read(8)
+        if not header:
+            return
+        length = int.from_bytes(header[:4], 'big')
+        chunk_type = header[4:]
+        if chunk_type in PNG_METADATA_CHUNKS:
+            src.seek(length + 4, 1)
+            continue
+        dst.write(header)
+        copy_bytes(src, dst, length + 4)
+        if chunk_type == b'IEND':
+            return
+
+
+def strip_webp_metadata(src, dst):
+    header = src.read(12)
+    if header[:4] != b'RIFF' or header[8:] != b'WEBP':
+        raise ValueError('Not a WebP file')
+    dst.write(header)
+    while True:
+        chunk_header = src.read(8)
+        if not chunk_header:
+            break
+        chunk_type = chunk_header[:4]
+        length = int.from_bytes(chunk_header[4:], 'little')
+        length += length % 2
+        if chunk_type in WEBP_METADATA_CHUNKS:
+            src.seek(length, 1)
+            continue
+        dst.write(chunk_header)
+        if chunk_type == b'VP8X':
+            flags = read_byte(src) & ~WEBP_VP8X_METADATA_FLAGS
+            dst.write(bytes((flags,)))
+            length -= 1
+        copy_bytes(src, dst, length)
+    # The RIFF size covers everything after its own eight bytes.
+    end = dst.tell()
+    dst.seek(4)
+    dst.write((end - 8).to_bytes(4, 'little'))
+    dst.seek(end)
+
+
+def too_many_pixels(limit):
+    return ValidationError(
+        'Изображение слишком большое: не более %(pixels)s мегапикселей.',
+        params={'pixels': limit // 1_000_000},
+        code='too_many_pixels')
+
+
+def reencode(upload, dst, image_format):
+    """Decode the image, apply its orientation and save it without metadata."""
+    with Image.open(upload) as image:
+        width, height = image.size
+        if width * height > MAX_REENCODE_PIXELS:
+            raise too_many_pixels(MAX_REENCODE_PIXELS)
+        options = {'format': image_format}
+        if getattr(image, 'n_frames', 1) > 1:
+            options['save_all'] = True
+        else:
+            image = ImageOps.exif_transpose(image)
+        for key in METADATA_INFO_KEYS:
+            image.info.pop(key, None)
+        image.save(dst, **options)
+
+
+def invalid_image():
+    return ValidationError(
+        forms.ImageField.default_error_messages['invalid_image'],
+        code='invalid_image')
+
+
+def read_header(upload):
+    """Check the pixel count; return the format and EXIF orientation."""
+    upload.seek(0)
+    try:
+        image = Image.open(upload)
+    except Image.DecompressionBombError:
+        raise too_many_pixels(MAX_IMAGE_PIXELS)
+    except (OSError, SyntaxError, ValueError):
+        raise invalid_image()
+    with image:
+        width, height = image.size
+        if width * height > MAX_IMAGE_PIXELS:
+            raise too_many_pixels(MAX_IMAGE_PIXELS)
+        try:
+            return image.format, image.getexif().get(EXIF_ORIENTATION, 1)
+        except (OSError, SyntaxError, ValueError):
+            raise invalid_image()
+
+
+def copy_without_metadata(src, dst, image_format, orientation):
+    if image_format == 'JPEG':
+        strip_jpeg_metadata(src, dst, orientation)
+    elif image_format == 'PNG' and orientation == 1:
+        strip_png_metadata(src, dst)
+    elif image_format == 'WEBP' and orientation == 1:
+        strip_webp_metadata(src, dst)
+    else:
+        reencode(src, dst, image_format)
+
+
+def clean_image(upload):
+    """
+    Validate an uploaded image and return a copy without metadata.
+
+    A file whose segments or chunks cannot be copied is decoded and
+    saved again instead, within the same pixel limit as other formats.
+    """
+    if upload.size > MAX_IMAGE_SIZE:
+        raise ValidationError(
+            'Размер файла не должен превышать %(size)s МБ.',
+            params={'size': MAX_IMAGE_SIZE // (1024 * 1024)},
+            code='file_too_large')
+    image_format, orientation = read_header(upload)
+
+    cleaned = TemporaryUploadedFile(
+        upload.name, upload.content_type, 0, upload.charset)
+    upload.seek(0)
+    try:
+        try:
+            copy_without_metadata(upload, cleaned, image_format, orientation)
+        except ValueError:
+            upload.seek(0)
+            cleaned.seek(0)
+            cleaned.truncate()
+            reencode(upload, cleaned, image_format)
+    except (OSError, SyntaxError, ValueError):
+        raise invalid_image()
+    cleaned.size = cleaned.tell()
+    cleaned.seek(0)
+    return cleaned
@@ -0,0 +1,32 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from blog.sitemaps import build
+
+
+class Command(BaseCommand):
+    help = (
+        'Write the sitemap index and its chunks to BLOG_SITEMAP_ROOT, '
+        'regenerating only the chunks whose entries changed since the '
+        'previous run. Meant to run periodically, e.g. from cron.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--full', action='store_true',
+            help='Regenerate every chunk.')
+        parser.add_argument(
+            '--base-url', default=settings.BLOG_SITE_URL,
+            help='Scheme and host of the URLs in the sitemaps.')
+
+    def handle(self, *args, full, base_url, verbosity, **options):
+        start = time.monotonic()
+        written = build(settings.BLOG_SITEMAP_ROOT, base_url, full)
+        if verbosity > 1:
+            for filename in written:
+                self.stdout.write(f'Wrote {filename}.')
+        self.stdout.write(
+            f'Regenerated {len(written)} sitemap chunks in '
+            f'{time.monotonic() - start:.2f} s.')
@@ -0,0 +1,106 @@
+import os
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from blog.models import Post
+
+
+def scan_files(root):
+    """Yield (relative name, size, mtime) of every file under root."""
+    stack = [root]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    stat = entry.stat(follow_symlinks=False)
+                    name = Path(entry.path).relative_to(
+                        settings.MEDIA_ROOT).as_posix()
+                    yield name, stat.st_size, stat.st_mtime
+
+
+class Command(BaseCommand):
+    help = 'Remove or quarantine post images that no post references.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='Only report orphaned files.')
+        parser.add_argument(
+            '--quarantine', metavar='DIR',
+            help='Move orphaned files to DIR instead of deleting them.')
+        parser.add_argument(
+            '--batch-size', type=int, default=100,
+            help='Files handled between pauses.')
+        parser.add_argument(
+            '--sleep', type=float, default=0.1,
+            help='Pause between batches, in seconds.')
+        parser.add_argument(
+            '--min-age', type=float,
+            default=settings.BLOG_IMAGE_GRACE_SECONDS,
+            help='Skip files written or reused less than this many seconds '
+                 'ago, so uploads that are not committed yet are kept.')
+
+    def handle(self, *args, dry_run, quarantine, batch_size, sleep,
+               min_age, verbosity, **options):
+        self.verbosity = verbosity
+        root = Path(settings.MEDIA_ROOT) / Post.image.field.upload_to
+        if not root.is_dir():
+            self.stdout.write(f'{root} does not exist, nothing to do.')
+            return
+        referenced = set(
+            Post.objects.exclude(image='')
+            .values_list('image', flat=True).iterator(chunk_size=2000)
+        )
+        newest = time.time() - min_age
+        scanned = orphans = orphan_bytes = 0
+        batch = []
+        for name, size, mtime in scan_files(root):
+            scanned += 1
+            if name in referenced or mtime > newest:
+                continue
+            batch.append((name, size))
+            if len(batch) >= batch_size:
+                handled = self.handle_batch(
+                    batch, dry_run, quarantine, min_age)
+                orphans += len(handled)
+                orphan_bytes += sum(handled)
+                batch = []
+                time.sleep(sleep)
+        if batch:
+            handled = self.handle_batch(batch, dry_run, quarantine, min_age)
+            orphans += len(handled)
+            orphan_bytes += sum(handled)
+
+        if dry_run:
+            action = 'Would remove'
+        elif quarantine:
+            action = f'Moved to {quarantine}'
+        else:
+            action = 'Removed'
+        self.stdout.write(
+            f'Scanned {scanned} files, {len(referenced)} referenced images. '
+            f'{action} {orphans} orphaned files ({orphan_bytes} bytes).')
+
+    def handle_batch(self, files, dry_run, quarantine, min_age):
+        """
+        Remove or quarantine files; return the sizes of those handled.
+
+        References are checked again right before each file goes, as a
+        post may have picked the file up since the scan.
+        """
+        storage = Post.image.field.storage
+        handled = []
+        for name, size in files:
+            if not dry_run and not storage.discard(
+                    name, Post.objects.filter(image=name).exists, min_age,
+                    move_to=quarantine and str(Path(quarantine) / name)):
+                continue
+            if self.verbosity >= 2:
+                self.stdout.write(name)
+            handled.append(size)
+        return handled
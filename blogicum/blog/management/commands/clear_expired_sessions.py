@@ -0,0 +1,48 @@
+import time
+
+from django.conf import settings
+from django.contrib.sessions.models import Session
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+DB_SESSION_ENGINES = (
+    'django.contrib.sessions.backends.db',
+    'django.contrib.sessions.backends.cached_db',
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Delete expired sessions in small batches, so the write lock is '
+        'released between batches instead of being held for one long DELETE.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=500,
+            help='Sessions deleted per transaction.')
+        parser.add_argument(
+            '--sleep', type=float, default=0.05,
+            help='Pause between batches, in seconds.')
+
+    def handle(self, *args, batch_size, sleep, **options):
+        if settings.SESSION_ENGINE not in DB_SESSION_ENGINES:
+            self.stdout.write(
+                f'{settings.SESSION_ENGINE} does not store sessions '
+                'in the database, nothing to clean up.')
+            return
+        now = timezone.now()
+        total = 0
+        while True:
+            keys = list(
+                Session.objects.filter(expire_date__lt=now)
+                .values_list('pk', flat=True)[:batch_size]
+            )
+            if not keys:
+                break
+            deleted, _ = Session.objects.filter(pk__in=keys).delete()
+            total += deleted
+            if len(keys) < batch_size:
+                break
+            time.sleep(sleep)
+        self.stdout.write(f'Deleted {total} expired sessions.')
@@ -0,0 +1,49 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from blog.publishing import next_publication_time, publish_due
+
+
+class Command(BaseCommand):
+    help = (
+        'Make future-dated posts visible once their publication time has '
+        'come. Safe to run concurrently and repeatedly; with --loop it '
+        'sleeps until the next scheduled post.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=500,
+            help='Posts published per transaction.')
+        parser.add_argument(
+            '--loop', action='store_true',
+            help='Keep running and publish posts as they become due.')
+        parser.add_argument(
+            '--max-sleep', type=float, default=60,
+            help='Longest pause between runs in --loop mode, in seconds; '
+                 'bounds the delay for posts scheduled by other workers.')
+
+    def handle(self, *args, batch_size, loop, max_sleep, **options):
+        while True:
+            total = self.publish(batch_size)
+            self.stdout.write(f'Published {total} scheduled posts.')
+            if not loop:
+                return
+            time.sleep(self.pause(max_sleep))
+
+    def publish(self, batch_size):
+        total = 0
+        while True:
+            ids = publish_due(batch_size)
+            total += len(ids)
+            if len(ids) < batch_size:
+                return total
+
+    def pause(self, max_sleep):
+        next_time = next_publication_time()
+        if next_time is None:
+            return max_sleep
+        delay = (next_time - timezone.now()).total_seconds()
+        return min(max(delay, 0), max_sleep)
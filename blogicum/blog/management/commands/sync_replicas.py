@@ -0,0 +1,73 @@
+import os
+import sqlite3
+import tempfile
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+def copy_database(source, target, pages):
+    """
+    Copy an SQLite database with the online backup API.
+
+    The copy is written to a temporary file next to the target and then
+    moved over it, so readers of the replica never see a half-copied
+    database: open connections keep the old file, new ones get the new.
+    """
+    fd, temporary = tempfile.mkstemp(
+        dir=os.path.dirname(os.path.abspath(target)), prefix='.sync-')
+    os.close(fd)
+    try:
+        source_connection = sqlite3.connect(source)
+        target_connection = sqlite3.connect(temporary)
+        try:
+            source_connection.backup(target_connection, pages=pages)
+        finally:
+            target_connection.close()
+            source_connection.close()
+        os.replace(temporary, target)
+    except BaseException:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+        raise
+
+
+class Command(BaseCommand):
+    help = (
+        'Refresh the SQLite read replicas from the primary database with '
+        'the online backup API, which copies a few pages at a time and '
+        'does not block writers for the whole copy.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--pages', type=int, default=256,
+            help='Pages copied per backup step.')
+        parser.add_argument(
+            '--loop', action='store_true',
+            help='Keep refreshing the replicas.')
+        parser.add_argument(
+            '--interval', type=float, default=5,
+            help='Pause between refreshes in --loop mode, in seconds; '
+                 'keep it below BLOG_REPLICA_STICKY_SECONDS.')
+
+    def handle(self, *args, pages, loop, interval, **options):
+        primary = settings.DATABASES['default']
+        if primary['ENGINE'] != 'django.db.backends.sqlite3':
+            raise CommandError(
+                'sync_replicas only copies SQLite databases; use the '
+                'replication of your database server instead.')
+        if not settings.BLOG_READ_REPLICAS:
+            self.stdout.write('No read replicas are configured.')
+            return
+        while True:
+            for alias in settings.BLOG_READ_REPLICAS:
+                start = time.monotonic()
+                copy_database(
+                    primary['NAME'], settings.DATABASES[alias]['NAME'], pages)
+                self.stdout.write(
+                    f'{alias}: synced in {time.monotonic() - start:.2f} s.')
+            if not loop:
+                return
+            time.sleep(interval)
@@ -0,0 +1,72 @@
+# Generated by Django 3.2.16 on 2026-10-19 11:01
+
+import math
+from datetime import datetime, timezone
+
+from django.db import migrations, models
+from django.utils import timezone as django_timezone
+
+# Copies of the trending constants and helpers at the time of this
+# migration, so that later changes to blog.trending don't change it.
+EPOCH = datetime(2023, 1, 1, tzinfo=timezone.utc)
+DECAY = math.log(2) / (6 * 60 * 60)
+PUBLISH_WEIGHT = 1.0
+COMMENT_WEIGHT = 3.0
+VIEW_WEIGHT = 0.1
+BATCH_SIZE = 1000
+
+
+def event_score(weight, when):
+    return math.log(weight) + DECAY * (when - EPOCH).total_seconds()
+
+
+def combine(a, b):
+    return max(a, b) + math.log1p(math.exp(-abs(a - b)))
+
+
+def compute_scores(apps, schema_editor):
+    Post = apps.get_model('blog', 'Post')
+    Comment = apps.get_model('blog', 'Comment')
+    now = django_timezone.now()
+    last_pk = 0
+    while True:
+        posts = list(
+            Post.objects.filter(pk__gt=last_pk).order_by('pk')
+            .only('pk', 'pub_date', 'views')[:BATCH_SIZE]
+        )
+        if not posts:
+            return
+        scores = {
+            post.pk: event_score(PUBLISH_WEIGHT, post.pub_date)
+            for post in posts
+        }
+        comments = Comment.objects.filter(
+            post_id__gt=last_pk, post_id__lte=posts[-1].pk,
+        ).values_list('post_id', 'created_at')
+        for post_id, created_at in comments.iterator():
+            scores[post_id] = combine(
+                scores[post_id], event_score(COMMENT_WEIGHT, created_at))
+        for post in posts:
+            post.trending_score = scores[post.pk]
+            if post.views:
+                post.trending_score = combine(
+                    post.trending_score,
+                    event_score(VIEW_WEIGHT * post.views, now))
+        Post.objects.bulk_update(posts, ['trending_score'])
+        last_pk = posts[-1].pk
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0016_post_views'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='trending_score',
+            field=models.FloatField(db_index=True, default=0, editable=False, verbose_name='Популярность'),
+        ),
+        migrations.RunPython(compute_scores, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 3.2.16 on 2026-10-19 11:12
+
+from django.db import migrations
+from django.utils import timezone
+
+
+def hide_scheduled_posts(apps, schema_editor):
+    Post = apps.get_model('blog', 'Post')
+    Post.objects.filter(
+        is_visible=True, pub_date__gt=timezone.now()
+    ).update(is_visible=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0019_post_is_visible'),
+    ]
+
+    operations = [
+        migrations.RunPython(hide_scheduled_posts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 3.2.16 on 2026-10-19 11:40
+
+from django.db import migrations, models
+
+
+def fill_search_keys(apps, schema_editor):
+    for model_name, field in (('Category', 'title'), ('Location', 'name')):
+        model = apps.get_model('blog', model_name)
+        objs = list(model.objects.only('pk', field))
+        for obj in objs:
+            obj.search_key = getattr(obj, field).casefold()
+        model.objects.bulk_update(objs, ['search_key'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0021_post_pub_date_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='category',
+            name='search_key',
+            field=models.CharField(default='', editable=False, max_length=256),
+        ),
+        migrations.AddField(
+            model_name='location',
+            name='search_key',
+            field=models.CharField(default='', editable=False, max_length=256),
+        ),
+        migrations.AddIndex(
+            model_name='category',
+            index=models.Index(condition=models.Q(('is_published', True)), fields=['search_key'], name='category_search', opclasses=('varchar_pattern_ops',)),
+        ),
+        migrations.AddIndex(
+            model_name='location',
+            index=models.Index(condition=models.Q(('is_published', True)), fields=['search_key'], name='location_search', opclasses=('varchar_pattern_ops',)),
+        ),
+        migrations.RunPython(fill_search_keys, migrations.RunPython.noop),
+    ]
@@ -1,5 +1,15 @@
+from http import HTTPStatus
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseRedirect
 from django.shortcuts import get_object_or_404, redirect
 
+from blog.ratelimit import client_key, count_request
+from blog.renderers import (post_card_rows, render_paginator,
+                            render_post_cards)
+from blog.writer import save_files, writer
+from blogicum.routers import replica_allowed, replica_reads
+
 
 class PostCommentDispatchMixin:
     def dispatch(self, request, *args, **kwargs):
@@ -12,3 +22,60 @@ class PostCommentDispatchMixin:
             request,
             *args,
             **kwargs)
+
+
+class ReplicaReadMixin:
+    """
+    Read from a replica, rendering included, unless the user just wrote.
+    """
+    def dispatch(self, request, *args, **kwargs):
+        with replica_reads(replica_allowed(request)):
+            response = super().dispatch(request, *args, **kwargs)
+            if hasattr(response, 'render'):
+                response.render()
+        return response
+
+
+class PostCardsMixin:
+    """
+    Prerender post cards and paginator when BLOG_FAST_RENDER is enabled.
+    """
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        if settings.BLOG_FAST_RENDER:
+            page_obj = context['page_obj']
+            context['post_cards'] = render_post_cards(
+                post_card_rows(page_obj.object_list))
+            context['paginator_html'] = render_paginator(page_obj)
+        return context
+
+
+class RateLimitMixin:
+    """
+    Throttle accepted forms with the BLOG_RATE_LIMITS limit of the scope.
+    """
+    rate_limit_scope = None
+
+    def form_valid(self, form):
+        rate, period = settings.BLOG_RATE_LIMITS[self.rate_limit_scope]
+        retry_after = count_request(
+            self.rate_limit_scope, client_key(self.request), rate, period)
+        if retry_after:
+            response = HttpResponse(
+                'Слишком много запросов. Попробуйте позже.',
+                status=HTTPStatus.TOO_MANY_REQUESTS)
+            response['Retry-After'] = str(retry_after)
+            return response
+        return super().form_valid(form)
+
+
+class SingleWriterMixin:
+    """
+    Save the form through the single writer when BLOG_SINGLE_WRITER is on.
+    """
+    def form_valid(self, form):
+        if not settings.BLOG_SINGLE_WRITER:
+            return super().form_valid(form)
+        save_files(form.instance)
+        self.object = writer.submit(form.save)
+        return HttpResponseRedirect(self.get_success_url())
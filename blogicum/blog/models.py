@@ -2,6 +2,8 @@ from django.contrib.auth import get_user_model
 from django.db import models
 from django.utils import timezone
 
+from blog.storage import ContentAddressedStorage
+
 User = get_user_model()
 
 
@@ -40,10 +42,23 @@ class Category(PublishedModel):
         help_text='Идентификатор страницы для URL; '
         'разрешены символы латиницы, цифры, дефис и подчёркивание.',
     )
+    search_key = models.CharField(
+        max_length=256,
+        default='',
+        editable=False,
+    )
 
     class Meta:
         verbose_name = 'категория'
         verbose_name_plural = 'Категории'
+        indexes = (
+            models.Index(
+                fields=('search_key',),
+                name='category_search',
+                opclasses=('varchar_pattern_ops',),
+                condition=models.Q(is_published=True),
+            ),
+        )
 
     def __str__(self):
         return self.title[:50]
@@ -57,10 +72,23 @@ class Location(PublishedModel):
         max_length=256,
         verbose_name='Название места',
     )
+    search_key = models.CharField(
+        max_length=256,
+        default='',
+        editable=False,
+    )
 
     class Meta:
         verbose_name = 'местоположение'
         verbose_name_plural = 'Местоположения'
+        indexes = (
+            models.Index(
+                fields=('search_key',),
+                name='location_search',
+                opclasses=('varchar_pattern_ops',),
+                condition=models.Q(is_published=True),
+            ),
+        )
 
     def __str__(self):
         return self.name
@@ -79,6 +107,7 @@ class Post(PublishedModel):
     )
     pub_date = models.DateTimeField(
         default=timezone.now,
+        db_index=True,
         verbose_name='Дата и время публикации',
         help_text='Если установить дату и время в будущем — '
         'можно делать отложенные публикации.')
@@ -102,15 +131,57 @@ class Post(PublishedModel):
         null=True,
         verbose_name='Категория',
         related_name='posts_categorys',)
-    image = models.ImageField('Фото', upload_to='post_media', blank=True)
+    image = models.ImageField(
+        'Фото',
+        upload_to='post_media',
+        blank=True,
+        storage=ContentAddressedStorage(),
+    )
+    views = models.PositiveIntegerField(
+        default=0,
+        db_index=True,
+        editable=False,
+        verbose_name='Просмотры',
+    )
+    trending_score = models.FloatField(
+        default=0,
+        db_index=True,
+        editable=False,
+        verbose_name='Популярность',
+    )
+    is_visible = models.BooleanField(
+        default=False,
+        editable=False,
+        verbose_name='Видна в лентах',
+    )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name='Изменено',
+    )
 
     class Meta:
         verbose_name = 'публикация'
         verbose_name_plural = 'Публикации'
+        indexes = (
+            models.Index(
+                fields=('-pub_date',),
+                condition=models.Q(is_visible=True),
+                name='post_visible_feed'),
+        )
 
     def __str__(self):
         return self.title[:50]
 
+    def compute_visibility(self):
+        """Whether the post belongs in public feeds."""
+        return bool(
+            self.is_published
+            and self.pub_date <= timezone.now()
+            and self.category_id is not None
+            and Category.objects.filter(
+                pk=self.category_id, is_published=True).exists()
+        )
+
 
 class Comment(PublishedModel):
     """
@@ -140,3 +211,73 @@ class Comment(PublishedModel):
 
     def __str__(self):
         return self.text
+
+
+class Follow(models.Model):
+    """
+    Documentation of follow module. Describe user subscriptions to authors.
+    """
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='following',
+        verbose_name='Подписчик',
+    )
+    author = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='followers',
+        verbose_name='Автор',
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Добавлено',
+    )
+
+    class Meta:
+        verbose_name = 'подписка'
+        verbose_name_plural = 'Подписки'
+        constraints = (
+            models.UniqueConstraint(
+                fields=('user', 'author'), name='unique_follow'),
+        )
+
+    def __str__(self):
+        return f'{self.user} -> {self.author}'
+
+
+class TimelineEntry(models.Model):
+    """
+    Documentation of timeline module. Materialized post of a followed author.
+    """
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='timeline',
+        verbose_name='Читатель',
+    )
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        related_name='timeline_entries',
+        verbose_name='Публикация',
+    )
+    pub_date = models.DateTimeField(
+        verbose_name='Дата и время публикации',
+    )
+
+    class Meta:
+        verbose_name = 'запись ленты'
+        verbose_name_plural = 'Записи лент'
+        constraints = (
+            models.UniqueConstraint(
+                fields=('user', 'post'), name='unique_timeline_entry'),
+        )
+        indexes = (
+            models.Index(
+                fields=('user', '-pub_date', '-post'),
+                name='timeline_user_cursor'),
+        )
+
+    def __str__(self):
+        return f'{self.user}: {self.post}'
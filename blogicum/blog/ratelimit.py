@@ -0,0 +1,66 @@
+"""
+Sliding-window rate limits shared by all workers through the default cache.
+
+A client may make ``rate`` requests in any ``period`` seconds. Requests
+are counted per window of ``period`` seconds from the epoch, each window
+under its own key, and a request is allowed while
+
+    previous * (1 - elapsed) + current <= rate
+
+where ``elapsed`` is the part of the current window that has passed: the
+previous window's count is assumed spread evenly over it, so the limit
+slides with time instead of resetting at window edges. Counting is an
+atomic ``cache.add`` or ``cache.incr``, and a rejected request is taken
+back with ``cache.decr``, so no worker ever reads and rewrites a count.
+"""
+import math
+import time
+
+from django.core.cache import cache
+
+
+def client_key(request):
+    if request.user.is_authenticated:
+        return f'user:{request.user.pk}'
+    return f'ip:{request.META.get("REMOTE_ADDR", "")}'
+
+
+def increment(key, timeout):
+    while True:
+        if cache.add(key, 1, timeout=timeout):
+            return 1
+        try:
+            return cache.incr(key)
+        except ValueError:
+            # The key expired between add() and incr(): count again.
+            continue
+
+
+def retry_after(rate, period, fraction, previous, used):
+    """Seconds until one more request fits, given the allowed counts."""
+    if used < rate and previous:
+        wait = 1 - (rate - 1 - used) / previous - fraction
+    else:
+        # Only once the current window has become the previous one.
+        wait = 1 - fraction + max(0.0, 1 - (rate - 1) / max(used, 1))
+    return max(1, math.ceil(wait * period))
+
+
+def count_request(scope, client, rate, period):
+    """
+    Count a request; return 0 if it is allowed or the seconds until one
+    would be.
+    """
+    window, elapsed = divmod(time.time(), period)
+    window, fraction = int(window), elapsed / period
+    key = f'ratelimit:{scope}:{client}:{window}'
+    # A window is read as the previous one for another period.
+    used = increment(key, timeout=2 * period + 1)
+    previous = cache.get(f'ratelimit:{scope}:{client}:{window - 1}', 0)
+    if previous * (1 - fraction) + used <= rate:
+        return 0
+    try:
+        used = cache.decr(key)
+    except ValueError:
+        used = 0
+    return retry_after(rate, period, fraction, previous, used)
@@ -0,0 +1,213 @@
+"""
+Pure-Python renderers for the post card and paginator.
+
+The output is byte-identical to includes/post_card.html and
+includes/paginator.html, but skips the template engine, resolves
+URLs through prefixes reversed once per process and takes categories
+and locations from the process-local reference cache.
+"""
+from functools import lru_cache
+
+from django.core.files.storage import default_storage
+from django.template.defaultfilters import date, truncatewords
+from django.urls import reverse
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+from django.utils.timezone import template_localtime
+
+from blog.cache import categories, locations
+
+POST_CARD_FIELDS = (
+    'id',
+    'title',
+    'text',
+    'pub_date',
+    'is_published',
+    'image',
+    'author__username',
+    'category_id',
+    'location_id',
+    'comment_count',
+    'views',
+)
+
+_URL_MARKER = '0'
+
+
+@lru_cache(maxsize=None)
+def url_parts(viewname):
+    """Split reverse(viewname) around its single argument."""
+    url = reverse(viewname, args=[_URL_MARKER])
+    head, _, tail = url.rpartition(_URL_MARKER)
+    return head, tail
+
+
+def _url(viewname, arg):
+    head, tail = url_parts(viewname)
+    return escape(f'{head}{arg}{tail}')
+
+
+def post_row(post):
+    """Build a POST_CARD_FIELDS tuple from a Post instance."""
+    return (
+        post.id,
+        post.title,
+        post.text,
+        post.pub_date,
+        post.is_published,
+        post.image.name,
+        post.author.username,
+        post.category_id,
+        post.location_id,
+        getattr(post, 'comment_count', ''),
+        post.views,
+    )
+
+
+def post_card_rows(queryset):
+    return queryset.values_list(*POST_CARD_FIELDS)
+
+
+def render_post_cards(rows):
+    """Render the cards of a page, reading the reference caches once."""
+    category_rows, location_rows = categories.rows(), locations.rows()
+    return [
+        render_post_card(row, category_rows, location_rows) for row in rows
+    ]
+
+
+def render_post_card(row, category_rows=None, location_rows=None):
+    (post_id, title, text, pub_date, is_published, image, username,
+     category_id, location_id, comment_count, views) = row
+    if category_rows is None:
+        category_rows = categories.rows()
+    if location_rows is None:
+        location_rows = locations.rows()
+    category = category_rows.get(category_id)
+    location = location_rows.get(location_id)
+    parts = [
+        '<div class="col d-flex justify-content-center">\n'
+        '  <div class="card" style="width: 40rem;">\n'
+        '    <div class="card-body">\n'
+        '      '
+    ]
+    if image:
+        image_url = escape(default_storage.url(image))
+        parts.append(
+            f'\n        <a href="{image_url}" target="_blank">\n'
+            '          <img class="border-3 rounded img-fluid img-thumbnail '
+            f'mb-2 mx-auto d-block" src="{image_url}">\n'
+            '        </a>\n'
+            '      '
+        )
+    parts.append(
+        f'\n      <h5 class="card-title">{escape(title)}</h5>\n'
+        '      <h6 class="card-subtitle mb-2 text-muted">\n'
+        '        <small>\n'
+        '          '
+    )
+    if not is_published:
+        parts.append(
+            '\n            <p class="text-danger">'
+            'Пост снят с публикации админом</p>\n'
+            '          '
+        )
+    elif not (category and category.is_published):
+        parts.append(
+            '\n            <p class="text-danger">'
+            'Выбранная категория снята с публикации админом</p>\n'
+            '          '
+        )
+    if location and location.is_published:
+        location_name = escape(location.name)
+    else:
+        location_name = 'Планета Земля'
+    pub_date = escape(date(template_localtime(pub_date), 'd E Y, H:i'))
+    detail_url = _url('blog:post_detail', post_id)
+    parts.append(
+        f'\n          {pub_date} | {location_name}<br>\n'
+        '          От автора <a class="text-muted" '
+        f'href="{_url("blog:profile", username)}">'
+        f'@{escape(username)}</a> в\n'
+        '          категории <a class="text-muted" '
+        f'href="{_url("blog:category_posts", category.slug)}">\n'
+        f'  {escape(category.title)}\n'
+        '</a>\n'
+        '        </small>\n'
+        '      </h6>\n'
+        f'      <p class="card-text">{escape(truncatewords(text, 10))}</p>\n'
+        f'      <a href="{detail_url}" class="card-link">'
+        'Читать полный текст</a>\n'
+        f'      <a href="{detail_url}" class="card-link text-muted">'
+        f'Комментарии ({escape(comment_count)})</a>\n'
+        '      <span class="card-link text-muted">'
+        f'Просмотры ({views})</span>\n'
+        '    </div>\n'
+        '  </div>\n'
+        '</div>'
+    )
+    return mark_safe(''.join(parts))
+
+
+def render_paginator(page_obj):
+    if not page_obj.has_other_pages():
+        return mark_safe('')
+    parts = [
+        '\n  <nav aria-label="Page navigation" class="my-5">\n'
+        '    <ul class="pagination justify-content-center">\n'
+        '      '
+    ]
+    if page_obj.has_previous():
+        parts.append(
+            '\n        <li class="page-item"><a class="page-link" '
+            'href="?page=1">Первая</a></li>\n'
+            '        <li class="page-item">\n'
+            '          <a class="page-link" '
+            f'href="?page={page_obj.previous_page_number()}">\n'
+            '            << </a>\n'
+            '        </li>\n'
+            '      '
+        )
+    parts.append('\n      ')
+    number = page_obj.number
+    for i in page_obj.paginator.page_range:
+        if number == i:
+            parts.append(
+                '\n        \n'
+                '          <li class="page-item active">\n'
+                f'            <span class="page-link">{i}</span>\n'
+                '          </li>\n'
+                '        \n'
+                '      '
+            )
+        else:
+            parts.append(
+                '\n        \n'
+                '          <li class="page-item">\n'
+                f'            <a class="page-link" href="?page={i}">{i}</a>\n'
+                '          </li>\n'
+                '        \n'
+                '      '
+            )
+    parts.append('\n      ')
+    if page_obj.has_next():
+        parts.append(
+            '\n        <li class="page-item">\n'
+            '          <a class="page-link" '
+            f'href="?page={page_obj.next_page_number()}">\n'
+            '            >>\n'
+            '          </a>\n'
+            '        </li>\n'
+            '        <li class="page-item">\n'
+            '          <a class="page-link" '
+            f'href="?page={page_obj.paginator.num_pages}">\n'
+            '            Последняя\n'
+            '          </a>\n'
+            '        </li>\n'
+            '      '
+        )
+    parts.append(
+        '\n    </ul>\n'
+        '  </nav>\n'
+    )
+    return mark_safe(''.join(parts))
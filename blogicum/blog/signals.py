@@ -0,0 +1,151 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import (post_delete, post_init, post_save,
+                                      pre_delete, pre_save)
+from django.dispatch import Signal, receiver
+from django.utils import timezone
+
+from blog import timeline, trending
+from blog.autocomplete import LABELS, search_key
+from blog.cache import categories, feeds, locations, missing_profiles
+from blog.constans import TRENDING_COMMENT_WEIGHT, TRENDING_PUBLISH_WEIGHT
+from blog.models import (Category, Comment, Location, Post, TimelineEntry,
+                         User)
+
+# Sent with post_ids when scheduled posts become visible.
+posts_published = Signal()
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_categories(sender, **kwargs):
+    categories.bump()
+
+
+@receiver(pre_save, sender=Category)
+@receiver(pre_save, sender=Location)
+def set_search_key(sender, instance, **kwargs):
+    instance.search_key = search_key(getattr(instance, LABELS[sender]) or '')
+
+
+@receiver(post_save, sender=Category)
+def update_category_visibility(sender, instance, **kwargs):
+    posts = Post.objects.filter(category=instance, is_published=True)
+    if instance.is_published:
+        posts.filter(
+            is_visible=False, pub_date__lte=timezone.now()
+        ).update(is_visible=True)
+    else:
+        posts.filter(is_visible=True).update(is_visible=False)
+
+
+@receiver(pre_delete, sender=Category)
+def hide_category_posts(sender, instance, **kwargs):
+    Post.objects.filter(
+        category=instance, is_visible=True).update(is_visible=False)
+
+
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+def invalidate_locations(sender, **kwargs):
+    locations.bump()
+
+
+@receiver(post_save, sender=User)
+def invalidate_missing_profiles(sender, update_fields=None, **kwargs):
+    if update_fields is not None and set(update_fields) == {'last_login'}:
+        return
+    missing_profiles.bump()
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(posts_published)
+def invalidate_feeds(sender, **kwargs):
+    feeds.bump()
+
+
+@receiver(post_save, sender=User)
+def invalidate_author_feeds(sender, update_fields=None, **kwargs):
+    if update_fields is not None and set(update_fields) == {'last_login'}:
+        return
+    feeds.bump()
+
+
+def collect_image(name):
+    """Delete a stored image once no post references it."""
+    if not name:
+        return
+    images = Post.objects.filter(image=name)
+    if not images.exists():
+        Post.image.field.storage.discard(
+            name, images.exists, settings.BLOG_IMAGE_GRACE_SECONDS)
+
+
+@receiver(post_init, sender=Post)
+def remember_loaded_image(sender, instance, **kwargs):
+    # The raw value, without loading a deferred image field.
+    image = instance.__dict__.get('image')
+    instance._loaded_image = getattr(image, 'name', image)
+
+
+@receiver(pre_save, sender=Post)
+def remember_old_image(sender, instance, update_fields=None, **kwargs):
+    instance._old_image = ''
+    if instance.pk is None or (
+            update_fields is not None and 'image' not in update_fields):
+        return
+    if instance._loaded_image == instance.image.name:
+        return
+    instance._old_image = (
+        Post.objects.filter(pk=instance.pk)
+        .values_list('image', flat=True).first()
+    ) or ''
+
+
+@receiver(post_save, sender=Post)
+def collect_replaced_image(sender, instance, **kwargs):
+    old_image = getattr(instance, '_old_image', '')
+    instance._loaded_image = instance.image.name
+    if old_image and old_image != instance.image.name:
+        transaction.on_commit(lambda: collect_image(old_image))
+
+
+@receiver(post_delete, sender=Post)
+def collect_deleted_image(sender, instance, **kwargs):
+    name = instance.image.name
+    if name:
+        transaction.on_commit(lambda: collect_image(name))
+
+
+@receiver(pre_save, sender=Post)
+def set_visibility(sender, instance, **kwargs):
+    instance.is_visible = instance.compute_visibility()
+
+
+@receiver(pre_save, sender=Post)
+def set_initial_trending_score(sender, instance, **kwargs):
+    if instance._state.adding and not instance.trending_score:
+        instance.trending_score = trending.event_score(
+            TRENDING_PUBLISH_WEIGHT, instance.pub_date)
+
+
+@receiver(post_save, sender=Comment)
+def add_comment_to_trending_score(sender, instance, created, **kwargs):
+    # Published comments count; the admin actions add and remove the
+    # events of comments they publish, unpublish or delete.
+    if created and instance.is_published:
+        trending.record(
+            Post.objects.filter(pk=instance.post_id),
+            TRENDING_COMMENT_WEIGHT, instance.created_at)
+
+
+@receiver(post_save, sender=Post)
+def update_timelines(sender, instance, created, **kwargs):
+    if created:
+        transaction.on_commit(lambda: timeline.fan_out(instance))
+    else:
+        TimelineEntry.objects.filter(post=instance).exclude(
+            pub_date=instance.pub_date).update(pub_date=instance.pub_date)
@@ -0,0 +1,217 @@
+"""
+Sitemap index with chunked sitemaps of posts, profiles and categories.
+
+Chunks are id ranges, so a row always lands in the same chunk however
+the table grows. build() fingerprints every chunk, rewrites only the
+chunks whose fingerprint differs from the saved manifest, and streams
+the rows of a chunk with iterator() instead of loading them. The
+manifest also keeps the base URL, as a new one means rewriting every
+chunk.
+"""
+import abc
+import hashlib
+import json
+import os
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+from django.db.models import (Count, Exists, ExpressionWrapper, F,
+                              IntegerField, Max, OuterRef, Sum)
+from django.utils import timezone
+
+from blog.constans import SITEMAP_CHUNK_SIZE
+from blog.models import Category, Post, User
+from blog.renderers import url_parts
+
+INDEX = 'sitemap.xml'
+MANIFEST = 'manifest.json'
+XMLNS = 'http://www.sitemaps.org/schemas/sitemap/0.9'
+
+
+def chunk_of(field):
+    return ExpressionWrapper(
+        (F(field) - 1) / SITEMAP_CHUNK_SIZE, output_field=IntegerField())
+
+
+def id_range(chunk):
+    return {
+        'pk__gt': chunk * SITEMAP_CHUNK_SIZE,
+        'pk__lte': (chunk + 1) * SITEMAP_CHUNK_SIZE,
+    }
+
+
+def path_to(viewname, arg):
+    head, tail = url_parts(viewname)
+    return f'{head}{arg}{tail}'
+
+
+class Section(abc.ABC):
+    """A kind of page in the sitemap."""
+    name = None
+
+    def filename(self, chunk):
+        return f'{self.name}-{chunk}.xml'
+
+    @abc.abstractmethod
+    def fingerprints(self):
+        """
+        Map each chunk to a JSON-serializable value that changes with
+        its entries.
+        """
+
+    @abc.abstractmethod
+    def rows(self, chunk):
+        """Yield (path, lastmod) of the chunk's pages."""
+
+
+class PostSection(Section):
+    name = 'posts'
+
+    def queryset(self):
+        return Post.objects.filter(is_visible=True)
+
+    def fingerprints(self):
+        # One grouped query: the count and the sums of ids and of their
+        # squares change when posts enter or leave a chunk, the latest
+        # updated_at when one is edited.
+        chunks = self.queryset().annotate(chunk=chunk_of('pk')).values(
+            'chunk').annotate(
+            count=Count('pk'),
+            ids=Sum('pk'),
+            squares=Sum(F('pk') * F('pk')),
+            updated=Max('updated_at'),
+        ).order_by('chunk')
+        return {
+            row['chunk']: [
+                row['count'], int(row['ids']), int(row['squares']),
+                row['updated'].isoformat(),
+            ]
+            for row in chunks
+        }
+
+    def rows(self, chunk):
+        posts = self.queryset().filter(**id_range(chunk)).order_by('pk')
+        for pk, updated_at in posts.values_list(
+                'pk', 'updated_at').iterator():
+            yield path_to('blog:post_detail', pk), updated_at
+
+
+class ProfileSection(Section):
+    """Profiles of users with at least one visible post."""
+    name = 'profiles'
+
+    def queryset(self):
+        return User.objects.filter(Exists(Post.objects.filter(
+            author=OuterRef('pk'), is_visible=True)))
+
+    def fingerprints(self):
+        # Usernames change in place, so rows are hashed one by one;
+        # there are far fewer authors than posts.
+        digests = {}
+        users = self.queryset().order_by('pk').values_list('pk', 'username')
+        for pk, username in users.iterator():
+            digest = digests.setdefault(
+                (pk - 1) // SITEMAP_CHUNK_SIZE, hashlib.md5())
+            digest.update(f'{pk}:{username}\n'.encode())
+        return {
+            chunk: digest.hexdigest() for chunk, digest in digests.items()
+        }
+
+    def rows(self, chunk):
+        users = self.queryset().filter(**id_range(chunk)).order_by('pk')
+        for username in users.values_list('username', flat=True).iterator():
+            yield path_to('blog:profile', username), None
+
+
+class CategorySection(Section):
+    name = 'categories'
+
+    def slugs(self):
+        return Category.objects.filter(is_published=True).order_by(
+            'pk').values_list('slug', flat=True)
+
+    def fingerprints(self):
+        slugs = list(self.slugs())
+        if not slugs:
+            return {}
+        return {0: hashlib.md5('\n'.join(slugs).encode()).hexdigest()}
+
+    def rows(self, chunk):
+        for slug in self.slugs().iterator():
+            yield path_to('blog:category_posts', slug), None
+
+
+SECTIONS = (PostSection(), ProfileSection(), CategorySection())
+
+
+def write_atomic(path, lines):
+    temp = path.with_name(f'.{path.name}.tmp')
+    with open(temp, 'w', encoding='utf-8') as file:
+        file.writelines(lines)
+    os.replace(temp, path)
+
+
+def urlset(base_url, rows):
+    yield '<?xml version="1.0" encoding="UTF-8"?>\n'
+    yield f'<urlset xmlns="{XMLNS}">\n'
+    for path, lastmod in rows:
+        yield f'<url><loc>{escape(base_url + path)}</loc>'
+        if lastmod is not None:
+            yield f'<lastmod>{lastmod.isoformat(timespec="seconds")}</lastmod>'
+        yield '</url>\n'
+    yield '</urlset>\n'
+
+
+def sitemapindex(base_url, manifest):
+    yield '<?xml version="1.0" encoding="UTF-8"?>\n'
+    yield f'<sitemapindex xmlns="{XMLNS}">\n'
+    for filename, entry in manifest.items():
+        location = base_url + path_to('blog:sitemap_chunk', filename)
+        yield (
+            f'<sitemap><loc>{escape(location)}</loc>'
+            f'<lastmod>{entry["lastmod"]}</lastmod></sitemap>\n'
+        )
+    yield '</sitemapindex>\n'
+
+
+def load_manifest(root):
+    """The base URL and chunk entries of the last build, or (None, {})."""
+    try:
+        manifest = json.loads((root / MANIFEST).read_text())
+        return manifest['base_url'], manifest['chunks']
+    except (FileNotFoundError, ValueError, KeyError, TypeError):
+        return None, {}
+
+
+def build(root, base_url, full=False):
+    """
+    Bring the sitemaps in root up to date; return the names of the
+    chunk files that were written.
+    """
+    root = Path(root)
+    root.mkdir(parents=True, exist_ok=True)
+    base_url = base_url.rstrip('/')
+    old_base_url, old = load_manifest(root)
+    full = full or base_url != old_base_url
+    manifest = {}
+    written = []
+    now = timezone.now().isoformat(timespec='seconds')
+    for section in SECTIONS:
+        for chunk, fingerprint in section.fingerprints().items():
+            filename = section.filename(chunk)
+            fingerprint = json.loads(json.dumps(fingerprint))
+            entry = old.get(filename)
+            if (full or entry is None
+                    or entry['fingerprint'] != fingerprint
+                    or not (root / filename).exists()):
+                write_atomic(root / filename,
+                             urlset(base_url, section.rows(chunk)))
+                entry = {'fingerprint': fingerprint, 'lastmod': now}
+                written.append(filename)
+            manifest[filename] = entry
+    for filename in old.keys() - manifest.keys():
+        (root / filename).unlink(missing_ok=True)
+    write_atomic(root / INDEX, sitemapindex(base_url, manifest))
+    write_atomic(root / MANIFEST, [
+        json.dumps({'base_url': base_url, 'chunks': manifest})])
+    return written
@@ -0,0 +1,90 @@
+import hashlib
+import os
+import posixpath
+import shutil
+import tempfile
+import time
+import uuid
+
+from django.core.files.storage import FileSystemStorage
+from django.utils.deconstruct import deconstructible
+
+
+@deconstructible
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    File storage that keeps each distinct upload once.
+
+    Uploads are hashed while they are streamed to a temporary file and
+    stored as <upload_to>/<sha256><ext>; an upload whose blob already
+    exists only drops the temporary file and touches the blob. Blobs are
+    shared between posts, so they are only removed through discard().
+    """
+    def get_available_name(self, name, max_length=None):
+        return name
+
+    def _save(self, name, content):
+        directory, filename = posixpath.split(name)
+        extension = os.path.splitext(filename)[1].lower()
+        full_directory = self.path(directory)
+        os.makedirs(full_directory, exist_ok=True)
+
+        digest = hashlib.sha256()
+        fd, temporary = tempfile.mkstemp(
+            dir=full_directory, prefix='.upload-')
+        try:
+            with os.fdopen(fd, 'wb') as destination:
+                if hasattr(content, 'seek'):
+                    content.seek(0)
+                for chunk in content.chunks():
+                    digest.update(chunk)
+                    destination.write(chunk)
+            name = posixpath.join(directory, digest.hexdigest() + extension)
+            full_path = self.path(name)
+            try:
+                # A fresh mtime keeps discard() away from the blob until
+                # the post that reuses it is committed.
+                os.utime(full_path)
+            except FileNotFoundError:
+                os.replace(temporary, full_path)
+                os.chmod(full_path, self.file_permissions_mode or 0o644)
+            else:
+                os.remove(temporary)
+        except BaseException:
+            if os.path.exists(temporary):
+                os.remove(temporary)
+            raise
+        return name
+
+    def discard(self, name, in_use, grace, move_to=None):
+        """
+        Delete a blob, or move it to move_to, unless in_use() is true or
+        it was written or reused less than grace seconds ago; return
+        whether it was.
+
+        The blob is first renamed away, so an upload that races with the
+        checks either touched it before (and it is put back) or finds it
+        missing and writes it again; putting back a blob with the same
+        name never loses anything, as the content is the same.
+        """
+        path = self.path(name)
+        trash = os.path.join(
+            os.path.dirname(path), f'.discard-{uuid.uuid4().hex}')
+        try:
+            os.rename(path, trash)
+        except FileNotFoundError:
+            return False
+        try:
+            if in_use() or time.time() - os.stat(trash).st_mtime < grace:
+                os.replace(trash, path)
+                return False
+            if move_to is None:
+                os.remove(trash)
+            else:
+                os.makedirs(os.path.dirname(move_to), exist_ok=True)
+                shutil.move(trash, move_to)
+        except BaseException:
+            if os.path.exists(trash):
+                os.replace(trash, path)
+            raise
+        return True
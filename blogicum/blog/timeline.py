@@ -0,0 +1,172 @@
+"""
+Personal timelines of followed authors.
+
+A new post is copied into the timeline of every follower (fan-out on
+write), so reading a timeline is a range scan on the (user, pub_date,
+post) index. Authors with more than BLOG_FANOUT_LIMIT followers are not
+fanned out: their posts are read from the posts table on request and
+merged in (fan-out on read). Pages are addressed by a (pub_date, id)
+cursor, so deep pages cost the same as the first one.
+"""
+from collections import namedtuple
+from datetime import datetime, timedelta, timezone
+from itertools import islice
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q
+
+from blog.constans import (FANOUT_BATCH_SIZE, PAGINATOR, PULL_AUTHORS_TTL,
+                           TIMELINE_BACKFILL)
+from blog.models import Follow, Post, TimelineEntry
+
+PULL_AUTHORS_KEY = 'blog:timeline:pull-authors'
+CURSOR_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+MAX_CURSOR_ID = 2 ** 63 - 1
+
+TimelinePage = namedtuple('TimelinePage', 'posts next_cursor')
+
+
+def pull_authors():
+    """Ids of authors whose posts are merged in on read."""
+    authors = cache.get(PULL_AUTHORS_KEY)
+    if authors is None:
+        authors = frozenset(
+            Follow.objects.values('author')
+            .annotate(followers=Count('pk'))
+            .filter(followers__gt=settings.BLOG_FANOUT_LIMIT)
+            .values_list('author', flat=True)
+        )
+        cache.set(PULL_AUTHORS_KEY, authors, PULL_AUTHORS_TTL)
+    return authors
+
+
+def _add_entries(user_ids, posts):
+    """Insert timeline entries for every user and post, skipping dupes."""
+    user_ids = iter(user_ids)
+    created = 0
+    while True:
+        batch = [
+            TimelineEntry(user_id=user_id, post_id=post_id, pub_date=pub_date)
+            for user_id in islice(user_ids, FANOUT_BATCH_SIZE // len(posts))
+            for post_id, pub_date in posts
+        ]
+        if not batch:
+            return created
+        TimelineEntry.objects.bulk_create(batch, ignore_conflicts=True)
+        created += len(batch)
+
+
+def fan_out(post):
+    """Copy a new post into its author's followers' timelines."""
+    if post.author_id is None or post.author_id in pull_authors():
+        return 0
+    followers = Follow.objects.filter(
+        author_id=post.author_id).values_list('user_id', flat=True)
+    return _add_entries(followers.iterator(), [(post.pk, post.pub_date)])
+
+
+def backfill(user_ids, author):
+    """Copy author's recent posts into the timelines of user_ids."""
+    posts = list(
+        Post.objects.filter(author=author)
+        .order_by('-pub_date', '-pk')
+        .values_list('pk', 'pub_date')[:TIMELINE_BACKFILL]
+    )
+    if posts:
+        _add_entries(user_ids, posts)
+
+
+def follow(user, author):
+    """Subscribe user to author and backfill their recent posts."""
+    _, created = Follow.objects.get_or_create(user=user, author=author)
+    if created and author.pk not in pull_authors():
+        backfill([user.pk], author)
+    return created
+
+
+def unfollow(user, author):
+    """
+    Unsubscribe user from author. When author drops to BLOG_FANOUT_LIMIT
+    followers, their posts are no longer merged in on read, so the posts
+    published meanwhile are copied into the remaining timelines.
+    """
+    deleted, _ = Follow.objects.filter(user=user, author=author).delete()
+    if not deleted:
+        return False
+    TimelineEntry.objects.filter(user=user, post__author=author).delete()
+    followers = Follow.objects.filter(author=author)
+    if (author.pk in pull_authors()
+            and followers.count() <= settings.BLOG_FANOUT_LIMIT):
+        cache.delete(PULL_AUTHORS_KEY)
+        backfill(followers.values_list('user_id', flat=True).iterator(),
+                 author)
+    return True
+
+
+def follow_context(user, author):
+    """Profile page context for the follow button."""
+    if not user.is_authenticated or user == author:
+        return {}
+    return {'is_following': Follow.objects.filter(
+        user=user, author=author).exists()}
+
+
+def encode_cursor(pub_date, post_id):
+    micros = (pub_date - CURSOR_EPOCH) // timedelta(microseconds=1)
+    return f'{micros}_{post_id}'
+
+
+def decode_cursor(value):
+    """(pub_date, post_id) of a cursor, or None if it is malformed."""
+    try:
+        micros, post_id = (int(part) for part in value.split('_'))
+        pub_date = CURSOR_EPOCH + timedelta(microseconds=micros)
+    except (AttributeError, TypeError, ValueError, OverflowError):
+        return None
+    if not 0 < post_id <= MAX_CURSOR_ID:
+        return None
+    return pub_date, post_id
+
+
+def _keys(queryset, date_field, id_field, cursor, size):
+    """Newest (id, pub_date) pairs before the cursor."""
+    if cursor is not None:
+        pub_date, post_id = cursor
+        queryset = queryset.filter(
+            Q(**{f'{date_field}__lt': pub_date})
+            | Q(**{date_field: pub_date, f'{id_field}__lt': post_id}))
+    return list(
+        queryset.order_by(f'-{date_field}', f'-{id_field}')
+        .values_list(id_field, date_field)[:size]
+    )
+
+
+def timeline_page(user, posts, cursor=None, size=PAGINATOR):
+    """Return one page of user's timeline loaded from posts."""
+    cursor = decode_cursor(cursor)
+    keys = _keys(
+        TimelineEntry.objects.filter(
+            user=user,
+            post__is_visible=True,
+        ),
+        'pub_date', 'post_id', cursor, size + 1)
+    big_authors = pull_authors()
+    pulled = list(Follow.objects.filter(
+        user=user, author__in=big_authors
+    ).values_list('author', flat=True)) if big_authors else []
+    if pulled:
+        keys = sorted(
+            set(keys) | set(_keys(
+                Post.objects.filter(
+                    author__in=pulled,
+                    is_visible=True,
+                ),
+                'pub_date', 'pk', cursor, size + 1)),
+            key=lambda key: (key[1], key[0]), reverse=True)
+    keys, more = keys[:size], len(keys) > size
+    loaded = posts.in_bulk([post_id for post_id, _ in keys])
+    next_cursor = encode_cursor(keys[-1][1], keys[-1][0]) if more else None
+    return TimelinePage(
+        [loaded[post_id] for post_id, _ in keys if post_id in loaded],
+        next_cursor)
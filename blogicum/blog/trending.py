@@ -0,0 +1,123 @@
+"""
+Time-decayed trending scores kept in log space.
+
+A post's score is log(sum(w * 2 ** ((t - epoch) / half_life))) over its
+events (publication, comments, views). Adding an event of weight w at
+time t is log-sum-exp with x = log(w) + lambda * (t - epoch):
+
+    score = max(score, x) + log(1 + exp(-|score - x|))
+
+which runs as one atomic UPDATE, never overflows and keeps the ordering
+of a score decayed to "now", so the feed is an index scan on the column.
+
+Events of many comments are added or removed at once by summing
+exp(x - shift) in a correlated subquery, with a shift no smaller than
+any x, so that no term overflows.
+"""
+import math
+
+from django.db.models import (F, FloatField, Func, OuterRef, Subquery, Sum,
+                              Value)
+from django.db.models.functions import (Abs, Coalesce, Exp, Greatest, Least,
+                                        Ln)
+from django.utils import timezone
+
+from blog.constans import (TRENDING_EPOCH, TRENDING_HALF_LIFE,
+                           TRENDING_PUBLISH_WEIGHT)
+
+DECAY = math.log(2) / TRENDING_HALF_LIFE
+# Floor for a sum of shifted terms, so that its log stays finite.
+TINY = 1e-300
+
+
+def event_score(weight, when=None):
+    """Log-space score of a single event of the given weight."""
+    when = when or timezone.now()
+    return (math.log(weight)
+            + DECAY * (when - TRENDING_EPOCH).total_seconds())
+
+
+def combine(a, b):
+    """Python log-sum-exp matching added_score()."""
+    return max(a, b) + math.log1p(math.exp(-abs(a - b)))
+
+
+def added_score(x):
+    """Expression for trending_score with an event score x added."""
+    if not hasattr(x, 'resolve_expression'):
+        x = Value(x, output_field=FloatField())
+    score = F('trending_score')
+    return Greatest(score, x) + Ln(Value(1.0) + Exp(-Abs(score - x)))
+
+
+def record(queryset, weight, when=None):
+    """Add an event of the given weight to every post in the queryset."""
+    return queryset.update(
+        trending_score=added_score(event_score(weight, when)))
+
+
+class EpochSeconds(Func):
+    """Seconds since 1970-01-01 UTC of a datetime expression."""
+    template = 'EXTRACT(EPOCH FROM %(expressions)s)'
+    output_field = FloatField()
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        # Datetimes are stored as UTC ISO text, which julianday() reads.
+        return self.as_sql(
+            compiler, connection,
+            template='((julianday(%(expressions)s) - 2440587.5) * 86400.0)',
+            **extra_context)
+
+    def as_mysql(self, compiler, connection, **extra_context):
+        return self.as_sql(
+            compiler, connection,
+            template='UNIX_TIMESTAMP(%(expressions)s)', **extra_context)
+
+
+def float_value(value):
+    return Value(value, output_field=FloatField())
+
+
+def event_expression(weight, field):
+    """Expression for event_score() at the time in a datetime field."""
+    return (float_value(math.log(weight)
+                        - DECAY * TRENDING_EPOCH.timestamp())
+            + float_value(DECAY) * EpochSeconds(field))
+
+
+def shifted_sum(events, weight, shift):
+    """
+    Subquery of sum(exp(x - shift)) over the outer post's events, rows
+    of `events` timed by created_at; shift may refer to the outer post.
+    """
+    x = event_expression(weight, 'created_at')
+    return Coalesce(Subquery(
+        events.filter(post=OuterRef('pk')).order_by().values('post')
+        .annotate(total=Sum(Exp(Least(x - shift, float_value(0.0)))))
+        .values('total'),
+        output_field=FloatField(),
+    ), float_value(0.0))
+
+
+def with_events(events, weight, now=None):
+    """Expression for trending_score with the events added."""
+    # Every event is in the past, so x never exceeds the shift.
+    latest = float_value(event_score(weight, now))
+    shift = Greatest(OuterRef('trending_score'), latest)
+    total = shifted_sum(events, weight, shift)
+    return added_score(
+        Greatest(F('trending_score'), latest)
+        + Ln(Greatest(total, float_value(TINY))))
+
+
+def without_events(events, weight):
+    """
+    Expression for trending_score with the events removed. The events
+    are part of the score, so none exceeds it; the result never drops
+    below the publication event.
+    """
+    share = shifted_sum(events, weight, OuterRef('trending_score'))
+    return Greatest(
+        F('trending_score')
+        + Ln(Greatest(float_value(1.0) - share, float_value(TINY))),
+        event_expression(TRENDING_PUBLISH_WEIGHT, 'pub_date'))
@@ -1,21 +1,61 @@
+from django.conf import settings
 from django.urls import path
 
-from . import views
+from . import api, feeds, views
+
+if settings.BLOG_ASYNC_VIEWS:
+    from . import async_views as read_views
+else:
+    read_views = views
 
 app_name = 'blog'
 
 
 urlpatterns = [
     path('',
-         views.PostListView.as_view(), name='index'),
+         read_views.PostListView.as_view(), name='index'),
+    path('feed/',
+         feeds.PostsFeed(), name='feed'),
+    path('feed/atom/',
+         feeds.AtomPostsFeed(), name='feed_atom'),
+    path('sitemap.xml',
+         views.SitemapView.as_view(), name='sitemap'),
+    path('sitemaps/<str:filename>',
+         views.SitemapView.as_view(), name='sitemap_chunk'),
+    path('trending/',
+         views.TrendingListView.as_view(), name='trending'),
     path('posts/<int:pk>/',
-         views.PostDetailView.as_view(), name='post_detail'),
+         read_views.PostDetailView.as_view(), name='post_detail'),
     path('category/<slug:category_slug>/',
-         views.CategoryListView.as_view(), name='category_posts'),
+         read_views.CategoryListView.as_view(), name='category_posts'),
+    path('category/<slug:category_slug>/feed/',
+         feeds.CategoryFeed(), name='category_feed'),
+    path('category/<slug:category_slug>/feed/atom/',
+         feeds.AtomCategoryFeed(), name='category_feed_atom'),
     path('edit_profile/',
          views.ProfileUpdateView.as_view(), name='edit_profile'),
     path('profile/<slug:username>/',
-         views.ProfileListView.as_view(), name='profile'),
+         read_views.ProfileListView.as_view(), name='profile'),
+    path('profile/<slug:username>/feed/',
+         feeds.AuthorFeed(), name='profile_feed'),
+    path('profile/<slug:username>/feed/atom/',
+         feeds.AtomAuthorFeed(), name='profile_feed_atom'),
+    path('profile/<slug:username>/follow/',
+         views.FollowView.as_view(), name='follow'),
+    path('profile/<slug:username>/unfollow/',
+         views.UnfollowView.as_view(), name='unfollow'),
+    path('timeline/',
+         views.TimelineView.as_view(), name='timeline'),
+    path('autocomplete/<slug:kind>/',
+         views.AutocompleteView.as_view(), name='autocomplete'),
+    path('api/posts/',
+         api.PostListApiView.as_view(), name='api_posts'),
+    path('api/posts/<int:pk>/',
+         api.PostDetailApiView.as_view(), name='api_post_detail'),
+    path('api/category/<slug:category_slug>/posts/',
+         api.CategoryPostsApiView.as_view(), name='api_category_posts'),
+    path('api/profile/<slug:username>/posts/',
+         api.AuthorPostsApiView.as_view(), name='api_profile_posts'),
     path('posts/create/',
          views.PostCreateView.as_view(), name='create_post'),
     path('posts/<int:pk>/edit/',
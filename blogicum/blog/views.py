@@ -1,15 +1,32 @@
+import os
+
+from django.conf import settings
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.db.models import Count
-from django.shortcuts import get_object_or_404
+from django.db.models import Count, Q
+from django.http import Http404, JsonResponse
+from django.shortcuts import get_object_or_404, redirect
 from django.urls import reverse_lazy
-from django.utils import timezone
+from django.utils._os import safe_join
 from django.views.generic import (CreateView, DeleteView, DetailView, ListView,
-                                  UpdateView)
+                                  TemplateView, UpdateView, View)
 
+from blog.autocomplete import SOURCES, suggest
+from blog.cache import categories, missing_profiles
 from blog.constans import PAGINATOR
+from blog.counters import view_counter
 from blog.forms import CommentForm, PostForm, ProfileForm
-from blog.mixins import PostCommentDispatchMixin
-from blog.models import Category, Comment, Post, User
+from blog.mixins import (PostCardsMixin, PostCommentDispatchMixin,
+                         RateLimitMixin, ReplicaReadMixin, SingleWriterMixin)
+from blog.models import Comment, Post, User
+from blog.sitemaps import INDEX
+from blog.timeline import follow, follow_context, timeline_page, unfollow
+from blogicum.media import file_response
+from blogicum.routers import first_or_primary
+
+
+def published_comments():
+    """Count of a post's published comments, for the post cards."""
+    return Count('comments', filter=Q(comments__is_published=True))
 
 
 def get_posts_query():
@@ -20,14 +37,20 @@ def get_posts_query():
         'pub_date',
         'location',
         'location__name',
+        'location__is_published',
         'author__username',
         'category__slug',
         'category__title',
+        'category__is_published',
         'text',
+        'is_published',
+        'image',
+        'views',
     )
 
 
-class PostListView(ListView, LoginRequiredMixin):
+class PostListView(ReplicaReadMixin, PostCardsMixin, ListView,
+                   LoginRequiredMixin):
     model = Post
     template_name = 'blog/index.html'
     ordering = 'id'
@@ -35,13 +58,24 @@ class PostListView(ListView, LoginRequiredMixin):
 
     def get_queryset(self):
         return get_posts_query().filter(
-            is_published=True,
-            category__is_published=True,
-            pub_date__lt=timezone.now(),
-        ).order_by('-pub_date').annotate(comment_count=Count('comments'))
+            is_visible=True
+        ).order_by('-pub_date').annotate(comment_count=published_comments())
 
 
-class CategoryListView(ListView, LoginRequiredMixin):
+class TrendingListView(ReplicaReadMixin, PostCardsMixin, ListView):
+    model = Post
+    template_name = 'blog/trending.html'
+    paginate_by = PAGINATOR
+
+    def get_queryset(self):
+        return get_posts_query().filter(
+            is_visible=True
+        ).order_by('-trending_score').annotate(
+            comment_count=published_comments())
+
+
+class CategoryListView(ReplicaReadMixin, PostCardsMixin, ListView,
+                       LoginRequiredMixin):
     model = Post
     template_name = 'blog/category.html'
     ordering = 'id'
@@ -49,16 +83,13 @@ class CategoryListView(ListView, LoginRequiredMixin):
 
     def get_queryset(self):
         slug_url_kwarg = self.kwargs['category_slug']
-        self.category = get_object_or_404(
-            Category,
-            slug=slug_url_kwarg,
-            is_published=True)
+        self.category = categories.lookup('slug', slug_url_kwarg)
+        if self.category is None or not self.category.is_published:
+            raise Http404('Категория не найдена.')
         return get_posts_query().filter(
             category=self.category,
-            is_published=True,
-            category__is_published=True,
-            pub_date__lt=timezone.now(),
-        ).order_by('-pub_date').annotate(comment_count=Count('comments'))
+            is_visible=True,
+        ).order_by('-pub_date').annotate(comment_count=published_comments())
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -66,7 +97,7 @@ class CategoryListView(ListView, LoginRequiredMixin):
         return context
 
 
-class ProfileUpdateView(LoginRequiredMixin, UpdateView):
+class ProfileUpdateView(LoginRequiredMixin, SingleWriterMixin, UpdateView):
     model = User
     template_name = 'blog/user.html'
     form_class = ProfileForm
@@ -76,30 +107,85 @@ class ProfileUpdateView(LoginRequiredMixin, UpdateView):
         return self.request.user
 
 
-class ProfileListView(ListView):
+class ProfileListView(ReplicaReadMixin, PostCardsMixin, ListView):
     model = Post
     template_name = 'blog/profile.html'
     ordering = 'id'
     paginate_by = PAGINATOR
 
     def get_queryset(self):
-        self.author = get_object_or_404(
-            User,
-            username=self.kwargs['username'])
+        username = self.kwargs['username']
+        if username in missing_profiles:
+            raise Http404('Пользователь не найден.')
+        self.author = first_or_primary(
+            User.objects.filter(username=username))
+        if self.author is None:
+            missing_profiles.add(username)
+            raise Http404('Пользователь не найден.')
         return get_posts_query().filter(
             author=self.author
-        ).order_by('-pub_date').annotate(comment_count=Count('comments'))
+        ).order_by('-pub_date').annotate(comment_count=published_comments())
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['profile'] = self.author
+        context.update(follow_context(self.request.user, self.author))
         return context
 
 
-class PostCreateView(LoginRequiredMixin, CreateView):
+class TimelineView(LoginRequiredMixin, ReplicaReadMixin, TemplateView):
+    template_name = 'blog/timeline.html'
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['page'] = timeline_page(
+            self.request.user,
+            get_posts_query().annotate(comment_count=published_comments()),
+            self.request.GET.get('cursor'))
+        return context
+
+
+class FollowView(LoginRequiredMixin, View):
+    def post(self, request, username):
+        author = get_object_or_404(User, username=username)
+        if author != request.user:
+            follow(request.user, author)
+        return redirect('blog:profile', username=username)
+
+
+class UnfollowView(LoginRequiredMixin, View):
+    def post(self, request, username):
+        author = get_object_or_404(User, username=username)
+        unfollow(request.user, author)
+        return redirect('blog:profile', username=username)
+
+
+class AutocompleteView(ReplicaReadMixin, View):
+    def get(self, request, kind):
+        if kind not in SOURCES:
+            raise Http404('Справочник не найден.')
+        return JsonResponse(
+            {'results': suggest(kind, request.GET.get('q', ''))})
+
+
+class SitemapView(View):
+    """Serve the files written by the build_sitemaps command."""
+    def get(self, request, filename=INDEX):
+        try:
+            fullpath = safe_join(settings.BLOG_SITEMAP_ROOT, filename)
+        except ValueError:
+            raise Http404('Карта сайта не найдена.')
+        if not filename.endswith('.xml') or not os.path.isfile(fullpath):
+            raise Http404('Карта сайта не найдена.')
+        return file_response(request, fullpath)
+
+
+class PostCreateView(LoginRequiredMixin, RateLimitMixin, SingleWriterMixin,
+                     CreateView):
     model = Post
     template_name = 'blog/create.html'
     form_class = PostForm
+    rate_limit_scope = 'post'
 
     def get_success_url(self):
         return reverse_lazy(
@@ -129,21 +215,29 @@ class PostDeleteView(PostCommentDispatchMixin, DeleteView):
     success_url = reverse_lazy('blog:index')
 
 
-class PostDetailView(DetailView):
+class PostDetailView(ReplicaReadMixin, DetailView):
     model = Post
     template_name = 'blog/detail.html'
 
+    def get_object(self, queryset=None):
+        post = super().get_object(queryset)
+        view_counter.hit(post.pk)
+        return post
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['form'] = CommentForm()
-        context['comments'] = (self.object.comments.select_related('post'))
+        context['comments'] = self.object.comments.filter(
+            is_published=True).select_related('post')
         return context
 
 
-class CommentCreateView(LoginRequiredMixin, CreateView):
+class CommentCreateView(LoginRequiredMixin, RateLimitMixin,
+                        SingleWriterMixin, CreateView):
     model = Comment
     template_name = 'blog/create.html'
     form_class = CommentForm
+    rate_limit_scope = 'comment'
 
     def form_valid(self, form):
         form.instance.post = get_object_or_404(Post, pk=self.kwargs['pk'])
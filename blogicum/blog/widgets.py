@@ -0,0 +1,39 @@
+from django import forms
+from django.urls import reverse
+
+
+class AutocompleteSelect(forms.Select):
+    """
+    Select that renders only the empty and the selected option.
+
+    The rest are fetched from blog:autocomplete as the user types, so
+    the page doesn't grow with the table. Labels of selected values
+    come from a process-local ReferenceCache.
+    """
+    def __init__(self, kind, reference, attrs=None):
+        super().__init__(attrs)
+        self.kind = kind
+        self.reference = reference
+
+    class Media:
+        js = ('js/autocomplete.js',)
+
+    def get_context(self, name, value, attrs):
+        context = super().get_context(name, value, attrs)
+        context['widget']['attrs']['data-autocomplete-url'] = reverse(
+            'blog:autocomplete', args=[self.kind])
+        return context
+
+    def optgroups(self, name, value, attrs=None):
+        empty_label = self.choices.field.empty_label
+        choices = [] if empty_label is None else [('', empty_label)]
+        for pk in value:
+            obj = self.reference.get(int(pk)) if pk.isdigit() else None
+            if obj is not None:
+                choices.append((obj.pk, str(obj)))
+        return [
+            (None, [self.create_option(
+                name, option_value, label, str(option_value) in value,
+                index, attrs=attrs)], index)
+            for index, (option_value, label) in enumerate(choices)
+        ]
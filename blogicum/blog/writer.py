@@ -0,0 +1,102 @@
+"""
+Single-writer queue for SQLite.
+
+SQLite has one write lock, so concurrent requests that write at the
+same time queue up on it and may fail with "database is locked". With
+BLOG_SINGLE_WRITER on, form saves are handed to one writer thread,
+which commits up to BLOG_WRITER_BATCH_SIZE queued jobs in a single
+transaction, each under its own savepoint so one failing job does not
+undo the others. Request threads block until their job is committed.
+
+Uploaded files are stored by the request thread before its job is
+queued, so the batch never holds the write lock during file I/O. A job
+still queued after BLOG_WRITER_TIMEOUT is cancelled and never commits
+after its request has failed; one that is already running is waited for.
+"""
+import queue
+import threading
+from concurrent.futures import Future, TimeoutError
+
+from django.conf import settings
+from django.db import close_old_connections, models, transaction
+
+
+def save_files(instance):
+    """Store the instance's new uploads, as FileField.pre_save would."""
+    for field in instance._meta.concrete_fields:
+        if isinstance(field, models.FileField):
+            file = getattr(instance, field.attname)
+            if file and not file._committed:
+                file.save(file.name, file.file, save=False)
+
+
+class SingleWriter:
+
+    def __init__(self):
+        self._jobs = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def submit(self, func, *args, **kwargs):
+        """Run func in the writer thread and return its result."""
+        future = Future()
+        self._jobs.put((func, args, kwargs, future))
+        self._ensure_thread()
+        try:
+            return future.result(timeout=settings.BLOG_WRITER_TIMEOUT)
+        except TimeoutError:
+            if future.cancel():
+                raise
+            # Its batch is committing: report what actually happened.
+            return future.result()
+
+    def _ensure_thread(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name='blog-writer', daemon=True)
+                self._thread.start()
+
+    def _next_batch(self):
+        batch = [self._jobs.get()]
+        while len(batch) < settings.BLOG_WRITER_BATCH_SIZE:
+            try:
+                batch.append(self._jobs.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            try:
+                self._commit(batch)
+            finally:
+                close_old_connections()
+
+    def _commit(self, batch):
+        done = []
+        try:
+            with transaction.atomic():
+                for func, args, kwargs, future in batch:
+                    if not future.set_running_or_notify_cancel():
+                        continue
+                    try:
+                        with transaction.atomic():
+                            done.append((future, func(*args, **kwargs)))
+                    except Exception as error:
+                        future.set_exception(error)
+        except Exception as error:
+            # The batch was rolled back or never started: fail every
+            # job that has no outcome yet, not only the ones that ran.
+            for _, _, _, future in batch:
+                if not future.done():
+                    future.set_exception(error)
+        else:
+            for future, result in done:
+                future.set_result(result)
+
+
+writer = SingleWriter()
@@ -0,0 +1,32 @@
+from django.template.defaultfilters import date, linebreaksbr, truncatewords
+from django.templatetags.static import static
+from django.urls import reverse
+from django.utils.formats import localize
+from django.utils.timezone import template_localtime
+from django_bootstrap5.templatetags.django_bootstrap5 import (
+    bootstrap_button, bootstrap_form)
+from jinja2 import Environment
+
+
+def url(viewname, *args):
+    return reverse(viewname, args=args)
+
+
+def environment(**options):
+    """
+    Jinja2 environment with the helpers used by templates/jinja2.
+    """
+    env = Environment(**options)
+    env.globals.update({
+        'bootstrap_button': bootstrap_button,
+        'bootstrap_form': bootstrap_form,
+        'static': static,
+        'url': url,
+    })
+    env.filters.update({
+        'date': lambda value, arg=None: date(template_localtime(value), arg),
+        'linebreaksbr': linebreaksbr,
+        'localize': lambda value: localize(template_localtime(value)),
+        'truncatewords': truncatewords,
+    })
+    return env
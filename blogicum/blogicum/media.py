@@ -0,0 +1,126 @@
+"""
+Serving of uploaded media files outside of DEBUG.
+
+Depending on MEDIA_SERVE_MODE the file is either handed off to the
+front server (X-Accel-Redirect for nginx, X-Sendfile for Apache and
+lighttpd) or streamed by Django with ETag and single-range support.
+"""
+import mimetypes
+import os
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.http import (FileResponse, Http404, HttpResponse,
+                         StreamingHttpResponse)
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+BLOCK_SIZE = 64 * 1024
+
+
+def parse_range(header, size):
+    """
+    Return (start, end) of a single byte range, None for a missing or
+    unsupported header and ValueError for an unsatisfiable one.
+    """
+    match = RANGE_RE.match(header.replace(' ', ''))
+    if not match:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        start, end = max(size - int(last), 0), size - 1
+    else:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        raise ValueError('Unsatisfiable range')
+    return start, end
+
+
+def stream_range(fileobj, start, length, block_size=BLOCK_SIZE):
+    try:
+        fileobj.seek(start)
+        while length > 0:
+            chunk = fileobj.read(min(block_size, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+    finally:
+        fileobj.close()
+
+
+def file_response(request, fullpath):
+    """
+    Stream a file with ETag, Last-Modified and Range support.
+
+    Whole-file responses are FileResponse objects, so WSGI servers with
+    wsgi.file_wrapper can send them with sendfile().
+    """
+    stat = os.stat(fullpath)
+    etag = quote_etag(f'{stat.st_mtime_ns:x}-{stat.st_size:x}')
+    last_modified = int(stat.st_mtime)
+    response = get_conditional_response(
+        request, etag=etag, last_modified=last_modified)
+    if response is not None:
+        return response
+
+    content_type, _ = mimetypes.guess_type(fullpath)
+    content_type = content_type or 'application/octet-stream'
+    size = stat.st_size
+    byte_range = None
+    range_header = request.META.get('HTTP_RANGE')
+    if_range = request.META.get('HTTP_IF_RANGE')
+    if range_header and (not if_range or if_range == etag):
+        try:
+            byte_range = parse_range(range_header, size)
+        except ValueError:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{size}'
+            return response
+
+    if byte_range is None:
+        response = FileResponse(
+            open(fullpath, 'rb'), content_type=content_type)
+        response.block_size = BLOCK_SIZE
+    else:
+        start, end = byte_range
+        length = end - start + 1
+        response = StreamingHttpResponse(
+            stream_range(open(fullpath, 'rb'), start, length),
+            status=206, content_type=content_type)
+        response['Content-Length'] = length
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+    response['Accept-Ranges'] = 'bytes'
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified)
+    return response
+
+
+def serve_media(request, path):
+    try:
+        fullpath = safe_join(settings.MEDIA_ROOT, path)
+    except ValueError:
+        raise Http404('Файл не найден.')
+    if not os.path.isfile(fullpath):
+        raise Http404('Файл не найден.')
+
+    mode = settings.MEDIA_SERVE_MODE
+    if mode == 'python':
+        return file_response(request, fullpath)
+    content_type, _ = mimetypes.guess_type(fullpath)
+    response = HttpResponse(
+        content_type=content_type or 'application/octet-stream')
+    if mode == 'x-accel-redirect':
+        response['X-Accel-Redirect'] = (
+            settings.MEDIA_ACCEL_PREFIX + quote(path))
+    elif mode == 'x-sendfile':
+        response['X-Sendfile'] = fullpath
+    else:
+        raise ValueError(f'Unknown MEDIA_SERVE_MODE: {mode!r}')
+    return response
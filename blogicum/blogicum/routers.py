@@ -0,0 +1,97 @@
+"""
+Read replicas with read-your-writes stickiness.
+
+Queries are routed to a replica only inside replica_reads(), which the
+read-only blog views enter. A user who has just written something is
+pinned to the primary for BLOG_REPLICA_STICKY_SECONDS through the
+shared cache, so they never read a replica that has not caught up yet.
+Process-wide caches refill from the primary, as they outlive the request
+and a lagging replica would pin stale rows in them.
+"""
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+
+_replica_reads = ContextVar('replica_reads', default=False)
+
+PRIMARY = 'default'
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS', 'TRACE')
+
+
+def choose_replica():
+    return random.choice(settings.BLOG_READ_REPLICAS)
+
+
+def sticky_key(user):
+    return f'db_sticky:{user.pk}'
+
+
+def stick_to_primary(user):
+    cache.set(sticky_key(user), True, settings.BLOG_REPLICA_STICKY_SECONDS)
+
+
+def replica_allowed(request):
+    """Whether this request may read from a replica."""
+    if not settings.BLOG_READ_REPLICAS:
+        return False
+    user = request.user
+    return not (user.is_authenticated and cache.get(sticky_key(user)))
+
+
+def first_or_primary(queryset):
+    """
+    First row of queryset. A miss on a replica is checked again on the
+    primary, as the row may be new and not replicated yet.
+    """
+    row = queryset.first()
+    if row is None and queryset.db != PRIMARY:
+        row = queryset.using(PRIMARY).first()
+    return row
+
+
+@contextmanager
+def replica_reads(enabled=True):
+    token = _replica_reads.set(enabled)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+class ReplicaRouter:
+
+    def db_for_read(self, model, **hints):
+        if _replica_reads.get() and settings.BLOG_READ_REPLICAS:
+            return choose_replica()
+        return None
+
+    def db_for_write(self, model, **hints):
+        return PRIMARY
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, **hints):
+        if db in settings.BLOG_READ_REPLICAS:
+            return False
+        return None
+
+
+class StickyPrimaryMiddleware:
+    """
+    Pin users to the primary after a successful write request.
+    """
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if (settings.BLOG_READ_REPLICAS
+                and request.method not in SAFE_METHODS
+                and response.status_code < 400
+                and request.user.is_authenticated):
+            stick_to_primary(request.user)
+        return response
@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/3.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -52,6 +53,7 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'blogicum.routers.StickyPrimaryMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'debug_toolbar.middleware.DebugToolbarMiddleware',
@@ -77,6 +79,26 @@ TEMPLATES = [
     },
 ]
 
+# Template engine for project templates: 'django' or 'jinja2'.
+# Jinja2 ports live in templates/jinja2 and take precedence when selected;
+# templates without a port still fall back to the Django engine.
+TEMPLATE_ENGINE = os.getenv('BLOGICUM_TEMPLATE_ENGINE', 'django')
+
+if TEMPLATE_ENGINE == 'jinja2':
+    TEMPLATES.insert(0, {
+        'BACKEND': 'django.template.backends.jinja2.Jinja2',
+        'DIRS': [TEMPLATES_DIR / 'jinja2'],
+        'APP_DIRS': False,
+        'OPTIONS': {
+            'environment': 'blogicum.jinja2.environment',
+            'context_processors': [
+                'django.template.context_processors.debug',
+                'django.contrib.auth.context_processors.auth',
+                'django.contrib.messages.context_processors.messages',
+            ],
+        },
+    })
+
 WSGI_APPLICATION = 'blogicum.wsgi.application'
 
 
@@ -90,6 +112,66 @@ DATABASES = {
     }
 }
 
+# Read replicas: comma-separated SQLite files refreshed from the primary
+# with `manage.py sync_replicas`. The blog feeds and post pages read from
+# them, except for users who wrote within BLOG_REPLICA_STICKY_SECONDS.
+BLOG_READ_REPLICAS = []
+
+for index, name in enumerate(
+        filter(None, os.getenv('BLOGICUM_REPLICAS', '').split(','))):
+    DATABASES[f'replica_{index}'] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': name,
+        'TEST': {'MIRROR': 'default'},
+    }
+    BLOG_READ_REPLICAS.append(f'replica_{index}')
+
+DATABASE_ROUTERS = ['blogicum.routers.ReplicaRouter']
+
+BLOG_REPLICA_STICKY_SECONDS = 10
+
+
+# Cache
+# https://docs.djangoproject.com/en/3.2/topics/cache/
+# Use a shared backend (Memcached, Redis) in production so that cached
+# sessions and cache-backed state are shared between workers: cache
+# version keys, rate limit windows and replica stickiness live there.
+# `manage.py check` reports settings that rely on a per-process cache.
+
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv(
+            'BLOGICUM_CACHE_BACKEND',
+            'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.getenv('BLOGICUM_CACHE_LOCATION', ''),
+    }
+}
+
+BLOG_SHARED_CACHE = CACHES['default']['BACKEND'] not in (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+
+# Sessions
+# https://docs.djangoproject.com/en/3.2/topics/http/sessions/
+# 'cached_db' reads sessions from the cache and only falls back to the
+# database on a miss; 'cache' and 'signed_cookies' never touch it.
+# 'cached_db' is the default with a shared cache only: with a per-process
+# one, a logout in one worker would leave the session cached in others.
+# Expired database sessions are removed by `clear_expired_sessions`.
+
+SESSION_ENGINES = {
+    'db': 'django.contrib.sessions.backends.db',
+    'cached_db': 'django.contrib.sessions.backends.cached_db',
+    'cache': 'django.contrib.sessions.backends.cache',
+    'signed_cookies': 'django.contrib.sessions.backends.signed_cookies',
+}
+
+SESSION_ENGINE = SESSION_ENGINES[
+    os.getenv('BLOGICUM_SESSION_MODE',
+              'cached_db' if BLOG_SHARED_CACHE else 'db')]
+
 
 # Password validation
 # https://docs.djangoproject.com/en/3.2/ref/settings/#auth-password-validators
@@ -133,6 +215,16 @@ STATICFILES_DIRS = [
     BASE_DIR / 'static_dev',
 ]
 
+STATIC_ROOT = BASE_DIR / 'static'
+
+# 'manifest' serves collected files with hashed names and precompressed
+# .gz/.br variants; run `collectstatic` after switching to it.
+STATIC_MODE = os.getenv('BLOGICUM_STATIC_MODE', 'dev')
+
+if STATIC_MODE == 'manifest':
+    STATICFILES_STORAGE = (
+        'blogicum.static.CompressedManifestStaticFilesStorage')
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/3.2/ref/settings/#default-auto-field
 
@@ -146,6 +238,65 @@ EMAIL_FILE_PATH = BASE_DIR / 'sent_emails'
 
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Uploads above this size are streamed to temporary files in chunks
+# instead of being kept in memory.
+FILE_UPLOAD_MAX_MEMORY_SIZE = 1024 * 1024
+
+# How uploaded files are served: 'django' (development server, DEBUG only),
+# 'python' (streamed by Django with ETag and Range support),
+# 'x-accel-redirect' (nginx internal location at MEDIA_ACCEL_PREFIX)
+# or 'x-sendfile' (Apache mod_xsendfile, lighttpd).
+MEDIA_SERVE_MODE = os.getenv('BLOGICUM_MEDIA_SERVE_MODE', 'django')
+
+MEDIA_ACCEL_PREFIX = '/protected-media/'
+
+# Post images written or reused this many seconds ago are never deleted:
+# the post referencing them may not be committed yet.
+BLOG_IMAGE_GRACE_SECONDS = 60 * 60
+
 LOGIN_REDIRECT_URL = 'blog:index'
 
 LOGIN_URL = 'login'
+
+# Render post cards and paginator with blog.renderers instead of templates.
+BLOG_FAST_RENDER = False
+
+# Route the read-only blog views to blog.async_views (for ASGI servers);
+# their ORM calls share a pool of BLOG_ASYNC_DB_WORKERS threads.
+BLOG_ASYNC_VIEWS = os.getenv('BLOGICUM_ASYNC_VIEWS', '') == '1'
+
+BLOG_ASYNC_DB_WORKERS = int(os.getenv('BLOGICUM_ASYNC_DB_WORKERS', '8'))
+
+# Post views are buffered per process and written in one UPDATE once
+# this many posts are pending or this many seconds have passed.
+BLOG_VIEWS_FLUSH_SIZE = 500
+
+BLOG_VIEWS_FLUSH_INTERVAL = 10
+
+# Authors with more followers than this are not copied into follower
+# timelines on publish; their posts are merged in when a timeline is read.
+BLOG_FANOUT_LIMIT = 1000
+
+# Funnel post, comment and profile saves through one writer thread that
+# commits up to BLOG_WRITER_BATCH_SIZE of them per transaction.
+BLOG_SINGLE_WRITER = os.getenv('BLOGICUM_SINGLE_WRITER', '') == '1'
+
+BLOG_WRITER_BATCH_SIZE = 50
+
+BLOG_WRITER_TIMEOUT = 30
+
+# Sliding-window write limits: scope -> (requests, seconds).
+BLOG_RATE_LIMITS = {
+    'post': (10, 60),
+    'comment': (30, 60),
+}
+
+# Where the build_sitemaps command keeps sitemap.xml and its chunks, and
+# the scheme and host their URLs are written with.
+BLOG_SITEMAP_ROOT = Path(
+    os.getenv('BLOGICUM_SITEMAP_ROOT', BASE_DIR / 'sitemaps'))
+
+BLOG_SITE_URL = os.getenv('BLOGICUM_SITE_URL', 'http://127.0.0.1:8000')
+
+# Serve anonymous 404 pages from a body rendered once per process.
+PRERENDER_404 = not DEBUG
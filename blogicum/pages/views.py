@@ -1,6 +1,14 @@
+from django.conf import settings
+from django.http import HttpResponseNotFound
 from django.shortcuts import render
+from django.template.loader import render_to_string
+from django.utils.html import escape
 from django.views.generic import TemplateView
 
+URI_PLACEHOLDER = '__request_absolute_uri__'
+
+_prerendered_404 = None
+
 
 class AboutView(TemplateView):
     template_name = 'pages/about.html'
@@ -10,8 +18,30 @@ class RulesView(TemplateView):
     template_name = 'pages/rules.html'
 
 
+class PlaceholderUriRequest:
+    """Request proxy that renders its absolute URI as a placeholder."""
+
+    def __init__(self, request):
+        self._request = request
+
+    def __getattr__(self, name):
+        return getattr(self._request, name)
+
+    def build_absolute_uri(self, location=None):
+        return URI_PLACEHOLDER
+
+
 def error_404(request, exception):
-    return render(request, 'pages/404.html', status=404)
+    global _prerendered_404
+    if not settings.PRERENDER_404 or request.user.is_authenticated:
+        return render(request, 'pages/404.html', status=404)
+    if _prerendered_404 is None:
+        _prerendered_404 = render_to_string(
+            'pages/404.html',
+            {'request': PlaceholderUriRequest(request)},
+            request)
+    return HttpResponseNotFound(_prerendered_404.replace(
+        URI_PLACEHOLDER, escape(request.build_absolute_uri())))
 
 
 def error_csrf(request, reason=''):
@@ -0,0 +1,67 @@
+// Lazy options for <select data-autocomplete-url>: the page ships only
+// the selected option, the rest are fetched as the user types.
+(function () {
+  'use strict';
+
+  var DELAY = 250;
+
+  function attach(select) {
+    var input = document.createElement('input');
+    var timer = null;
+    var request = 0;
+    var loaded = false;
+
+    input.type = 'search';
+    input.className = 'form-control mb-1';
+    input.placeholder = 'Начните вводить название';
+    input.setAttribute('aria-label', input.placeholder);
+    select.parentNode.insertBefore(input, select);
+
+    function fill(results) {
+      var selected = select.options[select.selectedIndex];
+      var keep = Array.prototype.filter.call(select.options, function (option) {
+        return option.value === '' || option === selected;
+      });
+      select.innerHTML = '';
+      keep.forEach(function (option) {
+        select.appendChild(option);
+      });
+      results.forEach(function (item) {
+        if (!selected || String(item.id) !== selected.value) {
+          select.appendChild(new Option(item.text, item.id));
+        }
+      });
+    }
+
+    function load() {
+      var current = ++request;
+      var url = select.dataset.autocompleteUrl +
+        '?q=' + encodeURIComponent(input.value);
+      loaded = true;
+      fetch(url, {headers: {Accept: 'application/json'}})
+        .then(function (response) {
+          return response.json();
+        })
+        .then(function (data) {
+          if (current === request) {
+            fill(data.results);
+          }
+        });
+    }
+
+    input.addEventListener('input', function () {
+      clearTimeout(timer);
+      timer = setTimeout(load, DELAY);
+    });
+    select.addEventListener('focus', function () {
+      if (!loaded) {
+        load();
+      }
+    });
+  }
+
+  document.addEventListener('DOMContentLoaded', function () {
+    document.querySelectorAll('select[data-autocomplete-url]')
+      .forEach(attach);
+  });
+})();
@@ -10,6 +10,8 @@ from typing import Any, Iterable, Optional, Tuple, Type, Union
 import pytest
 from django.apps import apps
 from django.contrib.auth import get_user_model
+from django.core.management.color import no_style
+from django.db import connection
 from django.db.models import Field, Model
 from django.forms import BaseForm
 from django.http import HttpResponse
@@ -112,6 +114,33 @@ def another_user_client(another_user):
     return client
 
 
+@pytest.fixture(autouse=True)
+def view_counter_buffer(monkeypatch):
+    """
+    Keep the shared view counter from flushing in the background and
+    drop the views it buffered after each test.
+    """
+    from blog.counters import view_counter
+    monkeypatch.setattr(view_counter, 'autoflush', False)
+    yield
+    view_counter.clear()
+
+
+@pytest.fixture
+def reset_sequences(django_db_blocker):
+    """
+    Restart primary keys from 1 after the flush of a transactional test,
+    as other tests expect.
+    """
+    yield
+    with django_db_blocker.unblock():
+        sequences = connection.introspection.sequence_list()
+        with connection.cursor() as cursor:
+            for sql in connection.ops.sequence_reset_by_name_sql(
+                    no_style(), sequences):
+                cursor.execute(sql)
+
+
 def get_post_list_context_key(
         user_client, page_url, page_load_err_msg, key_missing_msg):
     try:
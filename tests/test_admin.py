@@ -0,0 +1,211 @@
+import functools
+from datetime import datetime
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from blog import trending
+from blog.admin import EstimatedCountPaginator
+from blog.constans import TRENDING_COMMENT_WEIGHT, TRENDING_PUBLISH_WEIGHT
+from blog.models import Comment, Post
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+
+@pytest.fixture
+def many_posts(mixer, published_category, published_location):
+    authors = mixer.cycle(5).blend('auth.User')
+    return mixer.cycle(30).blend(
+        'blog.Post', author=(author for author in authors * 6),
+        category=published_category, location=published_location)
+
+
+def test_post_changelist_queries(admin_client, many_posts):
+    with CaptureQueriesContext(connection) as context:
+        response = admin_client.get('/admin/blog/post/')
+    assert response.status_code == 200
+    counts = [
+        query['sql'] for query in context.captured_queries
+        if 'COUNT(' in query['sql'] and '"blog_post"' in query['sql']
+    ]
+    assert not counts, (
+        'Убедитесь, что список публикаций в админке не считает все записи.'
+    )
+    assert len(context.captured_queries) < 15, (
+        'Убедитесь, что список публикаций не делает запросов на каждую строку.'
+    )
+
+
+def test_post_change_form_does_not_list_users(admin_client, many_posts):
+    post = many_posts[0]
+    response = admin_client.get(f'/admin/blog/post/{post.pk}/change/')
+    assert response.status_code == 200
+    content = response.content.decode()
+    assert 'vForeignKeyRawIdAdminField' in content
+    assert content.count('<option') < 10
+
+
+def test_estimated_count(many_posts):
+    paginator = EstimatedCountPaginator(Post.objects.order_by('pk'), 10)
+    assert paginator.count == Post.objects.count()
+    filtered = Post.objects.filter(pk__lte=many_posts[4].pk).order_by('pk')
+    assert EstimatedCountPaginator(filtered, 10).count == 5
+
+
+def test_estimated_count_clamped_to_last_page(many_posts):
+    # Deleted rows still count in MAX(rowid).
+    Post.objects.filter(pk__lte=many_posts[17].pk).delete()
+    paginator = EstimatedCountPaginator(Post.objects.order_by('pk'), 10)
+    assert paginator.count == 30
+    page = paginator.page(2)
+    assert len(page.object_list) == 2
+    assert not page.has_next(), (
+        'Убедитесь, что завышенная оценка не даёт ссылок на пустые страницы.'
+    )
+    assert paginator.count == 12
+    paginator = EstimatedCountPaginator(Post.objects.order_by('pk'), 10)
+    assert paginator.page(3).number == 2
+
+
+def test_date_hierarchy_from_range(admin_client, mixer, published_category):
+    for year in (2021, 2023):
+        mixer.blend('blog.Post', category=published_category,
+                    pub_date=timezone.make_aware(datetime(year, 6, 15)))
+    with CaptureQueriesContext(connection) as context:
+        response = admin_client.get('/admin/blog/post/')
+    content = response.content.decode()
+    for year in (2021, 2022, 2023):
+        assert f'?pub_date__year={year}' in content
+    assert not any(
+        'django_datetime_trunc' in query['sql']
+        for query in context.captured_queries
+    ), 'Убедитесь, что годы в date_hierarchy не вычисляются по всем строкам.'
+    response = admin_client.get('/admin/blog/post/?pub_date__year=2021')
+    assert '?pub_date__month=6&amp;pub_date__year=2021' in (
+        response.content.decode())
+    response = admin_client.get(
+        '/admin/blog/post/?pub_date__month=6&pub_date__year=2021')
+    assert '?pub_date__day=15&amp;pub_date__month=6&amp;pub_date__year=2021' in (
+        response.content.decode())
+    response = admin_client.get(
+        '/admin/blog/post/?pub_date__day=15&pub_date__month=6'
+        '&pub_date__year=2021')
+    assert response.status_code == 200
+
+
+def test_date_hierarchy_starts_at_common_period(
+        admin_client, mixer, published_category):
+    for day in (3, 20):
+        mixer.blend('blog.Post', category=published_category,
+                    pub_date=timezone.make_aware(datetime(2022, 5, day)))
+    content = admin_client.get('/admin/blog/post/').content.decode()
+    assert '?pub_date__day=3&amp;pub_date__month=5&amp;pub_date__year=2022' in (
+        content)
+    assert 'pub_date__day=20&amp;' in content
+    assert 'pub_date__day=21&amp;' not in content
+
+
+@pytest.fixture
+def many_comments(mixer, post_with_published_location):
+    return mixer.cycle(20).blend(
+        'blog.Comment', post=post_with_published_location)
+
+
+def comment_action(admin_client, action, **filters):
+    query = ''.join(f'&{key}={value}' for key, value in filters.items())
+    with CaptureQueriesContext(connection) as context:
+        response = admin_client.post(f'/admin/blog/comment/?{query[1:]}', {
+            'action': action,
+            'select_across': '1',
+            'index': '0',
+            '_selected_action': ['0'],
+        })
+    assert response.status_code == 302
+    loaded = [
+        query['sql'] for query in context.captured_queries
+        if query['sql'].startswith('SELECT')
+        and '"blog_comment"."text"' in query['sql']
+    ]
+    assert not loaded, (
+        'Убедитесь, что действия над комментариями в админке не загружают '
+        'выбранные комментарии.'
+    )
+    return context.captured_queries
+
+
+def test_comment_unpublish_hides_comments(
+        admin_client, client, many_comments, post_with_published_location):
+    author = many_comments[0].author
+    comment_action(admin_client, 'unpublish', author__id__exact=author.pk)
+    hidden = Comment.objects.filter(is_published=False)
+    assert set(hidden) == {
+        comment for comment in many_comments if comment.author == author}
+    post = post_with_published_location
+    response = client.get(f'/posts/{post.pk}/')
+    content = response.content.decode()
+    assert not any(
+        f'name="comment_{comment.pk}"' in content for comment in hidden
+    ), 'Убедитесь, что снятые с публикации комментарии не показываются.'
+    response = client.get('/')
+    assert f'Комментарии ({20 - hidden.count()})' in (
+        response.content.decode()), (
+        'Убедитесь, что в счётчик комментариев попадают только '
+        'опубликованные комментарии.'
+    )
+    comment_action(admin_client, 'publish')
+    assert not Comment.objects.filter(is_published=False).exists()
+
+
+def test_comment_delete_is_one_statement(admin_client, many_comments):
+    queries = comment_action(admin_client, 'delete_comments')
+    deletes = [
+        query['sql'] for query in queries
+        if query['sql'].startswith('DELETE')
+    ]
+    assert len(deletes) == 1
+    assert not Comment.objects.exists()
+
+
+def expected_score(post):
+    """The score from the publication and the published comments."""
+    return functools.reduce(trending.combine, [
+        trending.event_score(TRENDING_PUBLISH_WEIGHT, post.pub_date),
+        *(trending.event_score(TRENDING_COMMENT_WEIGHT, created_at)
+          for created_at in post.comments.filter(
+              is_published=True).values_list('created_at', flat=True)),
+    ])
+
+
+def test_comment_actions_keep_trending_scores(
+        admin_client, mixer, many_comments, post_with_published_location):
+    post = post_with_published_location
+    other = mixer.blend('blog.Post', category=post.category)
+    mixer.blend('blog.Comment', post=other)
+    other.refresh_from_db()
+    other_score = other.trending_score
+    spammer = many_comments[0].author
+    for action, filters in (
+        ('unpublish', {'author__id__exact': spammer.pk}),
+        ('publish', {}),
+        ('delete_comments', {'author__id__exact': spammer.pk}),
+        ('delete_comments', {'post__id__exact': post.pk}),
+    ):
+        comment_action(admin_client, action, **filters)
+        post.refresh_from_db()
+        assert post.trending_score == pytest.approx(
+            expected_score(post), abs=1e-6), (
+            'Убедитесь, что массовые действия над комментариями '
+            f'пересчитывают trending_score ({action}).'
+        )
+    other.refresh_from_db()
+    assert other.trending_score == pytest.approx(other_score)
+
+
+def test_comment_changelist_has_no_delete_selected(admin_client):
+    response = admin_client.get('/admin/blog/comment/')
+    assert response.status_code == 200
+    assert 'delete_selected' not in response.content.decode()
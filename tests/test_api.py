@@ -0,0 +1,141 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from blog import api
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+
+@pytest.fixture
+def posts(mixer, user, published_category, published_location):
+    now = timezone.now()
+    return mixer.cycle(25).blend(
+        'blog.Post', author=user, category=published_category,
+        location=published_location, is_published=True,
+        # Pairs of posts share pub_date, so the cursor needs the id too.
+        pub_date=(now - timedelta(hours=i // 2) for i in range(25)))
+
+
+def test_feed_cursor_pagination(client, posts, mixer):
+    hidden = mixer.blend('blog.Post', is_published=False)
+    seen, cursor, pages = [], None, 0
+    while True:
+        params = {'limit': 10, **({'cursor': cursor} if cursor else {})}
+        data = client.get('/api/posts/', params).json()
+        seen += [item['id'] for item in data['results']]
+        cursor = data['next_cursor']
+        pages += 1
+        if cursor is None:
+            break
+    assert pages == 3
+    expected = sorted(posts, key=lambda post: (post.pub_date, post.pk),
+                      reverse=True)
+    assert seen == [post.pk for post in expected], (
+        'Убедитесь, что курсорная пагинация проходит ленту без пропусков '
+        'и повторов.'
+    )
+    assert hidden.pk not in seen
+
+
+def test_feed_fields(client, posts, published_location, mixer, user):
+    post = max(posts, key=lambda post: (post.pub_date, post.pk))
+    mixer.blend('blog.Comment', post=post, is_published=True)
+    mixer.blend('blog.Comment', post=post, is_published=False)
+    item = client.get('/api/posts/').json()['results'][0]
+    assert item == {
+        'id': post.pk,
+        'title': post.title,
+        'text': post.text,
+        'pub_date': post.pub_date.isoformat().replace('+00:00', 'Z'),
+        'author': user.username,
+        'category': post.category.slug,
+        'location': published_location.name,
+        'image': post.image.url if post.image else None,
+        'views': 0,
+        'comment_count': 1,
+    }
+    with CaptureQueriesContext(connection) as context:
+        response = client.get('/api/posts/', {'fields': 'title,id'})
+    assert list(response.json()['results'][0]) == ['title', 'id']
+    sql = context.captured_queries[-1]['sql']
+    assert '"text"' not in sql and 'COUNT(' not in sql, (
+        'Убедитесь, что из базы читаются только запрошенные поля.'
+    )
+    published_location.is_published = False
+    published_location.save()
+    item = client.get('/api/posts/', {'fields': 'location'}).json()
+    assert item['results'][0] == {'location': None}
+
+
+@pytest.mark.parametrize('params', (
+    {'fields': 'title,password'},
+    {'limit': 0},
+    {'limit': 'many'},
+    {'cursor': 'garbage'},
+    {'cursor': '9' * 30 + '_1'},
+    {'cursor': '1_' + '9' * 30},
+))
+def test_bad_requests(client, params):
+    response = client.get('/api/posts/', params)
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert 'error' in response.json()
+
+
+def test_category_and_author_feeds(
+        client, user_client, user, posts, published_category, mixer):
+    other = mixer.blend('blog.Post', is_published=True,
+                        category=published_category)
+    hidden = mixer.blend('blog.Post', author=user, is_published=False)
+    data = client.get(
+        f'/api/category/{published_category.slug}/posts/',
+        {'fields': 'id', 'limit': 100}).json()
+    assert {item['id'] for item in data['results']} == {
+        post.pk for post in posts + [other]}
+
+    url = f'/api/profile/{user.username}/posts/'
+    ids = {item['id'] for item in client.get(
+        url, {'fields': 'id', 'limit': 100}).json()['results']}
+    assert ids == {post.pk for post in posts}
+    ids = {item['id'] for item in user_client.get(
+        url, {'fields': 'id', 'limit': 100}).json()['results']}
+    assert hidden.pk in ids, (
+        'Убедитесь, что автор видит в своей ленте снятые с публикации посты.'
+    )
+
+    for url in ('/api/profile/nobody/posts/', '/api/category/none/posts/'):
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.NOT_FOUND
+        assert 'error' in response.json()
+
+
+def test_post_detail(client, user_client, user, posts, mixer):
+    post = posts[0]
+    comments = mixer.cycle(3).blend('blog.Comment', post=post)
+    mixer.blend('blog.Comment', post=post, is_published=False)
+    data = client.get(f'/api/posts/{post.pk}/').json()
+    assert data['title'] == post.title
+    assert [comment['id'] for comment in data['comments']] == [
+        comment.pk for comment in comments]
+    assert set(data['comments'][0]) == {'id', 'author', 'text', 'created_at'}
+    assert client.get(
+        f'/api/posts/{post.pk}/', {'fields': 'title'}).json() == {
+        'title': post.title}
+
+    hidden = mixer.blend('blog.Post', author=user, is_published=False)
+    assert client.get(f'/api/posts/{hidden.pk}/').status_code == (
+        HTTPStatus.NOT_FOUND)
+    assert user_client.get(f'/api/posts/{hidden.pk}/').status_code == (
+        HTTPStatus.OK)
+
+
+def test_json_fallback_matches_orjson(client, posts, monkeypatch):
+    fast = client.get('/api/posts/').content
+    monkeypatch.setattr(api, 'orjson', None)
+    assert client.get('/api/posts/').content == fast
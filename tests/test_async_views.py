@@ -0,0 +1,116 @@
+import asyncio
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import AnonymousUser
+from django.http import Http404
+from django.test import RequestFactory
+
+from blog import async_views, views
+from blog.cache import VersionedCache
+
+# Pool threads use their own connections, so the data must be committed.
+pytestmark = [
+    pytest.mark.django_db(transaction=True),
+    pytest.mark.usefixtures('reset_sequences'),
+]
+
+
+@pytest.fixture
+def published_posts(mixer, user, published_category):
+    return mixer.cycle(15).blend(
+        'blog.Post', author=user, category=published_category,
+        is_published=True, location=None)
+
+
+def get(path, **kwargs):
+    request = RequestFactory().get(path, kwargs)
+    request.user = AnonymousUser()
+    return request
+
+
+@pytest.mark.parametrize('view_name, kwargs', (
+    ('PostListView', {}),
+    ('CategoryListView', {'category_slug': 'slug'}),
+    ('ProfileListView', {'username': 'username'}),
+))
+@pytest.mark.parametrize('page', ('1', '2'))
+def test_async_list_views_match_sync(
+        published_posts, published_category, user, view_name, kwargs, page):
+    kwargs = {
+        key: {'slug': published_category.slug,
+              'username': user.username}[value]
+        for key, value in kwargs.items()
+    }
+    sync_view = getattr(views, view_name).as_view()
+    async_view = getattr(async_views, view_name).as_view()
+    expected = sync_view(get('/', page=page), **kwargs).render().content
+    response = async_to_sync(async_view)(get('/', page=page), **kwargs)
+    assert response.status_code == 200
+    assert response.content == expected, (
+        f'Убедитесь, что асинхронный `{view_name}` отдаёт ту же страницу, '
+        'что и синхронный.'
+    )
+
+
+def test_async_detail_view(comment_to_a_post):
+    post = comment_to_a_post.post
+    view = async_views.PostDetailView.as_view()
+    response = async_to_sync(view)(get('/'), pk=post.pk)
+    assert response.status_code == 200
+    assert (f'name="comment_{comment_to_a_post.id}"'
+            in response.content.decode())
+    with pytest.raises(Http404):
+        async_to_sync(view)(get('/'), pk=post.pk + 1)
+
+
+def test_async_views_not_found(user):
+    with pytest.raises(Http404):
+        async_to_sync(async_views.CategoryListView.as_view())(
+            get('/'), category_slug='missing')
+    with pytest.raises(Http404):
+        async_to_sync(async_views.ProfileListView.as_view())(
+            get('/'), username='missing')
+
+
+def test_profile_cache_not_read_on_event_loop(monkeypatch, user):
+    on_loop = []
+    version = VersionedCache.version
+
+    def recording_version(self):
+        try:
+            asyncio.get_running_loop()
+            on_loop.append(self.version_key)
+        except RuntimeError:
+            pass
+        return version(self)
+
+    monkeypatch.setattr(VersionedCache, 'version', recording_version)
+    view = async_views.ProfileListView.as_view()
+    for _ in range(2):
+        with pytest.raises(Http404):
+            async_to_sync(view)(get('/'), username='missing')
+    assert not on_loop, (
+        'Убедитесь, что кэш отсутствующих профилей читается в пуле потоков, '
+        'а не в цикле событий.'
+    )
+
+
+def test_async_views_get_only():
+    request = RequestFactory().post('/')
+    response = async_to_sync(async_views.PostListView.as_view())(request)
+    assert response.status_code == 405
+
+
+
+def test_pool_calls_release_connections(monkeypatch):
+    events = []
+    monkeypatch.setattr(
+        async_views, 'close_old_connections', lambda: events.append('close'))
+    result = async_to_sync(async_views.in_pool(
+        lambda: events.append('call') or 42))()
+    assert result == 42
+    assert events == ['close', 'call', 'close'], (
+        'Убедитесь, что потоки пула закрывают устаревшие соединения '
+        'до и после каждого вызова, как при обработке запроса.'
+    )
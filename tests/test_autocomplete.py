@@ -0,0 +1,96 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from blog.autocomplete import prefix_upper_bound
+from blog.forms import PostForm
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+
+@pytest.fixture
+def locations(mixer):
+    names = ('Москва', 'Мурманск', 'москва-сити', 'Минск', 'Казань')
+    return {
+        name: mixer.blend('blog.Location', name=name, is_published=True)
+        for name in names
+    }
+
+
+def suggestions(client, kind, query):
+    response = client.get(f'/autocomplete/{kind}/', {'q': query})
+    assert response.status_code == HTTPStatus.OK
+    return [item['text'] for item in response.json()['results']]
+
+
+def test_prefix_search_ignores_case(client, locations):
+    assert suggestions(client, 'location', 'мос') == [
+        'Москва', 'москва-сити']
+    assert suggestions(client, 'location', 'М') == [
+        'Минск', 'Москва', 'москва-сити', 'Мурманск']
+    assert suggestions(client, 'location', 'Омск') == []
+
+
+@pytest.mark.parametrize('prefix, upper', (
+    ('мос', 'мот'),
+    ('a\ud7ff', 'a\ue000'),
+    ('a\U0010ffff', 'b'),
+    ('\U0010ffff\U0010ffff', None),
+))
+def test_prefix_upper_bound(prefix, upper):
+    assert prefix_upper_bound(prefix) == upper
+
+
+def test_prefix_search_at_unicode_edges(client, mixer):
+    for name in ('\ud7ff', '\ud7ffы', '\ue000', '\U0010ffffа'):
+        mixer.blend('blog.Location', name=name, is_published=True)
+    assert suggestions(client, 'location', '\ud7ff') == ['\ud7ff', '\ud7ffы']
+    assert suggestions(client, 'location', '\U0010ffff') == ['\U0010ffffа']
+
+
+def test_only_published(client, mixer, locations, published_category):
+    locations['Минск'].is_published = False
+    locations['Минск'].save()
+    assert 'Минск' not in suggestions(client, 'location', 'м'), (
+        'Убедитесь, что автодополнение не предлагает '
+        'снятые с публикации местоположения.'
+    )
+    mixer.blend('blog.Category', title='Скрытая', is_published=False)
+    assert suggestions(client, 'category', '') == [
+        published_category.title]
+
+
+def test_search_key_follows_renames(client, locations):
+    location = locations['Казань']
+    location.name = 'Самара'
+    location.save()
+    assert suggestions(client, 'location', 'сам') == ['Самара']
+    assert suggestions(client, 'location', 'каз') == []
+
+
+def test_prefix_search_uses_index(client, locations):
+    with CaptureQueriesContext(connection) as context:
+        suggestions(client, 'location', 'мос')
+    sql = context.captured_queries[-1]['sql']
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+        plan = ' '.join(str(row) for row in cursor.fetchall())
+    assert 'location_search' in plan, plan
+
+
+def test_unknown_kind(client):
+    response = client.get('/autocomplete/user/', {'q': 'a'})
+    assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+def test_post_form_renders_selected_option_only(locations):
+    selected = locations['Казань']
+    html = str(PostForm(initial={'location': selected.pk})['location'])
+    assert html.count('<option') == 2
+    assert selected.name in html
+    assert 'data-autocomplete-url="/autocomplete/location/"' in html
+    assert 'js/autocomplete.js' in str(PostForm().media)
@@ -0,0 +1,130 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from mixer.backend.django import Mixer
+
+from blog import cache as blog_cache
+from blog.cache import ReferenceCache
+from blog.forms import PostForm
+from blog.models import Category
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+
+def test_category_served_from_reference_cache(
+        client, mixer: Mixer, published_category):
+    url = f'/category/{published_category.slug}/'
+    assert client.get(url).status_code == HTTPStatus.OK
+    with CaptureQueriesContext(connection) as queries:
+        client.get(url)
+    assert not any(
+        'FROM "blog_category"' in query['sql'].split('INNER JOIN')[0]
+        for query in queries.captured_queries
+    ), 'Убедитесь, что категория берётся из кэша справочников.'
+
+    published_category.is_published = False
+    published_category.save()
+    assert client.get(url).status_code == HTTPStatus.NOT_FOUND, (
+        'Убедитесь, что кэш категорий сбрасывается при изменении категории.'
+    )
+
+
+def test_post_form_selected_options_from_reference_cache(
+        mixer: Mixer, published_category, published_location):
+    initial = {
+        'category': published_category.pk,
+        'location': published_location.pk,
+    }
+    str(PostForm(initial=initial))
+    with CaptureQueriesContext(connection) as queries:
+        form = PostForm(initial=initial)
+        html = str(form['category']) + str(form['location'])
+    assert not queries.captured_queries
+    assert published_category.title in html
+    assert published_location.name in html
+
+    location = mixer.blend('blog.Location', name='Новое место')
+    assert location.name in str(
+        PostForm(initial={'location': location.pk})['location']), (
+        'Убедитесь, что кэш местоположений сбрасывается при добавлении.'
+    )
+
+
+def test_index_built_during_refresh_is_not_reused(
+        monkeypatch, mixer: Mixer, published_category):
+    reference = ReferenceCache(Category, 'race')
+    assert reference.lookup('slug', published_category.slug)
+    current = reference._current
+
+    def refreshed_meanwhile():
+        """Another thread refreshes while this one builds its index."""
+        snapshot = current()
+        reference.bump()
+        current()
+        return snapshot
+
+    category = mixer.blend('blog.Category', slug='novaya')
+    monkeypatch.setattr(reference, '_current', refreshed_meanwhile)
+    reference.lookup('title', category.title)
+    monkeypatch.undo()
+    assert reference.lookup('title', category.title) == category, (
+        'Убедитесь, что индекс справочника, построенный по устаревшим '
+        'строкам, не сохраняется под новой версией.'
+    )
+
+
+def test_page_render_reads_versions_once(
+        client, settings, monkeypatch, mixer: Mixer, user, published_category,
+        published_location):
+    settings.BLOG_FAST_RENDER = True
+    mixer.cycle(5).blend(
+        'blog.Post', author=user, is_published=True,
+        category=published_category, location=published_location)
+    reads = []
+    version = blog_cache.VersionedCache.version
+
+    def counted(self):
+        reads.append(self.version_key)
+        return version(self)
+
+    monkeypatch.setattr(blog_cache.VersionedCache, 'version', counted)
+    assert client.get('/').status_code == HTTPStatus.OK
+    for cached in (blog_cache.categories, blog_cache.locations):
+        assert reads.count(cached.version_key) == 1, (
+            'Убедитесь, что версия кэша справочника читается один раз '
+            'за страницу.'
+        )
+
+
+def test_missing_profile_negative_cache(client, mixer: Mixer):
+    url = '/profile/nobody/'
+    assert client.get(url).status_code == HTTPStatus.NOT_FOUND
+    with CaptureQueriesContext(connection) as queries:
+        assert client.get(url).status_code == HTTPStatus.NOT_FOUND
+    assert not queries.captured_queries, (
+        'Убедитесь, что повторный запрос несуществующего профиля '
+        'не обращается к базе данных.'
+    )
+
+    mixer.blend('auth.User', username='nobody')
+    assert client.get(url).status_code == HTTPStatus.OK, (
+        'Убедитесь, что кэш отсутствующих профилей сбрасывается '
+        'при создании пользователя.'
+    )
+
+
+def test_prerendered_404(client, settings):
+    settings.DEBUG = False
+    settings.PRERENDER_404 = True
+    first = client.get('/category/missing-one/')
+    second = client.get('/category/missing-two/?a=<b>')
+    assert second.status_code == HTTPStatus.NOT_FOUND
+    content = second.content.decode()
+    assert 'http://testserver/category/missing-two/?a=%3Cb%3E' in content
+    assert 'missing-one' not in content
+    assert first.content.decode().replace(
+        'missing-one/', 'missing-two/?a=%3Cb%3E') == content
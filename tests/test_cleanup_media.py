@@ -0,0 +1,64 @@
+import pytest
+from django.core.management import call_command
+from mixer.backend.django import Mixer
+
+from blog.management.commands import cleanup_media
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+
+@pytest.fixture
+def media_files(settings, tmp_path, mixer: Mixer, user):
+    settings.MEDIA_ROOT = tmp_path / 'media'
+    directory = settings.MEDIA_ROOT / 'post_media'
+    (directory / 'nested').mkdir(parents=True)
+    for name in ('used.jpg', 'orphan.jpg', 'nested/orphan.png'):
+        (directory / name).write_bytes(b'data')
+    mixer.blend('blog.Post', author=user, image='post_media/used.jpg')
+    return directory
+
+
+def test_cleanup_media_dry_run(media_files):
+    call_command('cleanup_media', dry_run=True, min_age=0, sleep=0)
+    assert (media_files / 'orphan.jpg').exists()
+    assert (media_files / 'nested' / 'orphan.png').exists()
+
+
+def test_cleanup_media_removes_orphans(media_files):
+    call_command('cleanup_media', min_age=0, sleep=0, batch_size=1)
+    assert (media_files / 'used.jpg').exists(), (
+        'Убедитесь, что используемые изображения не удаляются.'
+    )
+    assert not (media_files / 'orphan.jpg').exists()
+    assert not (media_files / 'nested' / 'orphan.png').exists()
+
+
+def test_cleanup_media_quarantine_and_min_age(media_files, tmp_path):
+    call_command('cleanup_media', sleep=0)
+    assert (media_files / 'orphan.jpg').exists(), (
+        'Убедитесь, что недавно загруженные файлы не удаляются.'
+    )
+    quarantine = tmp_path / 'quarantine'
+    call_command('cleanup_media', quarantine=str(quarantine), min_age=0,
+                 sleep=0)
+    assert (quarantine / 'post_media' / 'orphan.jpg').exists()
+    assert not (media_files / 'orphan.jpg').exists()
+
+
+def test_cleanup_media_rechecks_references(
+        media_files, monkeypatch, mixer: Mixer, user):
+    scan_files = cleanup_media.scan_files
+
+    def scan_and_reference(root):
+        # A post picks the file up after the referenced images were read.
+        mixer.blend('blog.Post', author=user, image='post_media/orphan.jpg')
+        yield from scan_files(root)
+
+    monkeypatch.setattr(cleanup_media, 'scan_files', scan_and_reference)
+    call_command('cleanup_media', min_age=0, sleep=0)
+    assert (media_files / 'orphan.jpg').exists(), (
+        'Убедитесь, что перед удалением ссылки на файл проверяются заново.'
+    )
+    assert not (media_files / 'nested' / 'orphan.png').exists()
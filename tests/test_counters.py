@@ -0,0 +1,77 @@
+import time
+
+import pytest
+from django.test import override_settings
+
+from blog.counters import ViewCounter
+from blog.models import Post
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+
+@pytest.fixture
+def counter():
+    return ViewCounter(autoflush=False)
+
+
+@override_settings(BLOG_VIEWS_FLUSH_SIZE=100, BLOG_VIEWS_FLUSH_INTERVAL=3600)
+def test_views_are_buffered_and_flushed_at_once(
+        counter, mixer, django_assert_num_queries):
+    posts = mixer.cycle(5).blend('blog.Post')
+    for i, post in enumerate(posts):
+        for _ in range(i + 1):
+            counter.hit(post.pk)
+    assert set(Post.objects.values_list('views', flat=True)) == {0}, (
+        'Убедитесь, что просмотры не записываются в базу на каждый запрос.'
+    )
+    with django_assert_num_queries(1):
+        assert counter.flush() == 5
+    assert list(
+        Post.objects.order_by('pk').values_list('views', flat=True)
+    ) == [1, 2, 3, 4, 5]
+    with django_assert_num_queries(0):
+        assert counter.flush() == 0
+
+
+@override_settings(BLOG_VIEWS_FLUSH_SIZE=3, BLOG_VIEWS_FLUSH_INTERVAL=3600)
+def test_full_buffer_wakes_flusher(counter, mixer):
+    posts = mixer.cycle(3).blend('blog.Post')
+    counter.hit(posts[0].pk)
+    counter.hit(posts[1].pk)
+    assert not counter._full.is_set()
+    counter.hit(posts[2].pk)
+    assert counter._full.is_set()
+    assert counter.pending(posts[0].pk) == 1, (
+        'Убедитесь, что просмотры не записываются в потоке запроса.'
+    )
+    assert set(Post.objects.values_list('views', flat=True)) == {0}
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.usefixtures('reset_sequences')
+@override_settings(BLOG_VIEWS_FLUSH_SIZE=100, BLOG_VIEWS_FLUSH_INTERVAL=0.05)
+def test_views_are_flushed_periodically(mixer):
+    # The flusher thread has its own connection, so the post is committed.
+    post = mixer.blend('blog.Post')
+    counter = ViewCounter()
+    counter.hit(post.pk)
+    deadline = time.monotonic() + 5
+    post.refresh_from_db()
+    while not post.views and time.monotonic() < deadline:
+        time.sleep(0.01)
+        post.refresh_from_db()
+    assert post.views == 1, (
+        'Убедитесь, что буфер просмотров записывается периодически.'
+    )
+
+
+def test_detail_view_counts_views(
+        client, post_with_published_location, monkeypatch, counter):
+    monkeypatch.setattr('blog.views.view_counter', counter)
+    for _ in range(3):
+        client.get(f'/posts/{post_with_published_location.id}/')
+    counter.flush()
+    post_with_published_location.refresh_from_db()
+    assert post_with_published_location.views == 3
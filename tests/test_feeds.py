@@ -0,0 +1,134 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from test_publish_scheduled import come_due
+
+from blog.constans import FEED_CACHE_TIMEOUT, FEED_PENDING_TIMEOUT
+from blog.feeds import feed_timeout
+from blog.publishing import publish_due
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+
+
+@pytest.fixture
+def posts(mixer, user, published_category):
+    return mixer.cycle(3).blend(
+        'blog.Post', author=user, category=published_category,
+        is_published=True)
+
+
+@pytest.mark.parametrize('suffix, content_type', (
+    ('', 'application/rss+xml'),
+    ('atom/', 'application/atom+xml'),
+))
+def test_feeds(client, user, posts, published_category, mixer,
+               suffix, content_type):
+    other = mixer.blend('blog.Post', category=published_category)
+    for url, expected in (
+        (f'/feed/{suffix}', posts + [other]),
+        (f'/category/{published_category.slug}/feed/{suffix}',
+         posts + [other]),
+        (f'/profile/{user.username}/feed/{suffix}', posts),
+    ):
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        assert response['Content-Type'].startswith(content_type)
+        content = response.content.decode()
+        for post in expected:
+            assert f'/posts/{post.pk}/' in content, url
+        if other not in expected:
+            assert f'/posts/{other.pk}/' not in content, (
+                'Убедитесь, что лента автора содержит только его публикации.'
+            )
+
+
+def test_feed_not_found(client, mixer):
+    category = mixer.blend('blog.Category', is_published=False)
+    assert client.get(
+        f'/category/{category.slug}/feed/').status_code == (
+        HTTPStatus.NOT_FOUND)
+    assert client.get('/profile/nobody/feed/').status_code == (
+        HTTPStatus.NOT_FOUND)
+
+
+def test_feed_conditional_get(client, posts):
+    response = client.get('/feed/')
+    etag = response['ETag']
+    with CaptureQueriesContext(connection) as context:
+        response = client.get('/feed/', HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+        'Убедитесь, что при неизменной ленте возвращается статус 304.'
+    )
+    assert not context.captured_queries, (
+        'Убедитесь, что лента кэшируется до следующего изменения публикаций.'
+    )
+    response = client.get(
+        '/feed/', HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+
+@pytest.mark.parametrize('secure', (False, True))
+def test_feed_cached_per_host_and_scheme(client, posts, settings, secure):
+    settings.ALLOWED_HOSTS = ['a.example', 'b.example']
+    client.get('/feed/', HTTP_HOST='a.example')
+    content = client.get(
+        '/feed/', HTTP_HOST='b.example', secure=secure).content.decode()
+    scheme = 'https' if secure else 'http'
+    assert f'{scheme}://b.example/' in content
+    assert 'a.example' not in content, (
+        'Убедитесь, что лента не отдаётся со ссылками на другой хост.'
+    )
+
+
+def test_feed_invalidated_by_writes(client, posts):
+    etag = client.get('/feed/')['ETag']
+    post = posts[0]
+    post.title = 'Новый заголовок'
+    post.save()
+    response = client.get('/feed/', HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.OK
+    assert 'Новый заголовок' in response.content.decode()
+
+
+def test_feed_invalidated_by_scheduled_publication(
+        client, mixer, published_category, posts,
+        django_capture_on_commit_callbacks):
+    scheduled = mixer.blend(
+        'blog.Post', category=published_category, is_published=True,
+        pub_date=posts[0].pub_date.replace(year=3000))
+    assert f'/posts/{scheduled.pk}/' not in client.get(
+        '/feed/').content.decode()
+    come_due([scheduled])
+    with django_capture_on_commit_callbacks(execute=True):
+        publish_due()
+    assert f'/posts/{scheduled.pk}/' in client.get('/feed/').content.decode()
+
+
+def test_feed_expires_when_next_post_is_due(
+        mixer, published_category, posts):
+    now = timezone.now()
+    assert feed_timeout(now) == FEED_CACHE_TIMEOUT
+    scheduled = mixer.blend(
+        'blog.Post', category=published_category, is_published=True,
+        pub_date=now + timedelta(seconds=90))
+    assert feed_timeout(now) == 90, (
+        'Убедитесь, что лента кэшируется не дольше, чем до публикации '
+        'следующего отложенного поста.'
+    )
+    come_due([scheduled])
+    assert feed_timeout() == FEED_PENDING_TIMEOUT, (
+        'Убедитесь, что лента кэшируется ненадолго, пока наступивший '
+        'пост ждёт publish_scheduled.'
+    )
@@ -0,0 +1,223 @@
+import multiprocessing
+import resource
+import struct
+import zlib
+from io import BytesIO
+
+import pytest
+from django.core.exceptions import ValidationError
+from django.core.files.uploadedfile import (SimpleUploadedFile,
+                                            TemporaryUploadedFile)
+from PIL import Image, ImageOps
+
+from blog import images
+from blog.forms import PostForm
+from blog.images import EXIF_ORIENTATION, clean_image, strip_jpeg_metadata
+
+RSS_LIMIT_KB = 40 * 1024
+
+
+def make_exif(orientation):
+    exif = Image.Exif()
+    exif[EXIF_ORIENTATION] = orientation
+    exif[0x010F] = 'Camera maker'
+    return exif.tobytes()
+
+
+def png_bomb(width, height, orientation=None):
+    """A tiny PNG whose header claims width x height pixels."""
+    def chunk(chunk_type, data):
+        return (struct.pack('>I', len(data)) + chunk_type + data
+                + struct.pack('>I', zlib.crc32(chunk_type + data)))
+    exif = b''
+    if orientation is not None:
+        exif = chunk(b'eXIf', make_exif(orientation)[6:])
+    return (b'\x89PNG\r\n\x1a\n'
+            + chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 2,
+                                         0, 0, 0))
+            + exif
+            + chunk(b'IDAT', zlib.compress(b'\x00' * 1024))
+            + chunk(b'IEND', b''))
+
+
+def image_upload(size, orientation=1, image_format='JPEG', **options):
+    data = BytesIO()
+    Image.new('RGB', size, 'orange').save(
+        data, image_format, exif=make_exif(orientation), **options)
+    upload = TemporaryUploadedFile(
+        f'photo.{image_format.lower()}', f'image/{image_format.lower()}',
+        0, None)
+    upload.write(data.getvalue())
+    upload.size = upload.tell()
+    return upload
+
+
+def jpeg_upload(size, orientation=1):
+    return image_upload(size, orientation, quality=85)
+
+
+def peak_rss_delta_kb(func, *args):
+    """Run func in a forked child and return its peak RSS growth."""
+    def target(conn):
+        with open('/proc/self/statm') as statm:
+            pages = int(statm.read().split()[1])
+        before = pages * resource.getpagesize() // 1024
+        try:
+            func(*args)
+            error = None
+        except ValidationError as e:
+            error = e.code
+        except Exception as e:
+            error = repr(e)
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        conn.send((peak - before, error))
+
+    context = multiprocessing.get_context('fork')
+    parent_conn, child_conn = context.Pipe()
+    process = context.Process(target=target, args=(child_conn,))
+    process.start()
+    assert parent_conn.poll(60), 'Процесс проверки изображения завис.'
+    result = parent_conn.recv()
+    process.join()
+    return result
+
+
+def test_decompression_bomb_rejected_from_header():
+    upload = SimpleUploadedFile(
+        'bomb.png', png_bomb(30000, 30000), 'image/png')
+    delta, error = peak_rss_delta_kb(clean_image, upload)
+    assert error == 'too_many_pixels', (
+        'Убедитесь, что изображения с огромным разрешением отклоняются.'
+    )
+    assert delta < RSS_LIMIT_KB
+
+
+def test_oversize_file_rejected():
+    upload = SimpleUploadedFile('big.jpg', b'\xff\xd8' + b'0' * 11 * 2 ** 20)
+    with pytest.raises(ValidationError) as error:
+        clean_image(upload)
+    assert error.value.code == 'file_too_large'
+
+
+def test_exif_stripped_without_decoding():
+    upload = jpeg_upload((6000, 4000))
+    delta, error = peak_rss_delta_kb(clean_image, upload)
+    assert error is None
+    assert delta < RSS_LIMIT_KB, (
+        'Убедитесь, что метаданные удаляются без декодирования изображения.'
+    )
+    cleaned = clean_image(jpeg_upload((64, 48)))
+    with Image.open(cleaned) as image:
+        assert image.size == (64, 48)
+        assert not image.getexif()
+
+
+def test_jpeg_orientation_kept_without_decoding():
+    upload = jpeg_upload((6000, 4000), orientation=6)
+    delta, error = peak_rss_delta_kb(clean_image, upload)
+    assert error is None
+    assert delta < RSS_LIMIT_KB, (
+        'Убедитесь, что повёрнутые JPEG не декодируются целиком.'
+    )
+    cleaned = clean_image(jpeg_upload((64, 48), orientation=6))
+    with Image.open(cleaned) as image:
+        assert dict(image.getexif()) == {EXIF_ORIENTATION: 6}, (
+            'Убедитесь, что из метаданных JPEG остаётся только ориентация.'
+        )
+        assert ImageOps.exif_transpose(image).size == (48, 64)
+
+
+def test_png_orientation_normalized():
+    cleaned = clean_image(image_upload((64, 48), 6, 'PNG'))
+    with Image.open(cleaned) as image:
+        assert image.size == (48, 64)
+        assert not image.getexif()
+
+
+def test_large_rotated_png_rejected_before_decoding():
+    upload = SimpleUploadedFile(
+        'rotated.png', png_bomb(4000, 4000, orientation=6), 'image/png')
+    delta, error = peak_rss_delta_kb(clean_image, upload)
+    assert error == 'too_many_pixels'
+    assert delta < RSS_LIMIT_KB
+
+
+def test_webp_metadata_stripped():
+    cleaned = clean_image(image_upload((64, 48), image_format='WEBP'))
+    data = cleaned.read()
+    assert b'EXIF' not in data
+    assert int.from_bytes(data[4:8], 'little') == len(data) - 8
+    with Image.open(BytesIO(data)) as image:
+        assert image.size == (64, 48)
+        assert not image.getexif()
+        image.load()
+
+
+def jpeg_with_stray_byte():
+    """A JPEG with a stray zero byte after APP0, which Pillow skips."""
+    data = BytesIO()
+    Image.new('RGB', (32, 32), 'orange').save(data, 'JPEG')
+    data = data.getvalue()
+    app0_end = 4 + int.from_bytes(data[4:6], 'big')
+    return data[:app0_end] + b'\x00' + data[app0_end:]
+
+
+@pytest.mark.django_db
+def test_post_form_accepts_jpeg_with_stray_bytes(
+        published_category, published_location):
+    form = PostForm(
+        data={'title': 'Заголовок', 'text': 'Текст',
+              'category': published_category.id,
+              'location': published_location.id},
+        files={'image': SimpleUploadedFile(
+            'photo.jpg', jpeg_with_stray_byte(), 'image/jpeg')})
+    assert form.is_valid(), (
+        'Убедитесь, что JPEG с лишними байтами между маркерами '
+        'принимается формой.'
+    )
+    with Image.open(form.cleaned_data['image']) as image:
+        assert image.size == (32, 32)
+        image.load()
+
+
+@pytest.mark.parametrize('data', (
+    b'\xff\xd8\xff\xff',
+    b'\xff\xd8\xff\xdb\x00',
+    b'\xff\xd8\xff\xdb\x00\x01',
+))
+def test_truncated_jpeg_markers_are_value_errors(data):
+    with pytest.raises(ValueError):
+        strip_jpeg_metadata(BytesIO(data), BytesIO())
+
+
+def test_unparsable_image_is_validation_error(monkeypatch):
+    def corrupt(src, dst, orientation=1):
+        raise ValueError('Corrupt JPEG marker')
+
+    monkeypatch.setattr(images, 'strip_jpeg_metadata', corrupt)
+    upload = jpeg_upload((64, 48))
+    upload.seek(0)
+    data = upload.read()
+    truncated = SimpleUploadedFile(
+        'photo.jpg', data[:len(data) // 2], 'image/jpeg')
+    with pytest.raises(ValidationError) as error:
+        clean_image(truncated)
+    assert error.value.code == 'invalid_image', (
+        'Убедитесь, что ошибка разбора изображения превращается '
+        'в ошибку валидации.'
+    )
+    assert clean_image(jpeg_upload((64, 48))).size, (
+        'Убедитесь, что изображение, которое не удалось разобрать '
+        'по сегментам, сохраняется заново.'
+    )
+
+
+@pytest.mark.django_db
+def test_post_form_rejects_bomb(published_category):
+    form = PostForm(
+        data={'title': 'Заголовок', 'text': 'Текст',
+              'category': published_category.id},
+        files={'image': SimpleUploadedFile(
+            'bomb.png', png_bomb(20000, 20000), 'image/png')})
+    assert not form.is_valid()
+    assert 'image' in form.errors
@@ -0,0 +1,42 @@
+from http import HTTPStatus
+
+import pytest
+from django.conf import settings
+from django.test import override_settings
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+JINJA2_TEMPLATES = [{
+    'BACKEND': 'django.template.backends.jinja2.Jinja2',
+    'DIRS': [settings.TEMPLATES_DIR / 'jinja2'],
+    'APP_DIRS': False,
+    'OPTIONS': {
+        'environment': 'blogicum.jinja2.environment',
+        'context_processors': [
+            'django.contrib.auth.context_processors.auth',
+        ],
+    },
+}] + settings.TEMPLATES
+
+
+@override_settings(TEMPLATES=JINJA2_TEMPLATES)
+def test_jinja2_pages(user_client, comment_to_a_post):
+    post = comment_to_a_post.post
+    for url in (
+        '/',
+        f'/category/{post.category.slug}/',
+        f'/profile/{post.author.username}/',
+        f'/posts/{post.id}/',
+        '/posts/create/',
+        '/edit_profile/',
+    ):
+        response = user_client.get(url)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Убедитесь, что страница `{url}` отображается '
+            'с шаблонами Jinja2 без ошибок.'
+        )
+    content = user_client.get(f'/posts/{post.id}/').content.decode()
+    assert post.title in content
+    assert comment_to_a_post.text.splitlines()[0] in content
@@ -0,0 +1,77 @@
+from http import HTTPStatus
+
+import pytest
+from django.test import RequestFactory
+
+from blogicum.media import serve_media
+
+CONTENT = bytes(range(256)) * 40
+
+
+@pytest.fixture
+def media_file(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    (tmp_path / 'post_media').mkdir()
+    (tmp_path / 'post_media' / 'photo.jpg').write_bytes(CONTENT)
+    return 'post_media/photo.jpg'
+
+
+def get(path, **headers):
+    request = RequestFactory().get(f'/{path}', **headers)
+    response = serve_media(request, path)
+    if response.streaming:
+        body = b''.join(response.streaming_content)
+        if getattr(response, 'file_to_stream', None):
+            response.file_to_stream.close()
+    else:
+        body = response.content
+    return response, body
+
+
+def test_python_mode_full_and_conditional(settings, media_file):
+    settings.MEDIA_SERVE_MODE = 'python'
+    response, body = get(media_file)
+    assert response.status_code == HTTPStatus.OK
+    assert body == CONTENT
+    assert response['Content-Type'] == 'image/jpeg'
+    assert response['Accept-Ranges'] == 'bytes'
+
+    response, body = get(media_file, HTTP_IF_NONE_MATCH=response['ETag'])
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+
+@pytest.mark.parametrize('header, start, end', (
+    ('bytes=0-99', 0, 99),
+    ('bytes=100-', 100, len(CONTENT) - 1),
+    ('bytes=-10', len(CONTENT) - 10, len(CONTENT) - 1),
+    ('bytes=5000-999999', 5000, len(CONTENT) - 1),
+))
+def test_python_mode_range(settings, media_file, header, start, end):
+    settings.MEDIA_SERVE_MODE = 'python'
+    response, body = get(media_file, HTTP_RANGE=header)
+    assert response.status_code == HTTPStatus.PARTIAL_CONTENT
+    assert body == CONTENT[start:end + 1]
+    assert response['Content-Range'] == f'bytes {start}-{end}/{len(CONTENT)}'
+    assert int(response['Content-Length']) == len(body)
+
+
+def test_python_mode_unsatisfiable_and_stale_range(settings, media_file):
+    settings.MEDIA_SERVE_MODE = 'python'
+    response, _ = get(media_file, HTTP_RANGE='bytes=999999-')
+    assert response.status_code == HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE
+    response, body = get(
+        media_file, HTTP_RANGE='bytes=0-9', HTTP_IF_RANGE='"stale"')
+    assert response.status_code == HTTPStatus.OK
+    assert body == CONTENT
+
+
+def test_front_server_handoff(settings, media_file):
+    settings.MEDIA_SERVE_MODE = 'x-accel-redirect'
+    response, body = get(media_file)
+    assert response['X-Accel-Redirect'] == (
+        settings.MEDIA_ACCEL_PREFIX + media_file)
+    assert body == b''
+
+    settings.MEDIA_SERVE_MODE = 'x-sendfile'
+    response, body = get(media_file)
+    assert response['X-Sendfile'] == str(settings.MEDIA_ROOT / media_file)
@@ -0,0 +1,97 @@
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from blog import publishing
+from blog.models import Post
+from blog.publishing import next_publication_time, publish_due
+from blog.signals import posts_published
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+
+@pytest.fixture
+def scheduled(mixer, published_category):
+    now = timezone.now()
+    return mixer.cycle(5).blend(
+        'blog.Post', category=published_category, is_published=True,
+        pub_date=(now + timedelta(hours=i + 1) for i in range(5)))
+
+
+def come_due(posts):
+    """Move pub_date into the past, as if the time had passed."""
+    Post.objects.filter(pk__in=[post.pk for post in posts]).update(
+        pub_date=timezone.now() - timedelta(seconds=1))
+
+
+def test_scheduled_posts_are_hidden(client, scheduled):
+    assert not Post.objects.filter(is_visible=True).exists()
+    response = client.get('/')
+    assert not response.context['page_obj'].object_list, (
+        'Убедитесь, что отложенные публикации не попадают в ленту.'
+    )
+    assert next_publication_time() == scheduled[0].pub_date
+
+
+def test_publish_scheduled(
+        client, scheduled, mixer, django_capture_on_commit_callbacks):
+    hidden = mixer.blend(
+        'blog.Post', category__is_published=False, is_published=True,
+        pub_date=timezone.now() + timedelta(hours=1))
+    come_due(scheduled[:4] + [hidden])
+    published = []
+
+    def receiver(sender, post_ids, **kwargs):
+        published.extend(post_ids)
+
+    posts_published.connect(receiver)
+    try:
+        with django_capture_on_commit_callbacks(execute=True):
+            call_command('publish_scheduled', batch_size=3)
+            call_command('publish_scheduled', batch_size=3)
+    finally:
+        posts_published.disconnect(receiver)
+    assert sorted(published) == sorted(post.pk for post in scheduled[:4]), (
+        'Убедитесь, что команда публикует наступившие публикации один раз '
+        'и отправляет сигнал `posts_published`.'
+    )
+    response = client.get('/')
+    assert len(response.context['page_obj'].object_list) == 4
+    assert next_publication_time() == scheduled[4].pub_date
+
+
+def test_concurrently_published_posts_are_not_reported(
+        scheduled, monkeypatch, django_capture_on_commit_callbacks):
+    come_due(scheduled)
+    due_posts = publishing.due_posts
+    calls = []
+
+    def due_posts_with_race(now):
+        calls.append(now)
+        if len(calls) == 2:
+            # Another run flips a post between the select and the update.
+            Post.objects.filter(pk=scheduled[0].pk).update(
+                is_visible=True, updated_at=now - timedelta(seconds=1))
+        return due_posts(now)
+
+    monkeypatch.setattr(publishing, 'due_posts', due_posts_with_race)
+    published = []
+
+    def receiver(sender, post_ids, **kwargs):
+        published.extend(post_ids)
+
+    posts_published.connect(receiver)
+    try:
+        with django_capture_on_commit_callbacks(execute=True):
+            ids = publish_due()
+    finally:
+        posts_published.disconnect(receiver)
+    expected = sorted(post.pk for post in scheduled[1:])
+    assert sorted(ids) == sorted(published) == expected, (
+        'Убедитесь, что сигнал получают только публикации, открытые '
+        'этим запуском.'
+    )
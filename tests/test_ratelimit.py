@@ -0,0 +1,123 @@
+import threading
+import uuid
+from http import HTTPStatus
+
+import pytest
+from django.core.cache import cache
+from django.test import override_settings
+
+from blog import ratelimit
+from blog.models import Comment
+from blog.ratelimit import count_request
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+# Long enough for the whole test to stay inside one window.
+PERIOD = 10 ** 9
+
+
+@pytest.fixture(autouse=True)
+def clear_windows():
+    yield
+    cache.clear()
+
+
+def test_window_is_exact_under_concurrency():
+    client = uuid.uuid4().hex
+    rate, threads, attempts = 50, 20, 10
+    results = []
+    barrier = threading.Barrier(threads)
+
+    def worker():
+        barrier.wait()
+        for _ in range(attempts):
+            results.append(count_request('test', client, rate, PERIOD))
+
+    pool = [threading.Thread(target=worker) for _ in range(threads)]
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    assert len(results) == threads * attempts
+    assert results.count(0) == rate, (
+        'Убедитесь, что при одновременных запросах пропускается ровно '
+        '`rate` запросов.'
+    )
+    assert all(retry_after > 0 for retry_after in results if retry_after)
+
+
+def test_retry_after_waits_for_window_to_slide(monkeypatch):
+    clock = 600.0
+    monkeypatch.setattr(ratelimit.time, 'time', lambda: clock)
+    client = uuid.uuid4().hex
+    assert count_request('test', client, 1, 60) == 0
+    retry_after = count_request('test', client, 1, 60)
+    assert retry_after == 120, (
+        'Убедитесь, что Retry-After указывает, когда запрос будет принят.'
+    )
+    clock += retry_after - 1
+    assert count_request('test', client, 1, 60)
+    clock += 1
+    assert count_request('test', client, 1, 60) == 0
+
+
+def test_window_slides_across_edges(monkeypatch):
+    clock = 600.0 + 54
+    monkeypatch.setattr(ratelimit.time, 'time', lambda: clock)
+    client = uuid.uuid4().hex
+    rate = 10
+    assert all(
+        count_request('test', client, rate, 60) == 0 for _ in range(rate))
+    clock = 660.0 + 6
+    allowed = [count_request('test', client, rate, 60) for _ in range(rate)]
+    assert allowed.count(0) == 1, (
+        'Убедитесь, что сразу после границы окна не пропускается ещё '
+        '`rate` запросов.'
+    )
+    assert all(retry_after > 0 for retry_after in allowed[1:])
+
+
+def test_expired_window_is_counted_again(monkeypatch):
+    class ExpiringCache:
+        """The key expires right after the first add() finds it."""
+        added = False
+
+        def add(self, key, value, timeout):
+            if not self.added:
+                self.added = True
+                return False
+            return cache.add(key, value, timeout)
+
+        def incr(self, key):
+            return cache.incr(key)
+
+        def decr(self, key):
+            return cache.decr(key)
+
+        def get(self, key, default=None):
+            return cache.get(key, default)
+
+    monkeypatch.setattr(ratelimit, 'cache', ExpiringCache())
+    client = uuid.uuid4().hex
+    assert count_request('test', client, 1, PERIOD) == 0
+    assert count_request('test', client, 1, PERIOD) > 0, (
+        'Убедитесь, что запрос учитывается, даже если окно истекло.'
+    )
+
+
+@override_settings(BLOG_RATE_LIMITS={'comment': (2, PERIOD)})
+def test_comment_creation_is_throttled(
+        user_client, post_with_published_location):
+    url = f'/posts/{post_with_published_location.id}/comment/'
+    for _ in range(2):
+        response = user_client.post(url, data={'text': 'Комментарий'})
+        assert response.status_code == HTTPStatus.FOUND
+    response = user_client.post(url, data={'text': 'Комментарий'})
+    assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+        'Убедитесь, что при превышении лимита комментариев возвращается '
+        'статус 429.'
+    )
+    assert int(response['Retry-After']) > 0
+    assert Comment.objects.count() == 2
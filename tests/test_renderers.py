@@ -0,0 +1,68 @@
+import random
+
+import pytest
+from django.core.paginator import Paginator
+from django.db.models import Count
+from django.template.loader import render_to_string
+from mixer.backend.django import Mixer
+
+from blog.models import Post
+from blog.renderers import (post_card_rows, post_row, render_paginator,
+                            render_post_card)
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+
+@pytest.fixture
+def random_posts(mixer: Mixer, user):
+    rnd = random.Random(4)
+    posts = []
+    for i in range(30):
+        location = rnd.choice((
+            None,
+            mixer.blend('blog.Location', is_published=True),
+            mixer.blend('blog.Location', is_published=False,
+                        name='<b>Закрыто</b> & co'),
+        ))
+        posts.append(mixer.blend(
+            'blog.Post',
+            author=user,
+            title=rnd.choice(('Заголовок', '"quoted" <title>', 'a & b')),
+            text=' '.join(['слово'] * rnd.randint(0, 20)) + ' <i>',
+            is_published=rnd.random() > 0.3,
+            category__is_published=rnd.random() > 0.3,
+            location=location,
+            image=rnd.choice(('', f'post_media/img_{i}.jpg')),
+        ))
+    return posts
+
+
+def test_post_card_parity(random_posts):
+    queryset = Post.objects.select_related(
+        'author', 'category', 'location'
+    ).annotate(comment_count=Count('comments')).order_by('id')
+    rows = list(post_card_rows(queryset))
+    assert len(rows) == len(random_posts)
+    for post, row in zip(queryset, rows):
+        expected = render_to_string(
+            'includes/post_card.html', {'post': post})
+        assert render_post_card(row) == expected, (
+            'Убедитесь, что быстрый рендер карточки поста совпадает '
+            'с шаблоном `includes/post_card.html`.'
+        )
+        assert render_post_card(post_row(post)) == expected
+
+
+@pytest.mark.parametrize('count', (0, 5, 10, 11, 35, 101))
+def test_paginator_parity(count):
+    paginator = Paginator(range(count), 10)
+    for number in paginator.page_range:
+        page_obj = paginator.page(number)
+        expected = render_to_string(
+            'includes/paginator.html', {'page_obj': page_obj})
+        assert render_paginator(page_obj) == expected, (
+            'Убедитесь, что быстрый рендер пагинатора совпадает '
+            'с шаблоном `includes/paginator.html`.'
+        )
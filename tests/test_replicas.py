@@ -0,0 +1,165 @@
+import sqlite3
+from http import HTTPStatus
+
+import pytest
+from django.core.cache import cache
+from django.db import connection, connections
+from django.test import override_settings
+from mixer.backend.django import Mixer
+
+from blog.cache import categories, missing_profiles
+from blog.management.commands.sync_replicas import copy_database
+from blog.models import Post
+from blogicum import routers
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+
+@pytest.fixture
+def replica_reads_log(monkeypatch):
+    """Record replica picks; the replica alias is the primary itself."""
+    picks = []
+
+    def choose_replica():
+        picks.append(True)
+        return 'default'
+
+    monkeypatch.setattr(routers, 'choose_replica', choose_replica)
+    with override_settings(BLOG_READ_REPLICAS=['default']):
+        yield picks
+    cache.clear()
+
+
+@pytest.fixture
+def lagging_replica(monkeypatch, tmp_path):
+    """
+    Route replica reads to a copy of the primary taken when called;
+    later writes to the primary do not reach it.
+    """
+    def snapshot():
+        path = tmp_path / 'lagging.sqlite3'
+        connection.ensure_connection()
+        with sqlite3.connect(path) as replica:
+            replica.executescript(
+                '\n'.join(connection.connection.iterdump()))
+        connections.databases['lagging'] = dict(
+            connections.databases['default'], NAME=str(path))
+
+    monkeypatch.setattr(routers, 'choose_replica', lambda: 'lagging')
+    with override_settings(BLOG_READ_REPLICAS=['lagging']):
+        yield snapshot
+    if hasattr(connections._connections, 'lagging'):
+        connections['lagging'].close()
+        del connections._connections.lagging
+    del connections.databases['lagging']
+    cache.clear()
+
+
+def test_router_reads_from_replica_only_inside_views(replica_reads_log):
+    router = routers.ReplicaRouter()
+    assert router.db_for_read(Post) is None
+    with routers.replica_reads():
+        assert router.db_for_read(Post) == 'default'
+        assert router.db_for_write(Post) == 'default'
+    assert replica_reads_log == [True]
+    with override_settings(BLOG_READ_REPLICAS=['replica_0']):
+        assert router.allow_migrate('default', 'blog') is None
+        assert router.allow_migrate('replica_0', 'blog') is False
+
+
+def test_writers_stick_to_primary(
+        replica_reads_log, user, user_client, another_user_client,
+        post_with_published_location):
+    user_client.get('/')
+    assert replica_reads_log, (
+        'Убедитесь, что ленты читают данные с реплики.'
+    )
+    response = user_client.post(
+        f'/posts/{post_with_published_location.id}/comment/',
+        data={'text': 'Комментарий'})
+    assert response.status_code == 302
+    assert cache.get(routers.sticky_key(user))
+    replica_reads_log.clear()
+    user_client.get(f'/posts/{post_with_published_location.id}/')
+    assert not replica_reads_log, (
+        'Убедитесь, что после записи пользователь читает с основной базы.'
+    )
+    another_user_client.get(f'/posts/{post_with_published_location.id}/')
+    assert replica_reads_log
+
+
+def test_reference_cache_refills_from_primary(
+        lagging_replica, published_category):
+    lagging_replica()
+    published_category.is_published = False
+    published_category.save()
+    with routers.replica_reads():
+        assert Post.objects.db == 'lagging'
+        category = categories.lookup('slug', published_category.slug)
+    assert not category.is_published, (
+        'Убедитесь, что кэш справочников загружается с основной базы.'
+    )
+
+
+def test_new_profile_found_on_primary(lagging_replica, client, mixer: Mixer):
+    lagging_replica()
+    mixer.blend('auth.User', username='newcomer')
+    for url in ('/profile/newcomer/', '/api/profile/newcomer/posts/'):
+        assert client.get(url).status_code == HTTPStatus.OK, (
+            'Убедитесь, что профиль, которого ещё нет на реплике, '
+            'ищется на основной базе.'
+        )
+    assert 'newcomer' not in missing_profiles
+    assert client.get('/profile/nobody/').status_code == (
+        HTTPStatus.NOT_FOUND)
+    assert 'nobody' in missing_profiles
+
+
+def test_feed_rendered_from_primary(
+        lagging_replica, client, mixer: Mixer, user, published_category):
+    lagging_replica()
+    post = mixer.blend(
+        'blog.Post', author=user, category=published_category,
+        is_published=True)
+    assert f'/posts/{post.pk}/' in client.get('/feed/').content.decode(), (
+        'Убедитесь, что лента собирается по основной базе.'
+    )
+
+
+def test_copy_database(tmp_path):
+    primary, replica = tmp_path / 'primary.sqlite3', tmp_path / 'replica.db'
+    with sqlite3.connect(primary) as connection:
+        connection.execute('CREATE TABLE post (title TEXT)')
+        connection.executemany(
+            'INSERT INTO post VALUES (?)', [('a',), ('b',)])
+    copy_database(primary, replica, pages=1)
+    with sqlite3.connect(replica) as connection:
+        assert connection.execute(
+            'SELECT count(*) FROM post').fetchone() == (2,)
+
+
+def test_copy_database_replaces_replica_atomically(tmp_path):
+    primary, replica = tmp_path / 'primary.sqlite3', tmp_path / 'replica.db'
+    with sqlite3.connect(primary) as connection:
+        connection.execute('CREATE TABLE post (title TEXT)')
+        connection.execute("INSERT INTO post VALUES ('new')")
+    with sqlite3.connect(replica) as connection:
+        connection.execute('CREATE TABLE post (title TEXT)')
+        connection.execute("INSERT INTO post VALUES ('old')")
+    reader = sqlite3.connect(replica)
+    try:
+        copy_database(primary, replica, pages=1)
+        assert reader.execute('SELECT title FROM post').fetchall() == [
+            ('old',)], (
+            'Убедитесь, что открытые соединения реплики не видят '
+            'недокопированную базу.'
+        )
+    finally:
+        reader.close()
+    with sqlite3.connect(replica) as connection:
+        assert connection.execute('SELECT title FROM post').fetchall() == [
+            ('new',)]
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        'primary.sqlite3', 'replica.db']
@@ -0,0 +1,52 @@
+from datetime import timedelta
+
+import pytest
+from django.contrib.sessions.models import Session
+from django.core import checks
+from django.core.management import call_command
+from django.utils import timezone
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+
+def test_clear_expired_sessions():
+    now = timezone.now()
+    Session.objects.bulk_create(
+        Session(session_key=f'expired{i}', session_data='',
+                expire_date=now - timedelta(days=1))
+        for i in range(7)
+    )
+    Session.objects.create(
+        session_key='alive', session_data='',
+        expire_date=now + timedelta(days=1))
+
+    call_command('clear_expired_sessions', batch_size=2, sleep=0)
+
+    assert list(Session.objects.values_list('pk', flat=True)) == ['alive'], (
+        'Убедитесь, что команда `clear_expired_sessions` удаляет только '
+        'просроченные сессии.'
+    )
+
+
+@pytest.mark.parametrize('mode', ('cache', 'cached_db'))
+def test_cached_sessions_need_shared_cache(settings, mode):
+    settings.SESSION_ENGINE = f'django.contrib.sessions.backends.{mode}'
+    settings.BLOG_SHARED_CACHE = False
+    assert [error.id for error in checks.run_checks()] == ['blog.E001'], (
+        'Убедитесь, что сессии в кэше процесса не проходят проверку.'
+    )
+    settings.BLOG_SHARED_CACHE = True
+    assert not checks.run_checks()
+
+
+def test_per_process_cache_reported_for_deploy(settings):
+    settings.BLOG_SHARED_CACHE = False
+    settings.BLOG_READ_REPLICAS = ['replica_0']
+    warnings = [
+        message for message in checks.run_checks(include_deployment_checks=True)
+        if message.id == 'blog.W001'
+    ]
+    assert len(warnings) == 1
+    assert 'replica stickiness' in warnings[0].msg
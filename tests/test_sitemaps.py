@@ -0,0 +1,111 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+from blog.models import Post
+from blog.sitemaps import build
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+BASE_URL = 'https://blogicum.test'
+
+
+@pytest.fixture(autouse=True)
+def sitemap_root(settings, tmp_path, monkeypatch):
+    monkeypatch.setattr('blog.sitemaps.SITEMAP_CHUNK_SIZE', 5)
+    settings.BLOG_SITEMAP_ROOT = tmp_path
+    return tmp_path
+
+
+@pytest.fixture
+def posts(mixer, user, published_category):
+    return mixer.cycle(12).blend(
+        'blog.Post', author=user, category=published_category,
+        is_published=True)
+
+
+def chunk_of(post):
+    return f'posts-{(post.pk - 1) // 5}.xml'
+
+
+def test_sitemap_index(client, posts, user, published_category, mixer):
+    hidden = mixer.blend('blog.Post', is_published=False)
+    call_command('build_sitemaps', base_url=BASE_URL)
+    response = client.get('/sitemap.xml')
+    assert response.status_code == HTTPStatus.OK
+    index = b''.join(response.streaming_content).decode()
+    chunks = {chunk_of(post) for post in posts}
+    for name in chunks | {'profiles-0.xml', 'categories-0.xml'}:
+        assert f'<loc>{BASE_URL}/sitemaps/{name}</loc>' in index
+    sitemap = ''
+    for name in chunks:
+        response = client.get(f'/sitemaps/{name}')
+        sitemap += b''.join(response.streaming_content).decode()
+    for post in posts:
+        assert f'<loc>{BASE_URL}/posts/{post.pk}/</loc>' in sitemap
+    assert f'/posts/{hidden.pk}/' not in sitemap, (
+        'Убедитесь, что в карту сайта попадают только опубликованные посты.'
+    )
+    response = client.get('/sitemaps/profiles-0.xml')
+    assert f'/profile/{user.username}/' in b''.join(
+        response.streaming_content).decode()
+    response = client.get('/sitemaps/categories-0.xml')
+    assert f'/category/{published_category.slug}/' in b''.join(
+        response.streaming_content).decode()
+
+
+def test_sitemap_conditional_get(client, sitemap_root, posts):
+    build(sitemap_root, BASE_URL)
+    etag = client.get('/sitemap.xml')['ETag']
+    response = client.get('/sitemap.xml', HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+
+def test_only_changed_chunks_regenerated(sitemap_root, posts, user):
+    first = build(sitemap_root, BASE_URL)
+    assert len(first) == len({chunk_of(post) for post in posts}) + 2
+    assert build(sitemap_root, BASE_URL) == [], (
+        'Убедитесь, что неизменённые части карты сайта не перестраиваются.'
+    )
+
+    post = posts[6]
+    post.title = 'Новый заголовок'
+    post.save()
+    assert build(sitemap_root, BASE_URL) == [chunk_of(post)]
+
+    Post.objects.filter(pk=posts[0].pk).update(is_visible=False)
+    assert build(sitemap_root, BASE_URL) == [chunk_of(posts[0])]
+
+    user.username = 'renamed'
+    user.save()
+    assert build(sitemap_root, BASE_URL) == ['profiles-0.xml']
+    assert '/profile/renamed/' in (
+        sitemap_root / 'profiles-0.xml').read_text()
+
+    last = posts[-1]
+    Post.objects.filter(pk__gte=last.pk - (last.pk - 1) % 5).delete()
+    assert build(sitemap_root, BASE_URL) == []
+    assert not (sitemap_root / chunk_of(last)).exists()
+    assert chunk_of(last) not in (sitemap_root / 'sitemap.xml').read_text()
+
+
+def test_base_url_change_rewrites_every_chunk(sitemap_root, posts):
+    first = build(sitemap_root, BASE_URL)
+    assert sorted(build(sitemap_root, 'https://new.test/')) == sorted(
+        first), (
+        'Убедитесь, что при смене адреса сайта перезаписываются все части '
+        'карты сайта.'
+    )
+    for path in sitemap_root.glob('*.xml'):
+        assert BASE_URL not in path.read_text()
+    assert build(sitemap_root, 'https://new.test') == []
+
+
+def test_only_sitemaps_are_served(client, sitemap_root, posts):
+    build(sitemap_root, BASE_URL)
+    for url in ('/sitemaps/manifest.json', '/sitemaps/..%2Fsecret.xml',
+                '/sitemaps/posts-99.xml'):
+        assert client.get(url).status_code == HTTPStatus.NOT_FOUND
@@ -0,0 +1,57 @@
+import gzip
+from http import HTTPStatus
+
+import pytest
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.management import call_command
+from django.test import RequestFactory, override_settings
+
+from blogicum.static import IMMUTABLE_CACHE_CONTROL, serve_static
+
+
+@pytest.fixture(scope='module')
+def collected_static(tmp_path_factory):
+    static_root = tmp_path_factory.mktemp('static')
+    with override_settings(
+        STATIC_ROOT=static_root,
+        STATICFILES_STORAGE=(
+            'blogicum.static.CompressedManifestStaticFilesStorage'),
+    ):
+        call_command('collectstatic', interactive=False, verbosity=0)
+        yield static_root
+
+
+def test_collectstatic_writes_compressed_variants(collected_static):
+    hashed = staticfiles_storage.stored_name('css/bootstrap.min.css')
+    assert hashed != 'css/bootstrap.min.css'
+    original = (collected_static / hashed).read_bytes()
+    assert gzip.decompress(
+        (collected_static / f'{hashed}.gz').read_bytes()) == original
+
+
+@pytest.mark.parametrize('accept, encoding', (
+    ('gzip, deflate, br', 'br'),
+    ('gzip', 'gzip'),
+    ('br;q=0, gzip', 'gzip'),
+    ('', None),
+))
+def test_serve_static_picks_variant(collected_static, accept, encoding):
+    if encoding == 'br' and not any((collected_static / 'css').glob('*.br')):
+        pytest.skip('brotli is not installed')
+    hashed = staticfiles_storage.stored_name('css/bootstrap.min.css')
+    request = RequestFactory().get(
+        f'/static/{hashed}', HTTP_ACCEPT_ENCODING=accept)
+    response = serve_static(request, hashed)
+    assert response.status_code == HTTPStatus.OK
+    assert response.get('Content-Encoding') == encoding
+    assert response['Content-Type'] == 'text/css'
+    assert response['Cache-Control'] == IMMUTABLE_CACHE_CONTROL
+    assert response['Vary'] == 'Accept-Encoding'
+    response.file_to_stream.close()
+
+
+def test_serve_static_unhashed_name(collected_static):
+    request = RequestFactory().get('/static/css/bootstrap.min.css')
+    response = serve_static(request, 'css/bootstrap.min.css')
+    assert 'immutable' not in response['Cache-Control']
+    response.file_to_stream.close()
@@ -0,0 +1,101 @@
+import os
+from io import BytesIO
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from mixer.backend.django import Mixer
+from PIL import Image
+
+from blog.models import Post
+from blog.signals import collect_image
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+
+def make_image(color):
+    data = BytesIO()
+    Image.new('RGB', (10, 10), color).save(data, 'JPEG')
+    return SimpleUploadedFile('photo.JPG', data.getvalue(), 'image/jpeg')
+
+
+@pytest.fixture
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    settings.BLOG_IMAGE_GRACE_SECONDS = 0
+    return tmp_path
+
+
+def test_identical_uploads_share_one_blob(
+        media_root, mixer: Mixer, user, django_capture_on_commit_callbacks):
+    first = mixer.blend('blog.Post', author=user, image=make_image('red'))
+    second = mixer.blend('blog.Post', author=user, image=make_image('red'))
+    other = mixer.blend('blog.Post', author=user, image=make_image('blue'))
+
+    assert first.image.name == second.image.name, (
+        'Убедитесь, что одинаковые изображения хранятся в одном файле.'
+    )
+    assert first.image.name != other.image.name
+    assert first.image.name.startswith('post_media/')
+    assert first.image.name.endswith('.jpg')
+    stored = list((media_root / 'post_media').iterdir())
+    assert len(stored) == 2
+
+    with django_capture_on_commit_callbacks(execute=True):
+        first.delete()
+    assert (media_root / second.image.name).exists(), (
+        'Убедитесь, что файл не удаляется, пока на него ссылаются посты.'
+    )
+
+    with django_capture_on_commit_callbacks(execute=True):
+        second.delete()
+    assert not (media_root / second.image.name).exists(), (
+        'Убедитесь, что файл удаляется после удаления последнего поста.'
+    )
+
+
+def test_replaced_image_is_collected(
+        media_root, mixer: Mixer, user, django_capture_on_commit_callbacks):
+    post = mixer.blend('blog.Post', author=user, image=make_image('green'))
+    old_name = post.image.name
+    post = Post.objects.get(pk=post.pk)
+    post.image = make_image('yellow')
+    with django_capture_on_commit_callbacks(execute=True):
+        post.save()
+    assert not (media_root / old_name).exists()
+    assert (media_root / post.image.name).exists()
+
+
+def test_reused_blob_is_not_collected(
+        media_root, settings, mixer: Mixer, user,
+        django_capture_on_commit_callbacks):
+    settings.BLOG_IMAGE_GRACE_SECONDS = 60
+    post = mixer.blend('blog.Post', author=user, image=make_image('red'))
+    name = post.image.name
+    os.utime(media_root / name, (0, 0))
+    # Another upload of the same image, whose post is not committed yet.
+    Post.image.field.storage.save('post_media/photo.jpg', make_image('red'))
+    with django_capture_on_commit_callbacks(execute=True):
+        post.delete()
+    assert (media_root / name).exists(), (
+        'Убедитесь, что только что переиспользованный файл не удаляется.'
+    )
+    os.utime(media_root / name, (0, 0))
+    collect_image(name)
+    assert not (media_root / name).exists()
+    assert not list((media_root / 'post_media').iterdir())
+
+
+def test_unchanged_image_is_not_reread(media_root, mixer: Mixer, user):
+    post = Post.objects.get(
+        pk=mixer.blend('blog.Post', author=user, image=make_image('red')).pk)
+    post.title = 'Новый заголовок'
+    with CaptureQueriesContext(connection) as queries:
+        post.save()
+    assert not any(
+        query['sql'].startswith('SELECT "blog_post"."image"')
+        for query in queries
+    ), 'Убедитесь, что при неизменном изображении оно не перечитывается.'
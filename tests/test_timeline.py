@@ -0,0 +1,156 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.core.cache import cache
+from django.test import override_settings
+from django.utils import timezone
+
+from blog.models import Follow, Post, TimelineEntry
+from blog.timeline import (PULL_AUTHORS_KEY, decode_cursor, follow,
+                           timeline_page, unfollow)
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+
+@pytest.fixture(autouse=True)
+def clear_pull_authors():
+    cache.delete(PULL_AUTHORS_KEY)
+    yield
+    cache.delete(PULL_AUTHORS_KEY)
+
+
+@pytest.fixture
+def authors(mixer):
+    return mixer.cycle(3).blend('auth.User')
+
+
+def publish(mixer, author, category, count, capture):
+    now = timezone.now()
+    with capture(execute=True):
+        return [
+            mixer.blend(
+                'blog.Post', author=author, category=category,
+                is_published=True, pub_date=now - timedelta(minutes=i))
+            for i in range(count)
+        ]
+
+
+def read_all(user, size=4):
+    posts, cursor = [], None
+    while True:
+        page = timeline_page(user, Post.objects.all(), cursor, size)
+        posts.extend(page.posts)
+        if page.next_cursor is None:
+            return posts
+        cursor = page.next_cursor
+
+
+def naive(user):
+    return list(Post.objects.filter(
+        author__followers__user=user,
+        is_published=True,
+        category__is_published=True,
+        pub_date__lt=timezone.now(),
+    ).order_by('-pub_date', '-pk'))
+
+
+def test_follow_endpoints(user_client, user, authors):
+    author = authors[0]
+    url = f'/profile/{author.username}/'
+    response = user_client.post(url + 'follow/')
+    assert response.status_code == HTTPStatus.FOUND
+    assert Follow.objects.filter(user=user, author=author).exists()
+    assert user_client.get(url).context['is_following']
+    user_client.post(url + 'unfollow/')
+    assert not Follow.objects.filter(user=user, author=author).exists()
+    user_client.post(f'/profile/{user.username}/follow/')
+    assert not Follow.objects.filter(user=user, author=user).exists(), (
+        'Убедитесь, что пользователь не может подписаться на себя.'
+    )
+
+
+def test_fan_out_and_cursor_pages(
+        mixer, user, authors, published_category,
+        django_capture_on_commit_callbacks):
+    old = publish(mixer, authors[0], published_category, 3,
+                  django_capture_on_commit_callbacks)
+    for author in authors[:2]:
+        follow(user, author)
+    assert TimelineEntry.objects.filter(user=user).count() == 3, (
+        'Убедитесь, что при подписке в ленту попадают прежние публикации.'
+    )
+    for author in authors:
+        publish(mixer, author, published_category, 5,
+                django_capture_on_commit_callbacks)
+    mixer.blend('blog.Post', author=authors[0], category=published_category,
+                pub_date=timezone.now() + timedelta(days=1))
+    assert TimelineEntry.objects.filter(user=user).count() == 13
+    assert read_all(user) == naive(user), (
+        'Убедитесь, что постраничная лента подписок совпадает с выборкой '
+        'публикаций отслеживаемых авторов.'
+    )
+    assert old[0] in read_all(user)
+
+
+@override_settings(BLOG_FANOUT_LIMIT=1)
+def test_popular_authors_are_merged_on_read(
+        mixer, user, another_user, authors, published_category,
+        django_capture_on_commit_callbacks):
+    popular, regular = authors[:2]
+    for reader in (user, another_user):
+        Follow.objects.create(user=reader, author=popular)
+    Follow.objects.create(user=user, author=regular)
+    for author in (popular, regular):
+        publish(mixer, author, published_category, 6,
+                django_capture_on_commit_callbacks)
+    assert not TimelineEntry.objects.filter(post__author=popular).exists()
+    assert TimelineEntry.objects.filter(post__author=regular).count() == 6
+    assert read_all(user, size=5) == naive(user)
+    assert len(naive(user)) == 12
+
+
+@override_settings(BLOG_FANOUT_LIMIT=1)
+def test_author_below_limit_is_backfilled(
+        mixer, user, another_user, authors, published_category,
+        django_capture_on_commit_callbacks):
+    popular = authors[0]
+    for reader in (user, another_user):
+        Follow.objects.create(user=reader, author=popular)
+    posts = publish(mixer, popular, published_category, 3,
+                    django_capture_on_commit_callbacks)
+    assert read_all(user) == posts
+    unfollow(another_user, popular)
+    cache.delete(PULL_AUTHORS_KEY)
+    assert read_all(user) == posts, (
+        'Убедитесь, что публикации автора не пропадают из ленты, когда '
+        'число его подписчиков опускается до BLOG_FANOUT_LIMIT.'
+    )
+    assert TimelineEntry.objects.filter(user=user).count() == 3
+
+
+@pytest.mark.parametrize('cursor', (
+    'garbage', '1_2_3', '9' * 30 + '_1', '-' + '9' * 30 + '_1',
+    '1_' + '9' * 30, '1_0',
+))
+def test_malformed_cursor(user_client, cursor):
+    assert decode_cursor(cursor) is None
+    response = user_client.get('/timeline/', {'cursor': cursor})
+    assert response.status_code == HTTPStatus.OK
+
+
+def test_unfollow_removes_entries(
+        user_client, user, authors, mixer, published_category,
+        django_capture_on_commit_callbacks):
+    author = authors[0]
+    follow(user, author)
+    publish(mixer, author, published_category, 2,
+            django_capture_on_commit_callbacks)
+    response = user_client.get('/timeline/')
+    assert len(response.context['page'].posts) == 2
+    user_client.post(f'/profile/{author.username}/unfollow/')
+    assert not TimelineEntry.objects.filter(user=user).exists()
+    response = user_client.get('/timeline/')
+    assert response.context['page'].posts == []
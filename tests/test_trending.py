@@ -0,0 +1,69 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from blog import trending
+from blog.constans import (TRENDING_COMMENT_WEIGHT, TRENDING_HALF_LIFE,
+                           TRENDING_PUBLISH_WEIGHT, TRENDING_VIEW_WEIGHT)
+from blog.counters import ViewCounter
+from blog.models import Post
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+
+@pytest.fixture
+def post(mixer, published_category):
+    return mixer.blend(
+        'blog.Post', is_published=True, category=published_category,
+        pub_date=timezone.now() - timedelta(hours=1))
+
+
+def test_comment_adds_to_score(post, mixer):
+    expected = trending.event_score(TRENDING_PUBLISH_WEIGHT, post.pub_date)
+    assert post.trending_score == pytest.approx(expected)
+    for _ in range(3):
+        comment = mixer.blend('blog.Comment', post=post)
+        expected = trending.combine(expected, trending.event_score(
+            TRENDING_COMMENT_WEIGHT, comment.created_at))
+    post.refresh_from_db()
+    assert post.trending_score == pytest.approx(expected), (
+        'Убедитесь, что комментарий обновляет рейтинг публикации.'
+    )
+
+
+def test_views_flush_adds_to_score(post):
+    counter = ViewCounter(autoflush=False)
+    before = post.trending_score
+    for _ in range(20):
+        counter.hit(post.pk)
+    counter.flush()
+    post.refresh_from_db()
+    expected = trending.combine(
+        before, trending.event_score(TRENDING_VIEW_WEIGHT * 20))
+    assert post.trending_score == pytest.approx(expected, abs=1e-3)
+
+
+def test_score_decays_with_age():
+    now = timezone.now()
+    fresh = trending.event_score(1, now)
+    old = trending.event_score(2, now - timedelta(seconds=TRENDING_HALF_LIFE))
+    assert old == pytest.approx(fresh), (
+        'Убедитесь, что вес события уменьшается вдвое за период полураспада.'
+    )
+
+
+def test_trending_page_order(client, mixer, published_category):
+    now = timezone.now()
+    old, new = mixer.cycle(2).blend(
+        'blog.Post', is_published=True, category=published_category,
+        pub_date=(when for when in (now - timedelta(hours=3), now)))
+    mixer.cycle(2).blend('blog.Comment', post=old)
+    response = client.get('/trending/')
+    assert [p.pk for p in response.context['page_obj']] == [old.pk, new.pk]
+    mixer.cycle(2).blend('blog.Comment', post=new)
+    response = client.get('/trending/')
+    assert [p.pk for p in response.context['page_obj']] == [new.pk, old.pk]
+    assert list(Post.objects.order_by('-trending_score')[:1]) == [new]
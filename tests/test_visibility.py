@@ -0,0 +1,56 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from blog.models import Post
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+
+def visible(post):
+    return Post.objects.values_list('is_visible', flat=True).get(pk=post.pk)
+
+
+def test_post_save_computes_visibility(
+        post_with_published_location, published_category):
+    post = post_with_published_location
+    post.category = published_category
+    post.is_published = True
+    post.save()
+    assert visible(post)
+    post.is_published = False
+    post.save()
+    assert not visible(post), (
+        'Убедитесь, что снятая с публикации запись не видна в лентах.'
+    )
+
+
+def test_category_changes_update_posts(mixer, published_category):
+    posts = mixer.cycle(3).blend(
+        'blog.Post', category=published_category, is_published=True)
+    hidden = mixer.blend(
+        'blog.Post', category=published_category, is_published=False)
+    assert all(visible(post) for post in posts)
+    published_category.is_published = False
+    published_category.save()
+    assert not any(visible(post) for post in posts), (
+        'Убедитесь, что при снятии категории с публикации её записи '
+        'пропадают из лент.'
+    )
+    published_category.is_published = True
+    published_category.save()
+    assert all(visible(post) for post in posts)
+    assert not visible(hidden)
+    published_category.delete()
+    assert not Post.objects.filter(is_visible=True).exists()
+
+
+def test_feed_scans_visibility_index(mixer, published_category):
+    mixer.cycle(3).blend('blog.Post', category=published_category)
+    plan = Post.objects.filter(
+        is_visible=True, pub_date__lt=timezone.now() + timedelta(days=1)
+    ).order_by('-pub_date').explain()
+    assert 'post_visible_feed' in plan
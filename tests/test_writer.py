@@ -0,0 +1,204 @@
+import threading
+import time
+from concurrent.futures import TimeoutError
+
+import pytest
+from django.db import IntegrityError
+from django.test import override_settings
+from test_storage import make_image
+
+from blog import writer as writer_module
+from blog.models import Comment, Location, Post
+from blog.storage import ContentAddressedStorage
+from blog.writer import SingleWriter
+
+# The writer thread has its own connection, so the data must be committed.
+pytestmark = [
+    pytest.mark.django_db(transaction=True),
+    pytest.mark.usefixtures('reset_sequences'),
+]
+
+
+def test_concurrent_jobs_are_committed():
+    writer = SingleWriter()
+    errors = []
+
+    def worker(index):
+        try:
+            writer.submit(Location.objects.create, name=f'Место {index}')
+        except Exception as error:
+            errors.append(error)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(30)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not errors
+    assert Location.objects.count() == 30
+
+
+def test_failed_job_does_not_roll_back_batch():
+    writer = SingleWriter()
+    release = threading.Event()
+    results = {}
+
+    def blocker():
+        release.wait()
+        return Location.objects.create(name='Первое')
+
+    def submit(key, func, **kwargs):
+        try:
+            results[key] = writer.submit(func, **kwargs)
+        except Exception as error:
+            results[key] = error
+
+    first = threading.Thread(target=submit, args=('first', blocker))
+    first.start()
+    queued = [
+        threading.Thread(target=submit, args=(
+            'bad', Location.objects.create), kwargs={'name': None}),
+        threading.Thread(target=submit, args=(
+            'good', Location.objects.create), kwargs={'name': 'Второе'}),
+    ]
+    for thread in queued:
+        thread.start()
+    release.set()
+    for thread in [first, *queued]:
+        thread.join()
+    assert isinstance(results['bad'], IntegrityError), (
+        'Убедитесь, что ошибка записи возвращается её отправителю.'
+    )
+    assert set(Location.objects.values_list('name', flat=True)) == {
+        'Первое', 'Второе'}
+
+
+def run_batch(writer, *jobs):
+    """Submit jobs from threads so that they share one batch."""
+    started, release = threading.Event(), threading.Event()
+    results = {}
+
+    def blocker():
+        started.set()
+        release.wait()
+
+    def submit(key, func, kwargs):
+        try:
+            results[key] = writer.submit(func, **kwargs)
+        except Exception as error:
+            results[key] = error
+
+    threads = [threading.Thread(
+        target=submit, args=('blocker', blocker, {}))]
+    threads += [
+        threading.Thread(target=submit, args=(key, func, kwargs))
+        for key, func, kwargs in jobs
+    ]
+    threads[0].start()
+    started.wait()
+    for thread in threads[1:]:
+        thread.start()
+    while writer._jobs.qsize() < len(jobs):
+        time.sleep(0.01)
+    release.set()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+@override_settings(BLOG_WRITER_TIMEOUT=5)
+def test_failed_commit_fails_every_job():
+    # Foreign keys are checked on commit, so the outer COMMIT fails.
+    results = run_batch(
+        SingleWriter(),
+        ('orphan', Comment.objects.create,
+         {'post_id': 10 ** 6, 'text': 'Без публикации'}),
+        ('good', Location.objects.create, {'name': 'Место'}),
+    )
+    assert isinstance(results['orphan'], IntegrityError)
+    assert isinstance(results['good'], IntegrityError), (
+        'Убедитесь, что при откате пакета ошибку получают все его задачи.'
+    )
+    assert not Location.objects.filter(name='Место').exists()
+
+
+@override_settings(BLOG_WRITER_TIMEOUT=5)
+def test_failed_transaction_start_fails_queued_jobs(monkeypatch):
+    writer = SingleWriter()
+
+    def broken_atomic(*args, **kwargs):
+        raise RuntimeError('no connection')
+
+    monkeypatch.setattr(writer_module.transaction, 'atomic', broken_atomic)
+    with pytest.raises(RuntimeError):
+        writer.submit(Location.objects.create, name='Место')
+
+
+@override_settings(BLOG_SINGLE_WRITER=True)
+def test_comment_saved_through_writer(
+        user_client, post_with_published_location):
+    response = user_client.post(
+        f'/posts/{post_with_published_location.id}/comment/',
+        data={'text': 'Комментарий'})
+    assert response.status_code == 302
+    assert response['Location'] == (
+        f'/posts/{post_with_published_location.id}/')
+    assert Comment.objects.filter(
+        post=post_with_published_location, text='Комментарий').exists()
+
+
+@override_settings(BLOG_WRITER_TIMEOUT=0.2)
+def test_timed_out_job_is_cancelled():
+    writer = SingleWriter()
+    started, release = threading.Event(), threading.Event()
+    results = {}
+
+    def blocker():
+        started.set()
+        release.wait()
+        return Location.objects.create(name='Первое')
+
+    def submit():
+        results['blocker'] = writer.submit(blocker)
+
+    thread = threading.Thread(target=submit)
+    thread.start()
+    started.wait()
+    with pytest.raises(TimeoutError):
+        writer.submit(Location.objects.create, name='Второе')
+    release.set()
+    thread.join()
+    writer.submit(Location.objects.count)
+    assert results['blocker'].name == 'Первое', (
+        'Убедитесь, что задача, которая уже выполняется, дожидается '
+        'своего результата.'
+    )
+    assert not Location.objects.filter(name='Второе').exists(), (
+        'Убедитесь, что задача, не дождавшаяся записи, отменяется.'
+    )
+
+
+@override_settings(BLOG_SINGLE_WRITER=True)
+def test_upload_stored_by_request_thread(
+        monkeypatch, settings, tmp_path, user_client, published_category,
+        published_location):
+    settings.MEDIA_ROOT = tmp_path
+    threads = []
+    save = ContentAddressedStorage._save
+
+    def recording_save(self, name, content):
+        threads.append(threading.current_thread().name)
+        return save(self, name, content)
+
+    monkeypatch.setattr(ContentAddressedStorage, '_save', recording_save)
+    response = user_client.post('/posts/create/', data={
+        'title': 'Заголовок', 'text': 'Текст',
+        'category': published_category.pk,
+        'location': published_location.pk,
+        'image': make_image('red'),
+    })
+    assert response.status_code == 302
+    assert Post.objects.get().image.name
+    assert threads and 'blog-writer' not in threads, (
+        'Убедитесь, что файл сохраняется до передачи записи в поток записи.'
+    )